@@ -4,10 +4,12 @@ import logging
 from dotenv import load_dotenv
 import os
 
-from routes.job_matching import job_matching_bp
+from routes.job_matching import job_matching_bp, match_embedding
 from routes.career_path import career_path_bp
 from routes.skill_analysis import skill_analysis_bp
 from utils.logger import setup_logger
+from utils.llm_cache import llm_cache
+from utils.llm_gateway import llm_gateway
 from config.settings import Config
 
 load_dotenv()
@@ -29,6 +31,9 @@ app.register_blueprint(job_matching_bp, url_prefix='/api/ai-brain/job-matching',
 app.register_blueprint(career_path_bp, url_prefix='/api/ai-brain/career-path', name='career_path_full')
 app.register_blueprint(skill_analysis_bp, url_prefix='/api/ai-brain/skill-analysis', name='skill_analysis_full')
 
+# Embedding match path called by the API Gateway's resume controller
+app.add_url_rule('/api/v1/match-jobs', 'match_jobs_v1', match_embedding, methods=['POST'])
+
 @app.route('/health', methods=['GET'])
 def health_check():
     return jsonify({
@@ -37,6 +42,11 @@ def health_check():
         'version': '1.0.0'
     }), 200
 
+@app.route('/llm/stats', methods=['GET'])
+def llm_stats():
+    """LLM response cache and gateway statistics, per call site"""
+    return jsonify({'cache': llm_cache.stats(), 'gateway': llm_gateway.stats()}), 200
+
 @app.errorhandler(Exception)
 def handle_error(error):
     logger.error(f"Unhandled error: {str(error)}")
@@ -1,3 +1,4 @@
+import json
 import os
 from dotenv import load_dotenv
 
@@ -31,9 +32,79 @@ class Config:
     SIMILARITY_THRESHOLD = float(os.getenv('SIMILARITY_THRESHOLD', 0.7))
     MAX_RECOMMENDATIONS = int(os.getenv('MAX_RECOMMENDATIONS', 10))
     
+    # Job Index Config
+    JOB_INDEX_HASH_FEATURES = int(os.getenv('JOB_INDEX_HASH_FEATURES', 2 ** 18))
+    JOB_INDEX_COMPACT_DELTA_ROWS = int(os.getenv('JOB_INDEX_COMPACT_DELTA_ROWS', 1000))
+    JOB_INDEX_COMPACT_RATIO = float(os.getenv('JOB_INDEX_COMPACT_RATIO', 0.25))
+    # Shared memory-mapped snapshots for multi-worker deployments (disabled when empty)
+    JOB_INDEX_DIR = os.getenv('JOB_INDEX_DIR', '')
+    JOB_INDEX_REFRESH_SECONDS = float(os.getenv('JOB_INDEX_REFRESH_SECONDS', 1.0))
+    JOB_INDEX_KEEP_VERSIONS = int(os.getenv('JOB_INDEX_KEEP_VERSIONS', 3))
+    # Journaled changes before a background compaction publishes a new snapshot
+    JOB_INDEX_JOURNAL_MAX_ENTRIES = int(os.getenv('JOB_INDEX_JOURNAL_MAX_ENTRIES', 100))
+    
+    # Skill Vocabulary Config
+    SKILL_VOCABULARY_MAX_SIZE = int(os.getenv('SKILL_VOCABULARY_MAX_SIZE', 50000))
+    
+    # Profile Feature Cache Config (shared by job matching and career paths)
+    PROFILE_CACHE_SIZE = int(os.getenv('PROFILE_CACHE_SIZE', 10000))
+    PROFILE_CACHE_MAX_BYTES = int(os.getenv('PROFILE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    
+    # Ranking Cache Config (cursor pagination on /match)
+    RANKING_CACHE_SIZE = int(os.getenv('RANKING_CACHE_SIZE', 1000))
+    RANKING_CACHE_TTL_SECONDS = float(os.getenv('RANKING_CACHE_TTL_SECONDS', 600))
+    # Larger requested pages are clamped to this
+    RANKING_MAX_PAGE_SIZE = int(os.getenv('RANKING_MAX_PAGE_SIZE', 500))
+    
+    # Near-Duplicate Job Config (MinHash/LSH)
+    JOB_DEDUP_ENABLED = os.getenv('JOB_DEDUP_ENABLED', 'False') == 'True'
+    DEDUP_JACCARD_THRESHOLD = float(os.getenv('DEDUP_JACCARD_THRESHOLD', 0.9))
+    DEDUP_NUM_PERM = int(os.getenv('DEDUP_NUM_PERM', 128))
+    
+    # Match Matrix Config
+    # Worker processes for bulk scoring (0 = one per CPU core)
+    MATCH_MATRIX_WORKERS = int(os.getenv('MATCH_MATRIX_WORKERS', 0))
+    # How the shared pool starts its workers (forkserver, or spawn where unavailable)
+    MATCH_MATRIX_START_METHOD = os.getenv('MATCH_MATRIX_START_METHOD', 'forkserver')
+    MATCH_MATRIX_BLOCK_SIZE = int(os.getenv('MATCH_MATRIX_BLOCK_SIZE', 256))
+    MATCH_MATRIX_MAX_CELLS = int(os.getenv('MATCH_MATRIX_MAX_CELLS', 50_000_000))
+    
+    # Vector Index Config (job embeddings)
+    # Corpora smaller than this are searched exactly
+    VECTOR_INDEX_IVF_MIN_ROWS = int(os.getenv('VECTOR_INDEX_IVF_MIN_ROWS', 20000))
+    VECTOR_INDEX_NPROBE = int(os.getenv('VECTOR_INDEX_NPROBE', 8))
+    VECTOR_INDEX_TRAIN_ITERATIONS = int(os.getenv('VECTOR_INDEX_TRAIN_ITERATIONS', 10))
+    VECTOR_INDEX_TRAIN_SAMPLE_PER_LIST = int(os.getenv('VECTOR_INDEX_TRAIN_SAMPLE_PER_LIST', 64))
+    VECTOR_INDEX_ASSIGN_CHUNK = int(os.getenv('VECTOR_INDEX_ASSIGN_CHUNK', 8192))
+    # Weight of embedding similarity vs. skill overlap in /api/v1/match-jobs
+    VECTOR_MATCH_WEIGHT = float(os.getenv('VECTOR_MATCH_WEIGHT', 0.7))
+    # Nearest neighbours re-scored with skills, as a multiple of the limit
+    VECTOR_MATCH_CANDIDATE_FACTOR = int(os.getenv('VECTOR_MATCH_CANDIDATE_FACTOR', 5))
+    
     # Career Path Config
     CAREER_PREDICTION_YEARS = int(os.getenv('CAREER_PREDICTION_YEARS', 5))
     
+    # LLM Gateway Config
+    # Per-attempt HTTP timeout; the deadline bounds the whole call including retries
+    LLM_TIMEOUT_SECONDS = float(os.getenv('LLM_TIMEOUT_SECONDS', 30))
+    LLM_DEADLINE_SECONDS = float(os.getenv('LLM_DEADLINE_SECONDS', 60))
+    # Per-call-site deadlines in seconds as JSON, e.g. {"skill_roadmap": 90}
+    LLM_DEADLINES = json.loads(os.getenv('LLM_DEADLINES', '{}'))
+    LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 3))
+    LLM_BACKOFF_BASE_SECONDS = float(os.getenv('LLM_BACKOFF_BASE_SECONDS', 0.5))
+    LLM_BACKOFF_MAX_SECONDS = float(os.getenv('LLM_BACKOFF_MAX_SECONDS', 8))
+    LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 16))
+    LLM_POOL_SIZE = int(os.getenv('LLM_POOL_SIZE', 16))
+    LLM_KEEPALIVE_SECONDS = float(os.getenv('LLM_KEEPALIVE_SECONDS', 30))
+    
+    # LLM Response Cache Config
+    LLM_CACHE_SIZE = int(os.getenv('LLM_CACHE_SIZE', 1000))
+    # Optional SQLite file shared by worker processes (memory only when empty)
+    LLM_CACHE_DB_PATH = os.getenv('LLM_CACHE_DB_PATH', '')
+    LLM_CACHE_DEFAULT_TTL_SECONDS = float(os.getenv('LLM_CACHE_DEFAULT_TTL_SECONDS', 3600))
+    # Per-call-site TTLs in seconds as JSON, e.g. {"skill_roadmap": 86400}; 0 disables caching
+    LLM_CACHE_TTLS = json.loads(os.getenv('LLM_CACHE_TTLS', '{}'))
+    
     # Rate Limiting
     RATE_LIMIT_REQUESTS = int(os.getenv('RATE_LIMIT_REQUESTS', 100))
     RATE_LIMIT_PERIOD = int(os.getenv('RATE_LIMIT_PERIOD', 3600))
@@ -1,4 +1,6 @@
 from .job_matcher import JobMatcher
+from .job_index import JobIndex
 from .career_advisor import CareerAdvisor
+from .skill_vocabulary import SkillVocabulary, skill_vocabulary
 
-__all__ = ['JobMatcher', 'CareerAdvisor']
+__all__ = ['JobMatcher', 'JobIndex', 'CareerAdvisor', 'SkillVocabulary', 'skill_vocabulary']
@@ -1,7 +1,9 @@
-from groq import Groq
 from typing import List, Dict, Any
 import logging
 from config.settings import Config
+from models.profile_features import profile_features
+from models.skill_vocabulary import skill_vocabulary, canonical_skill
+from utils.llm_cache import llm_cache
 
 logger = logging.getLogger('ai-brain')
 
@@ -11,7 +13,6 @@ class CareerAdvisor:
     """
     
     def __init__(self):
-        self.client = Groq(api_key=Config.GROQ_API_KEY)
         self.model = Config.GROQ_MODEL
     
     def generate_career_path(self, student_profile: Dict[str, Any]) -> Dict[str, Any]:
@@ -19,34 +20,9 @@ class CareerAdvisor:
         Generate personalized career path recommendations
         """
         try:
-            prompt = self._build_career_path_prompt(student_profile)
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert career advisor for students and professionals. Always respond with valid JSON only, no markdown."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=4096
-            )
-            
-            career_advice = response.choices[0].message.content.strip()
-            
-            # Clean up markdown code blocks if present
-            if career_advice.startswith('```'):
-                import re
-                career_advice = re.sub(r'^```json?\s*', '', career_advice)
-                career_advice = re.sub(r'\s*```$', '', career_advice)
-            
-            import json
-            career_path = json.loads(career_advice)
-            
-            return {
-                'success': True,
-                'career_path': career_path,
-                'raw_advice': career_advice
-            }
+            career_advice = llm_cache.complete('career_path', validate=self.parse_career_path,
+                                               **self.career_path_request(student_profile))
+            return self.parse_career_path(career_advice)
             
         except Exception as e:
             logger.error(f"Error generating career path: {str(e)}")
@@ -55,6 +31,39 @@ class CareerAdvisor:
                 'error': str(e)
             }
     
+    def career_path_request(self, student_profile: Dict[str, Any]) -> Dict[str, Any]:
+        """Chat completion request for a career path (also used for streaming)"""
+        prompt = self._build_career_path_prompt(student_profile)
+        
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": "You are an expert career advisor for students and professionals. Always respond with valid JSON only, no markdown."},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.7,
+            'max_tokens': 4096
+        }
+    
+    def parse_career_path(self, career_advice: str) -> Dict[str, Any]:
+        """Career path result from the model's response text"""
+        career_advice = career_advice.strip()
+        
+        # Clean up markdown code blocks if present
+        if career_advice.startswith('```'):
+            import re
+            career_advice = re.sub(r'^```json?\s*', '', career_advice)
+            career_advice = re.sub(r'\s*```$', '', career_advice)
+        
+        import json
+        career_path = json.loads(career_advice)
+        
+        return {
+            'success': True,
+            'career_path': career_path,
+            'raw_advice': career_advice
+        }
+    
     def _build_career_path_prompt(self, profile: Dict[str, Any]) -> str:
         """Build prompt for career path generation"""
         
@@ -126,16 +135,18 @@ Return ONLY valid JSON in this exact format (no markdown, no explanation):
         """
         try:
             required_skills = target_role.get('required_skills', [])
-            student_skills_lower = [s.lower() for s in student_skills]
-            required_skills_lower = [s.lower() for s in required_skills]
+            # The student's skill set is shared with job matching via the profile cache
+            student_set = profile_features.features({'skills': student_skills}).skill_set
+            required_set = skill_vocabulary.encode(required_skills)
             
-            # Find matching and missing skills
-            matching_skills = list(set(student_skills_lower) & set(required_skills_lower))
-            missing_skills = list(set(required_skills_lower) - set(student_skills_lower))
+            # Find matching and missing skills (bitset AND / AND NOT)
+            matching_set = required_set & student_set
+            matching_skills = skill_vocabulary.names(matching_set)
+            missing_skills = skill_vocabulary.names(required_set - student_set)
             
             # Calculate readiness score
             if len(required_skills) > 0:
-                readiness_score = len(matching_skills) / len(required_skills)
+                readiness_score = len(matching_set) / len(required_skills)
             else:
                 readiness_score = 0.0
             
@@ -174,7 +185,7 @@ Return ONLY valid JSON in this exact format (no markdown, no explanation):
         
         learning_path = []
         for skill in missing_skills:
-            skill_lower = skill.lower()
+            skill_lower = canonical_skill(skill)
             resource = learning_resources.get(skill_lower, {
                 'platform': 'Online tutorials',
                 'duration': '3-4 weeks'
@@ -202,8 +213,7 @@ Return ONLY valid JSON in this exact format (no markdown, no explanation):
             return "6-12 months with structured learning plan"
 
 if __name__ == "__main__":
-    from groq import Groq
-    client = Groq(api_key=Config.GROQ_API_KEY)
+    from utils.llm_gateway import llm_gateway
     print("Groq client initialized successfully")
-    models = client.models.list()
+    models = llm_gateway.client.models.list()
     print("Available models:", [m.id for m in models.data])
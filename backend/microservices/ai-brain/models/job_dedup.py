@@ -0,0 +1,71 @@
+import threading
+import time
+from typing import List, Dict, Any
+import logging
+from config.settings import Config
+from models.job_index import education_level, to_float
+from models.skill_vocabulary import canonical_skill
+from utils.minhash import MinHash, cluster_near_duplicates
+
+logger = logging.getLogger('ai-brain')
+
+class JobDeduplicator:
+    """
+    Groups near-duplicate postings (e.g. the same role reposted per city) so
+    each group is scored once. Jobs are near-duplicates when their title and
+    description shingles reach the Jaccard threshold and every structured
+    field the match score reads (required skills, experience range,
+    education) is identical.
+    """
+
+    def __init__(self, threshold: float = Config.DEDUP_JACCARD_THRESHOLD,
+                 num_perm: int = Config.DEDUP_NUM_PERM):
+        self.threshold = threshold
+        self.minhash = MinHash(num_perm)
+        self._lock = threading.Lock()
+        self._stats = {'requests': 0, 'jobs': 0, 'unique_jobs': 0, 'seconds': 0.0}
+
+    @staticmethod
+    def _score_key(job: Dict[str, Any]) -> tuple:
+        required_skills = job.get('required_skills') or []
+        return (
+            frozenset(canonical_skill(skill) for skill in required_skills),
+            len(required_skills),
+            to_float(job.get('min_experience', 0), 0.0),
+            to_float(job.get('max_experience', 10), 10.0),
+            education_level(job.get('required_education', '') or '')
+        )
+
+    def group(self, jobs: List[Dict[str, Any]]) -> List[int]:
+        """Position of each job's representative (the first job of its group)"""
+        started = time.perf_counter()
+        signatures = [
+            self.minhash.text_signature(f"{job.get('title', '')} {job.get('description', '')}")
+            for job in jobs
+        ]
+        representatives = cluster_near_duplicates(
+            signatures, self.threshold, [self._score_key(job) for job in jobs]
+        )
+
+        unique = len(set(representatives))
+        with self._lock:
+            self._stats['requests'] += 1
+            self._stats['jobs'] += len(jobs)
+            self._stats['unique_jobs'] += unique
+            self._stats['seconds'] += time.perf_counter() - started
+        if unique < len(jobs):
+            logger.debug(f"Job dedup: {len(jobs)} jobs in {unique} groups")
+        return representatives
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        duplicates = stats['jobs'] - stats['unique_jobs']
+        return {
+            **stats,
+            'seconds': round(stats['seconds'], 6),
+            'duplicate_jobs': duplicates,
+            'duplicate_ratio': round(duplicates / stats['jobs'], 4) if stats['jobs'] else 0.0,
+            'jaccard_threshold': self.threshold,
+            'num_perm': self.minhash.num_perm
+        }
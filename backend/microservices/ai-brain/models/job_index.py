@@ -0,0 +1,753 @@
+import numpy as np
+import threading
+import json
+import os
+from scipy.sparse import csr_matrix, vstack
+from sklearn.feature_extraction.text import HashingVectorizer
+from typing import List, Dict, Any, Optional, Set, NamedTuple
+import logging
+from config.settings import Config
+from models.skill_vocabulary import canonical_skill
+
+logger = logging.getLogger('ai-brain')
+
+# Weights of the match score components (shared with JobMatcher)
+MATCH_WEIGHTS = {
+    'skills': 0.4,
+    'experience': 0.25,
+    'education': 0.15,
+    'text': 0.2
+}
+
+EDUCATION_HIERARCHY = {
+    'phd': 5,
+    'doctorate': 5,
+    'masters': 4,
+    'mba': 4,
+    'bachelors': 3,
+    'diploma': 2,
+    'high school': 1
+}
+
+def education_level(education: str) -> int:
+    """Map a free-text education string to its level in the hierarchy"""
+    education_lower = (education or '').lower()
+    level = 0
+    for edu, edu_level in EDUCATION_HIERARCHY.items():
+        if edu in education_lower:
+            level = max(level, edu_level)
+    return level
+
+def is_active(job: Dict[str, Any]) -> bool:
+    """Jobs without a status are treated as active"""
+    return job.get('status', 'active') == 'active'
+
+def to_float(value: Any, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+class _PayloadView:
+    """Row -> job dict view over a memory-mapped JSON blob, decoded on access"""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row: int) -> Dict[str, Any]:
+        start, end = self._offsets[row], self._offsets[row + 1]
+        return json.loads(self._blob[start:end].tobytes())
+
+    def __iter__(self):
+        return (self[row] for row in range(len(self)))
+
+class MatrixFeatures(NamedTuple):
+    """Job-side columns of a JobIndex, detached from it for batch scoring"""
+    job_ids: List[Optional[str]]
+    n_features: int
+    idf: np.ndarray
+    job_tfidf: csr_matrix
+    skill_ids: Dict[str, int]
+    job_skills: csr_matrix
+    required_counts: np.ndarray
+    min_experience: np.ndarray
+    max_experience: np.ndarray
+    education_levels: np.ndarray
+
+def top_k_indices(scores: np.ndarray, limit: Optional[int] = None,
+                  min_score: Optional[float] = None) -> np.ndarray:
+    """
+    Indices of the best scores in descending order, ties kept in input order.
+    Applies min_score first and selects the top `limit` with a partial
+    partition instead of sorting every score.
+    """
+    if min_score is not None:
+        candidates = np.flatnonzero(scores >= min_score)
+    else:
+        candidates = np.arange(len(scores))
+    candidate_scores = scores[candidates]
+
+    if limit is not None and limit < len(candidates):
+        if limit <= 0:
+            return np.empty(0, dtype=int)
+        kth_position = len(candidates) - limit
+        kth_score = np.partition(candidate_scores, kth_position)[kth_position]
+        # Everything above the k-th score survives; ties fill the rest in input order
+        above = candidates[candidate_scores > kth_score]
+        ties = candidates[candidate_scores == kth_score][:limit - len(above)]
+        candidates = np.concatenate([above, ties])
+        candidate_scores = scores[candidates]
+
+    order = np.lexsort((candidates, -candidate_scores))
+    return candidates[order]
+
+class JobIndex:
+    """
+    Columnar, incrementally updatable job-corpus index.
+
+    Jobs are featurized once into NumPy columns (experience and education
+    vectors, required-skill counts), skill postings and hashed term counts,
+    so a profile is scored against every job with a few vectorized
+    operations. Text uses a hashing featurizer with document frequencies
+    maintained on every change, so adding, updating or removing a job costs
+    O(size of job) and never refits. New rows go to a delta segment and
+    removed rows are tombstoned until a background compaction merges them.
+
+    A compacted index can be saved as memory-mapped arrays and loaded
+    read-only, so several worker processes share one copy through the OS
+    page cache.
+    """
+
+    # Column arrays persisted by save(), one .npy file each
+    _COLUMNS = ('_required_counts', '_min_experience', '_max_experience',
+                '_education_levels', '_active')
+
+    def __init__(self, jobs: Optional[List[Dict[str, Any]]] = None,
+                 job_ids: Optional[List[str]] = None):
+        self.n_features = Config.JOB_INDEX_HASH_FEATURES
+        self.vectorizer = HashingVectorizer(
+            n_features=self.n_features,
+            ngram_range=(1, 2),
+            stop_words='english',
+            alternate_sign=False,
+            norm=None
+        )
+        self.lock = threading.RLock()
+        self.read_only = False
+
+        # Row-aligned payloads; removed rows hold None until compaction
+        self.jobs: List[Optional[Dict[str, Any]]] = []
+        self.ids: List[Optional[str]] = []
+        self.row_of: Dict[str, int] = {}
+        self._row_terms: List[np.ndarray] = []
+        self._row_skills: List[np.ndarray] = []
+
+        # Skill vocabulary and postings (skill id -> rows requiring it)
+        self.skill_ids: Dict[str, int] = {}
+        self._skill_postings: Dict[int, Set[int]] = {}
+        # Read-only snapshots keep postings as CSC-style arrays instead
+        self._skill_indptr: Optional[np.ndarray] = None
+        self._skill_rows: Optional[np.ndarray] = None
+
+        # Numeric columns, grown by doubling
+        self._capacity = 0
+        self._alive = np.zeros(0, dtype=bool)
+        self._required_counts = np.zeros(0)
+        self._min_experience = np.zeros(0)
+        self._max_experience = np.zeros(0)
+        self._education_levels = np.zeros(0)
+        self._active = np.zeros(0, dtype=bool)
+        self._live_count = 0
+
+        # Hashed term counts: compacted base segment plus appended delta blocks
+        self._document_frequency = np.zeros(self.n_features, dtype=np.int64)
+        self._tf_base = csr_matrix((0, self.n_features))
+        self._delta_blocks: List[csr_matrix] = []
+        self._delta_matrix: Optional[csr_matrix] = None
+        self._text_state = None
+        self._compacting = False
+
+        if jobs:
+            self._append(jobs, job_ids)
+            self.compact()
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    @property
+    def size(self) -> int:
+        """Number of allocated rows, tombstones included"""
+        return len(self.jobs)
+
+    def live_rows(self) -> np.ndarray:
+        return np.flatnonzero(self._alive[:self.size])
+
+    def active_rows(self) -> np.ndarray:
+        """Live rows whose job status is active"""
+        return np.flatnonzero(self._alive[:self.size] & self._active[:self.size])
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                'rows': self.size,
+                'live_jobs': self._live_count,
+                'removed_rows': self.size - self._live_count,
+                'delta_rows': self.size - self._tf_base.shape[0],
+                'skills': len(self.skill_ids),
+                'read_only': self.read_only
+            }
+
+    # ----------------------------------------------------------------- updates
+
+    def add_many(self, jobs: List[Dict[str, Any]], job_ids: Optional[List[str]] = None) -> List[int]:
+        """Add jobs (replacing any with the same id) and return their rows"""
+        with self.lock:
+            self._check_mutable()
+            rows = self._append(jobs, job_ids)
+            self._maybe_compact()
+            return rows
+
+    def add(self, job: Dict[str, Any], job_id: Optional[str] = None) -> int:
+        return self.add_many([job], None if job_id is None else [job_id])[0]
+
+    def update(self, job_id: str, job: Dict[str, Any]) -> int:
+        """Replace a job: tombstone its old row and append the new version"""
+        return self.add(job, job_id)
+
+    def remove(self, job_id: str) -> bool:
+        with self.lock:
+            self._check_mutable()
+            row = self.row_of.pop(job_id, None)
+            if row is None:
+                return False
+            self._remove_row(row)
+            self._maybe_compact()
+            return True
+
+    def _check_mutable(self):
+        if self.read_only:
+            raise RuntimeError('Job index snapshot is read-only; update a thawed() copy')
+
+    def _append(self, jobs: List[Dict[str, Any]], job_ids: Optional[List[str]]) -> List[int]:
+        if not jobs:
+            return []
+        if job_ids is not None:
+            # The last version of an id repeated within the batch wins
+            latest = dict(zip(job_ids, jobs))
+            job_ids, jobs = list(latest.keys()), list(latest.values())
+
+        term_counts = self.vectorizer.transform(
+            [job.get('description', '') or '' for job in jobs]
+        ).tocsr()
+
+        if job_ids is not None:
+            for job_id in job_ids:
+                if job_id in self.row_of:
+                    self._remove_row(self.row_of.pop(job_id))
+
+        start = self.size
+        self._ensure_capacity(start + len(jobs))
+        for offset, job in enumerate(jobs):
+            row = start + offset
+            terms = term_counts.indices[term_counts.indptr[offset]:term_counts.indptr[offset + 1]]
+            self._add_row(row, job, None if job_ids is None else job_ids[offset], terms)
+
+        self._delta_blocks.append(term_counts)
+        self._delta_matrix = None
+        self._text_state = None
+        return list(range(start, start + len(jobs)))
+
+    def _add_row(self, row: int, job: Dict[str, Any], job_id: Optional[str], terms: np.ndarray):
+        required_skills = job.get('required_skills') or []
+        skill_ids = np.array(
+            [self.skill_ids.setdefault(skill, len(self.skill_ids))
+             for skill in {canonical_skill(s) for s in required_skills}],
+            dtype=int
+        )
+        for skill_id in skill_ids:
+            self._skill_postings.setdefault(skill_id, set()).add(row)
+
+        # The score divides by the raw list length, duplicates included
+        self._required_counts[row] = len(required_skills)
+        self._min_experience[row] = to_float(job.get('min_experience', 0), 0.0)
+        self._max_experience[row] = to_float(job.get('max_experience', 10), 10.0)
+        self._education_levels[row] = education_level(job.get('required_education', ''))
+        self._active[row] = is_active(job)
+        self._alive[row] = True
+
+        self._document_frequency[terms] += 1
+        self.jobs.append(job)
+        self.ids.append(job_id)
+        self._row_terms.append(terms)
+        self._row_skills.append(skill_ids)
+        if job_id is not None:
+            self.row_of[job_id] = row
+        self._live_count += 1
+
+    def _remove_row(self, row: int):
+        self._alive[row] = False
+        self._document_frequency[self._row_terms[row]] -= 1
+        for skill_id in self._row_skills[row]:
+            self._skill_postings[skill_id].discard(row)
+        self.jobs[row] = None
+        self.ids[row] = None
+        self._row_terms[row] = np.empty(0, dtype=int)
+        self._row_skills[row] = np.empty(0, dtype=int)
+        self._live_count -= 1
+        self._text_state = None
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= self._capacity:
+            return
+        capacity = max(rows, 2 * self._capacity, 64)
+        for name in ('_alive', '_active', '_required_counts', '_min_experience',
+                     '_max_experience', '_education_levels'):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+        self._capacity = capacity
+
+    # -------------------------------------------------------------- compaction
+
+    def _maybe_compact(self):
+        """Schedule a background compaction once tombstones or the delta grow large"""
+        removed = self.size - self._live_count
+        delta_rows = self.size - self._tf_base.shape[0]
+        if self._compacting:
+            return
+        if (removed <= Config.JOB_INDEX_COMPACT_RATIO * self.size
+                and delta_rows <= Config.JOB_INDEX_COMPACT_DELTA_ROWS):
+            return
+        self._compacting = True
+        threading.Thread(target=self._background_compact, daemon=True).start()
+
+    def _background_compact(self):
+        try:
+            self.compact()
+        except Exception as e:
+            logger.error(f"Job index compaction failed: {str(e)}")
+        finally:
+            self._compacting = False
+
+    def compact(self):
+        """Drop tombstoned rows and merge the delta segment into the base"""
+        with self.lock:
+            if self.read_only:
+                return
+            live = self.live_rows()
+            text = self._text_matrix()[live]
+
+            self._alive = self._alive[live]
+            self._required_counts = self._required_counts[live]
+            self._min_experience = self._min_experience[live]
+            self._max_experience = self._max_experience[live]
+            self._education_levels = self._education_levels[live]
+            self._active = self._active[live]
+            self._capacity = len(live)
+
+            self.jobs = [self.jobs[row] for row in live]
+            self.ids = [self.ids[row] for row in live]
+            self._row_terms = [self._row_terms[row] for row in live]
+            self._row_skills = [self._row_skills[row] for row in live]
+            self.row_of = {job_id: row for row, job_id in enumerate(self.ids) if job_id is not None}
+
+            self._skill_postings = {}
+            for row, skill_ids in enumerate(self._row_skills):
+                for skill_id in skill_ids:
+                    self._skill_postings.setdefault(skill_id, set()).add(row)
+
+            self._tf_base = text
+            self._delta_blocks = []
+            self._delta_matrix = None
+            self._text_state = None
+
+    # ----------------------------------------------------------------- scoring
+
+    def _text_matrix(self) -> csr_matrix:
+        """Term counts of every row, base segment followed by the delta"""
+        delta = self._delta()
+        if delta is None:
+            return self._tf_base
+        return vstack([self._tf_base, delta]).tocsr()
+
+    def _delta(self) -> Optional[csr_matrix]:
+        if not self._delta_blocks:
+            return None
+        if self._delta_matrix is None:
+            self._delta_matrix = vstack(self._delta_blocks).tocsr()
+        return self._delta_matrix
+
+    def _text_weights(self):
+        """
+        IDF from the maintained document frequencies and TF-IDF norms of every
+        row, cached until the next change
+        """
+        if self._text_state is None:
+            # Same smoothed IDF as sklearn's TfidfVectorizer
+            idf = np.log((1 + self._live_count) / (1 + self._document_frequency)) + 1
+            squared_idf = idf ** 2
+            norms = [self._tf_base.power(2) @ squared_idf]
+            delta = self._delta()
+            if delta is not None:
+                norms.append(delta.power(2) @ squared_idf)
+            self._text_state = (idf, np.sqrt(np.concatenate(norms)))
+        return self._text_state
+
+    def _posting(self, skill_id: int) -> np.ndarray:
+        """Rows whose job requires the skill"""
+        if self._skill_rows is not None:
+            return self._skill_rows[self._skill_indptr[skill_id]:self._skill_indptr[skill_id + 1]]
+        rows = self._skill_postings.get(skill_id, ())
+        return np.fromiter(rows, dtype=int, count=len(rows))
+
+    def skills_match(self, student_skills: List[str]) -> np.ndarray:
+        """Fraction of each job's required skills covered by the student"""
+        matched = np.zeros(self.size)
+        for skill in {canonical_skill(s) for s in student_skills or []}:
+            if skill in self.skill_ids:
+                matched[self._posting(self.skill_ids[skill])] += 1
+
+        required_counts = self._required_counts[:self.size]
+        scores = np.zeros(self.size)
+        np.divide(matched, required_counts, out=scores, where=required_counts > 0)
+        return scores
+
+    def experience_match(self, student_exp: float) -> np.ndarray:
+        """Vectorized form of JobMatcher._calculate_experience_match"""
+        min_experience = self._min_experience[:self.size]
+        max_experience = self._max_experience[:self.size]
+        below = np.maximum(0.0, 1.0 - (min_experience - student_exp) * 0.2)
+        above = np.maximum(0.7, 1.0 - (student_exp - max_experience) * 0.1)
+        return np.where(
+            student_exp < min_experience,
+            below,
+            np.where(student_exp > max_experience, above, 1.0)
+        )
+
+    def education_match(self, student_level: int) -> np.ndarray:
+        """Vectorized form of JobMatcher._calculate_education_match, from the student's education level"""
+        education_levels = self._education_levels[:self.size]
+        # A student below the requirement implies the requirement is > 0
+        ratio = student_level / np.maximum(education_levels, 1.0)
+        return np.where(student_level >= education_levels, 1.0, ratio)
+
+    def text_similarity(self, student_text: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        TF-IDF cosine similarity of the resume text against every job
+        description, or only against `rows` (result aligned with `rows`)
+        """
+        query = self.vectorizer.transform([student_text]) if student_text else None
+        return self.query_similarity(query, rows)
+
+    def query_similarity(self, query: Optional[csr_matrix], rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """text_similarity for resume term counts that were already hashed"""
+        scores = np.zeros(self.size if rows is None else len(rows))
+        if query is None or not query.nnz or not self._live_count or not len(scores):
+            return scores
+
+        idf, norms = self._text_weights()
+        query_weights = query.data * idf[query.indices]
+        query_norm = np.linalg.norm(query_weights)
+
+        # Dot products of TF-IDF vectors: counts . (query tf-idf * idf)
+        weights = np.zeros(self.n_features)
+        weights[query.indices] = query_weights * idf[query.indices]
+
+        base_rows = self._tf_base.shape[0]
+        delta = self._delta()
+        if rows is None:
+            dots = [self._tf_base @ weights]
+            if delta is not None:
+                dots.append(delta @ weights)
+            dots = np.concatenate(dots)
+        else:
+            # Only touch the term counts of the requested rows
+            dots = np.zeros(len(rows))
+            in_base = rows < base_rows
+            if in_base.any():
+                dots[in_base] = self._tf_base[rows[in_base]] @ weights
+            if not in_base.all():
+                dots[~in_base] = delta[rows[~in_base] - base_rows] @ weights
+            norms = norms[rows]
+
+        np.divide(dots, norms * query_norm, out=scores, where=norms > 0)
+        return scores
+
+    def idf(self, job_text: Optional[str] = None) -> np.ndarray:
+        """Smoothed IDF of this corpus, counting `job_text` as one more document if given"""
+        with self.lock:
+            document_frequency = self._document_frequency.astype(float)
+            documents = self._live_count
+        if job_text:
+            document_frequency[self.vectorizer.transform([job_text]).indices] += 1
+            documents += 1
+        return np.log((1 + documents) / (1 + document_frequency)) + 1
+
+    def description_similarity(self, student_text: str, job_text: str) -> float:
+        """
+        text_similarity against a job description that need not be indexed,
+        with this corpus' IDF counting the description as one more document
+        """
+        if not student_text or not job_text:
+            return 0.0
+        counts = self.vectorizer.transform([student_text, job_text]).tocsr()
+        query, document = counts[0], counts[1]
+        if not query.nnz or not document.nnz:
+            return 0.0
+
+        with self.lock:
+            documents = self._live_count + 1
+            query_df = self._document_frequency[query.indices] + np.isin(query.indices, document.indices)
+            document_df = self._document_frequency[document.indices] + 1
+        query_weights = query.data * (np.log((1 + documents) / (1 + query_df)) + 1)
+        document_weights = document.data * (np.log((1 + documents) / (1 + document_df)) + 1)
+
+        _, in_query, in_document = np.intersect1d(query.indices, document.indices, return_indices=True)
+        dot = query_weights[in_query] @ document_weights[in_document]
+        return float(dot / (np.linalg.norm(query_weights) * np.linalg.norm(document_weights)))
+
+    def _profile_inputs(self, student_profile: Dict[str, Any], features=None) -> tuple:
+        """
+        (skills, experience, education level, resume term counts), from
+        cached ProfileFeatures when they were hashed with this index's width
+        """
+        if features is not None and (features.term_counts is None or
+                                     features.term_counts.shape[1] == self.n_features):
+            return features.skills, features.experience, features.education_level, features.term_counts
+
+        resume_text = student_profile.get('resume_text', '')
+        return (
+            student_profile.get('skills', []),
+            to_float(student_profile.get('experience', 0), 0.0),
+            education_level(student_profile.get('education', '') or ''),
+            self.vectorizer.transform([resume_text]) if resume_text else None
+        )
+
+    def score(self, student_profile: Dict[str, Any], features=None) -> Dict[str, np.ndarray]:
+        """
+        Score a student profile against every row of the index.
+        Returns each component and the weighted total as arrays.
+        """
+        skills, experience, student_level, query = self._profile_inputs(student_profile, features)
+        with self.lock:
+            components = {
+                'skills': self.skills_match(skills),
+                'experience': self.experience_match(experience),
+                'education': self.education_match(student_level),
+                'text': self.query_similarity(query)
+            }
+
+        total = np.zeros(len(components['skills']))
+        for component, weight in MATCH_WEIGHTS.items():
+            total += components[component] * weight
+
+        components['total'] = np.minimum(total, 1.0)
+        return components
+
+    # ------------------------------------------------------------- persistence
+
+    def save(self, directory: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Write a compacted snapshot as .npy arrays plus a manifest
+        (extended with `metadata`, e.g. a version stamp). Returns the manifest.
+        """
+        with self.lock:
+            self.compact()
+            os.makedirs(directory, exist_ok=True)
+            size = self.size
+
+            arrays = {name.lstrip('_'): getattr(self, name)[:size] for name in self._COLUMNS}
+            arrays['document_frequency'] = self._document_frequency
+
+            idf, norms = self._text_weights()
+            arrays['idf'] = idf
+            arrays['norms'] = norms
+            arrays['tf_data'] = self._tf_base.data
+            arrays['tf_indices'] = self._tf_base.indices
+            arrays['tf_indptr'] = self._tf_base.indptr
+
+            # Skill postings as CSC-style (indptr, rows) arrays
+            postings = [self._posting(skill_id) for skill_id in range(len(self.skill_ids))]
+            arrays['skill_indptr'] = np.cumsum([0] + [len(rows) for rows in postings]).astype(np.int64)
+            arrays['skill_rows'] = np.concatenate(
+                [np.sort(rows) for rows in postings] or [np.empty(0)]
+            ).astype(np.int64)
+
+            # Job payloads as one JSON blob so workers only decode the rows they return
+            encoded = [json.dumps(job, default=str).encode('utf-8') for job in self.jobs]
+            arrays['payload_offsets'] = np.cumsum([0] + [len(blob) for blob in encoded]).astype(np.int64)
+            arrays['payloads'] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+            for name, array in arrays.items():
+                np.save(os.path.join(directory, f'{name}.npy'), array)
+
+            manifest = {
+                **(metadata or {}),
+                'rows': size,
+                'n_features': self.n_features,
+                'ids': self.ids,
+                'skills': sorted(self.skill_ids, key=self.skill_ids.get),
+                'arrays': sorted(arrays)
+            }
+            with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+                json.dump(manifest, f)
+            return manifest
+
+    @classmethod
+    def load(cls, directory: str) -> 'JobIndex':
+        """Map a saved snapshot read-only; pages are shared between processes"""
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            manifest = json.load(f)
+        arrays = {
+            name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+            for name in manifest['arrays']
+        }
+
+        index = cls()
+        index.read_only = True
+        index.n_features = manifest['n_features']
+        index.vectorizer.set_params(n_features=index.n_features)
+        rows = manifest['rows']
+
+        for name in cls._COLUMNS:
+            setattr(index, name, arrays[name.lstrip('_')])
+        index._document_frequency = arrays['document_frequency']
+        index._alive = np.ones(rows, dtype=bool)
+        index._capacity = rows
+        index._live_count = rows
+
+        index.jobs = _PayloadView(arrays['payloads'], arrays['payload_offsets'])
+        index.ids = manifest['ids']
+        index.row_of = {job_id: row for row, job_id in enumerate(index.ids) if job_id is not None}
+        index.skill_ids = {skill: skill_id for skill_id, skill in enumerate(manifest['skills'])}
+        index._skill_indptr = arrays['skill_indptr']
+        index._skill_rows = arrays['skill_rows']
+
+        index._tf_base = csr_matrix(
+            (arrays['tf_data'], arrays['tf_indices'], arrays['tf_indptr']),
+            shape=(rows, index.n_features),
+            copy=False
+        )
+        index._text_state = (arrays['idf'], arrays['norms'])
+        return index
+
+    def thawed(self) -> 'JobIndex':
+        """Mutable in-memory copy of this index (e.g. of a read-only snapshot)"""
+        with self.lock:
+            self.compact()
+            jobs = list(self.jobs)
+            copy = JobIndex()
+            copy._tf_base = csr_matrix(self._tf_base, copy=True)
+            copy._document_frequency = np.array(self._document_frequency)
+            for name in self._COLUMNS + ('_alive',):
+                setattr(copy, name, np.array(getattr(self, name)[:self.size]))
+            copy._capacity = self.size
+            copy._live_count = self.size
+
+            copy.jobs = jobs
+            copy.ids = list(self.ids)
+            copy.row_of = dict(self.row_of)
+            copy.skill_ids = dict(self.skill_ids)
+
+            row_skills = [[] for _ in range(self.size)]
+            for skill_id in range(len(self.skill_ids)):
+                rows = self._posting(skill_id)
+                if len(rows):
+                    copy._skill_postings[skill_id] = set(rows.tolist())
+                for row in rows:
+                    row_skills[row].append(skill_id)
+            copy._row_skills = [np.array(skill_ids, dtype=int) for skill_ids in row_skills]
+
+            indptr, indices = copy._tf_base.indptr, copy._tf_base.indices
+            copy._row_terms = [indices[indptr[row]:indptr[row + 1]] for row in range(self.size)]
+            return copy
+
+    def matrix_features(self, rows: Optional[np.ndarray] = None) -> 'MatrixFeatures':
+        """
+        Picklable job-side features of `rows` (all live rows by default) for
+        scoring many profiles at once, e.g. in a process pool
+        """
+        with self.lock:
+            if rows is None:
+                rows = self.live_rows()
+            rows = np.asarray(rows, dtype=int)
+
+            # L2-normalized TF-IDF rows with the index's current IDF
+            idf, norms = self._text_weights()
+            inverse_norms = np.zeros(len(rows))
+            np.divide(1.0, norms[rows], out=inverse_norms, where=norms[rows] > 0)
+            job_tfidf = csr_matrix(self._text_matrix()[rows].multiply(idf).multiply(inverse_norms[:, None]))
+
+            # Position of each index row in the selection, -1 if not selected
+            position = np.full(self.size, -1, dtype=int)
+            position[rows] = np.arange(len(rows))
+            skill_rows, skill_cols = [], []
+            for skill_id in range(len(self.skill_ids)):
+                positions = position[np.asarray(self._posting(skill_id), dtype=int)]
+                positions = positions[positions >= 0]
+                skill_rows.extend(positions)
+                skill_cols.extend([skill_id] * len(positions))
+            job_skills = csr_matrix(
+                (np.ones(len(skill_rows)), (skill_rows, skill_cols)),
+                shape=(len(rows), len(self.skill_ids))
+            )
+
+            return MatrixFeatures(
+                job_ids=[self.ids[row] for row in rows],
+                n_features=self.n_features,
+                idf=np.array(idf),
+                job_tfidf=job_tfidf,
+                skill_ids=dict(self.skill_ids),
+                job_skills=job_skills,
+                required_counts=np.array(self._required_counts[rows]),
+                min_experience=np.array(self._min_experience[rows]),
+                max_experience=np.array(self._max_experience[rows]),
+                education_levels=np.array(self._education_levels[rows])
+            )
+
+    # ----------------------------------------------------------------- ranking
+
+    def rank(self, student_profile: Dict[str, Any], rows: Optional[np.ndarray] = None,
+             limit: Optional[int] = None, min_score: Optional[float] = None, features=None):
+        """
+        Top jobs for a profile as (rows, total scores), best first.
+
+        Skill overlap comes from the skill postings and experience/education
+        are cheap columns, so those are scored for every candidate first.
+        Text similarity is at most 1, which bounds each job's total from
+        above; jobs whose bound cannot reach min_score or the current top-K
+        floor are pruned before the (expensive) text scoring, WAND-style.
+        Cached ProfileFeatures of the profile can be passed as `features`.
+        """
+        skills, experience, student_level, query = self._profile_inputs(student_profile, features)
+        with self.lock:
+            if rows is None:
+                rows = self.live_rows()
+            rows = np.asarray(rows, dtype=int)
+
+            partial = (
+                self.skills_match(skills)[rows] * MATCH_WEIGHTS['skills'] +
+                self.experience_match(experience)[rows] * MATCH_WEIGHTS['experience'] +
+                self.education_match(student_level)[rows] * MATCH_WEIGHTS['education']
+            )
+
+            # Text is >= 0, so the k-th best partial score is a floor for the top K
+            threshold = -np.inf if min_score is None else min_score
+            if limit is not None and 0 < limit < len(rows):
+                kth_position = len(rows) - limit
+                threshold = max(threshold, np.partition(partial, kth_position)[kth_position])
+
+            candidates = partial + MATCH_WEIGHTS['text'] >= threshold
+            rows, partial = rows[candidates], partial[candidates]
+            logger.debug(f"Job ranking pruned {int((~candidates).sum())} of {len(candidates)} jobs")
+
+            text = self.query_similarity(query, rows)
+            totals = np.minimum(partial + text * MATCH_WEIGHTS['text'], 1.0)
+
+        order = top_k_indices(totals, limit, min_score)
+        return rows[order], totals[order]
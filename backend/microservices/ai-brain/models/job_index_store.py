@@ -0,0 +1,186 @@
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+import logging
+from config.settings import Config
+from models.job_index import JobIndex
+
+try:
+    import fcntl
+except ImportError:  # Windows development setups run a single worker
+    fcntl = None
+
+logger = logging.getLogger('ai-brain')
+
+def apply_change(index: JobIndex, change: Dict[str, Any]) -> int:
+    """Apply a journaled registry change to a mutable index; returns the jobs it touched"""
+    if change['op'] == 'upsert':
+        index.add_many(change['jobs'], change['job_ids'])
+        return len(set(change['job_ids']))
+    return sum(1 for job_id in change['job_ids'] if index.remove(job_id))
+
+class JobIndexStore:
+    """
+    Versioned on-disk job index shared by ai-brain workers: compacted
+    snapshots plus a journal of the changes made since.
+
+    A snapshot is a directory of .npy arrays with a manifest. CURRENT names
+    the latest one and is swapped with an atomic rename, so workers always
+    map a complete snapshot. Every registry change is appended to the
+    journal as one small JSON file per version, so a write costs
+    O(size of the change); workers replay the entries past their version.
+    A compaction folds the journal into a new snapshot in the background.
+
+    Old snapshots and the journal entries they cover are pruned, so a
+    reader can find its version gone; it retries from the new CURRENT.
+    """
+
+    def __init__(self, directory: str, keep_versions: int = Config.JOB_INDEX_KEEP_VERSIONS):
+        self.directory = directory
+        self.keep_versions = max(keep_versions, 1)
+        os.makedirs(self._journal_dir, exist_ok=True)
+
+    @property
+    def _current_path(self) -> str:
+        return os.path.join(self.directory, 'CURRENT')
+
+    @property
+    def _journal_dir(self) -> str:
+        return os.path.join(self.directory, 'journal')
+
+    def _version_dir(self, version: int) -> str:
+        return os.path.join(self.directory, f'v{version:08d}')
+
+    def _entry_path(self, version: int) -> str:
+        return os.path.join(self._journal_dir, f'{version:08d}.json')
+
+    def current_version(self) -> Optional[int]:
+        """Version of the live snapshot"""
+        try:
+            with open(self._current_path) as f:
+                return int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def journal_versions(self) -> List[int]:
+        return sorted(
+            int(name[:-5]) for name in os.listdir(self._journal_dir)
+            if name.endswith('.json') and name[:-5].isdigit()
+        )
+
+    def latest_version(self) -> int:
+        """Newest version, snapshot or journal entry; 0 for an empty store"""
+        journal = self.journal_versions()
+        return max(self.current_version() or 0, journal[-1] if journal else 0)
+
+    @contextmanager
+    def write_lock(self):
+        """Serialize writers and pointer swaps across processes"""
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, '.lock'), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def append(self, change: Dict[str, Any], version: int):
+        """Journal `change` as `version`; call under the write lock"""
+        entry = f'{self._entry_path(version)}.{os.getpid()}.tmp'
+        with open(entry, 'w') as f:
+            json.dump({**change, 'version': version}, f, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(entry, self._entry_path(version))
+
+    def journal(self, after: int, upto: int) -> List[Dict[str, Any]]:
+        """
+        Changes of versions after+1..upto, in order. Raises FileNotFoundError
+        if an entry was pruned in the meantime.
+        """
+        entries = []
+        for version in range(after + 1, upto + 1):
+            with open(self._entry_path(version)) as f:
+                entries.append(json.load(f))
+        return entries
+
+    def load(self, version: int) -> JobIndex:
+        return JobIndex.load(self._version_dir(version))
+
+    def publish(self, index: JobIndex, version: int) -> Optional[Dict[str, Any]]:
+        """
+        Write `index` as the snapshot of `version` and make it live, unless
+        a snapshot at least as new already is. Returns the manifest if published.
+        """
+        staging = tempfile.mkdtemp(prefix=f'.v{version:08d}-', dir=self.directory)
+        try:
+            manifest = index.save(staging, {
+                'version': version,
+                'created_at': datetime.now().isoformat()
+            })
+            with self.write_lock():
+                if version <= (self.current_version() or 0):
+                    shutil.rmtree(staging, ignore_errors=True)
+                    return None
+                os.rename(staging, self._version_dir(version))
+
+                pointer = f'{self._current_path}.{os.getpid()}.tmp'
+                with open(pointer, 'w') as f:
+                    f.write(str(version))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(pointer, self._current_path)
+                self._prune(version)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        logger.info(f"Published job index version {version} ({manifest['rows']} jobs)")
+        return manifest
+
+    def compact(self) -> Optional[Dict[str, Any]]:
+        """
+        Fold the journal into a snapshot of the latest version. Only reading
+        the journal holds the write lock; rebuilding and saving the index
+        doesn't block writers.
+        """
+        with self.write_lock():
+            base, version = self.current_version() or 0, self.latest_version()
+            if version <= base:
+                return None
+            snapshot = self.load(base) if base else None
+            entries = self.journal(base, version)
+
+        index = snapshot.thawed() if snapshot is not None else JobIndex()
+        for entry in entries:
+            apply_change(index, entry)
+        return self.publish(index, version)
+
+    def _prune(self, current: int):
+        """
+        Remove old snapshots and the journal entries no kept snapshot needs.
+        Workers still mapping a removed snapshot keep valid pages until they
+        swap, since unlinked files stay alive while mapped.
+        """
+        versions = sorted(
+            int(name[1:]) for name in os.listdir(self.directory)
+            if name.startswith('v') and name[1:].isdigit()
+        )
+        kept = versions[-self.keep_versions:]
+        for version in versions[:-self.keep_versions]:
+            if version != current:
+                shutil.rmtree(self._version_dir(version), ignore_errors=True)
+
+        oldest = min(kept + [current])
+        for version in self.journal_versions():
+            if version <= oldest:
+                try:
+                    os.remove(self._entry_path(version))
+                except FileNotFoundError:
+                    pass
@@ -1,29 +1,42 @@
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union, Tuple
 import logging
 import json
-from groq import Groq
 from config.settings import Config
+from models.job_index import JobIndex, MATCH_WEIGHTS, education_level, top_k_indices
+from models.job_dedup import JobDeduplicator
+from models.job_registry import JobRegistry, JOB_ID_FIELDS, job_id_of
+from models.match_matrix import MatchMatrix
+from models.profile_features import profile_features
+from models.ranked_jobs import RankedJobs
+from models.skill_vocabulary import SkillSet, skill_vocabulary
+from models.student_index import StudentIndex, StudentRegistry
+from utils.cache import LRUCache, stable_hash
+from utils.llm_cache import llm_cache, json_content
 
 logger = logging.getLogger('ai-brain')
 
+# Profile fields that affect a job's match score
+PROFILE_MATCH_FIELDS = ('skills', 'experience', 'education', 'resume_text')
+
 class JobMatcher:
     """
     Advanced job matching using NLP, ML techniques, and Groq AI
     """
     
     def __init__(self):
-        # Initialize Groq AI
-        self.client = Groq(api_key=Config.GROQ_API_KEY)
+        # Groq calls go through the shared LLM gateway
         self.model = Config.GROQ_MODEL
         
-        self.vectorizer = TfidfVectorizer(
-            max_features=500,
-            ngram_range=(1, 2),
-            stop_words='english'
-        )
+        # Server-side jobs that match requests can reference by ID
+        self.job_registry = JobRegistry()
+        # Student profiles for reverse (job -> students) matching
+        self.student_registry = StudentRegistry()
+        # Computed rankings by profile and job corpus, for cursor pagination
+        self.ranking_cache = LRUCache(Config.RANKING_CACHE_SIZE, Config.RANKING_CACHE_TTL_SECONDS)
+        # Near-duplicate inline jobs are scored once per group, when asked for
+        self.job_deduplicator = JobDeduplicator()
+        
         self.skill_weights = {
             'exact_match': 2.0,
             'partial_match': 1.0,
@@ -32,42 +45,50 @@ class JobMatcher:
             'location': 0.8
         }
     
-    def calculate_match_score(self, student_profile: Dict[str, Any], job: Dict[str, Any]) -> float:
+    def calculate_match_score(self, student_profile: Dict[str, Any], job: Dict[str, Any],
+                              text_similarity: Optional[float] = None) -> float:
         """
-        Calculate comprehensive match score between student and job
+        Calculate comprehensive match score between student and job.
+        A precomputed text similarity (e.g. from a JobIndex) skips the TF-IDF step;
+        otherwise text is weighted with the job registry's corpus IDF, so a
+        registered job scores as it does in a registry /match ranking.
         """
         try:
+            # Skill set and education level come from the shared profile cache
+            features = profile_features.features(student_profile)
+            
             # Skills matching
             skills_score = self._calculate_skills_match(
-                student_profile.get('skills', []),
+                features.skill_set,
                 job.get('required_skills', [])
             )
             
             # Experience matching
             experience_score = self._calculate_experience_match(
-                student_profile.get('experience', 0),
+                features.experience,
                 job.get('min_experience', 0),
                 job.get('max_experience', 10)
             )
             
             # Education matching
             education_score = self._calculate_education_match(
-                student_profile.get('education', ''),
+                features.education_level,
                 job.get('required_education', '')
             )
             
             # Text similarity (resume vs job description)
-            text_similarity = self._calculate_text_similarity(
-                student_profile.get('resume_text', ''),
-                job.get('description', '')
-            )
+            if text_similarity is None:
+                text_similarity = self._calculate_text_similarity(
+                    student_profile.get('resume_text', ''),
+                    job
+                )
             
             # Weighted combination
             total_score = (
-                skills_score * 0.4 +
-                experience_score * 0.25 +
-                education_score * 0.15 +
-                text_similarity * 0.2
+                skills_score * MATCH_WEIGHTS['skills'] +
+                experience_score * MATCH_WEIGHTS['experience'] +
+                education_score * MATCH_WEIGHTS['education'] +
+                text_similarity * MATCH_WEIGHTS['text']
             )
             
             return min(total_score, 1.0)
@@ -76,18 +97,13 @@ class JobMatcher:
             logger.error(f"Error calculating match score: {str(e)}")
             return 0.0
     
-    def _calculate_skills_match(self, student_skills: List[str], required_skills: List[str]) -> float:
-        """Calculate skills match score"""
+    def _calculate_skills_match(self, student_skills: SkillSet, required_skills: List[str]) -> float:
+        """Calculate skills match score from the student's encoded skill set"""
         if not student_skills or not required_skills:
             return 0.0
         
-        student_skills_lower = [s.lower() for s in student_skills]
-        required_skills_lower = [s.lower() for s in required_skills]
-        
-        matched_skills = set(student_skills_lower) & set(required_skills_lower)
-        
-        if len(required_skills) == 0:
-            return 0.0
+        # Canonical skill bitsets: overlap is an AND plus a popcount
+        matched_skills = student_skills & skill_vocabulary.encode(required_skills)
         
         return len(matched_skills) / len(required_skills)
     
@@ -102,66 +118,225 @@ class JobMatcher:
         else:
             return 1.0
     
-    def _calculate_education_match(self, student_edu: str, required_edu: str) -> float:
-        """Calculate education match score"""
-        education_hierarchy = {
-            'phd': 5,
-            'doctorate': 5,
-            'masters': 4,
-            'mba': 4,
-            'bachelors': 3,
-            'diploma': 2,
-            'high school': 1
-        }
-        
-        student_level = 0
-        required_level = 0
-        
-        student_edu_lower = student_edu.lower()
-        required_edu_lower = required_edu.lower()
-        
-        for edu, level in education_hierarchy.items():
-            if edu in student_edu_lower:
-                student_level = max(student_level, level)
-            if edu in required_edu_lower:
-                required_level = max(required_level, level)
+    def _calculate_education_match(self, student_level: int, required_edu: str) -> float:
+        """Calculate education match score from the student's education level"""
+        required_level = education_level(required_edu)
         
         if student_level >= required_level:
             return 1.0
         else:
             return max(0.0, student_level / required_level if required_level > 0 else 0.5)
     
-    def _calculate_text_similarity(self, student_text: str, job_text: str) -> float:
-        """Calculate text similarity using TF-IDF and cosine similarity"""
+    def _calculate_text_similarity(self, student_text: str, job: Dict[str, Any]) -> float:
+        """
+        TF-IDF cosine similarity of the resume and the job description, with
+        IDF from the registered job corpus. A registered job with the same
+        description reads its indexed row; any other job counts as one more
+        document of the corpus.
+        """
+        job_text = job.get('description', '') or ''
         if not student_text or not job_text:
             return 0.0
         
         try:
-            vectors = self.vectorizer.fit_transform([student_text, job_text])
-            similarity = cosine_similarity(vectors[0:1], vectors[1:2])[0][0]
-            return float(similarity)
+            with self.job_registry.selection(self._registered_ids(job)) as (index, rows):
+                if self._is_indexed(index, rows, job_text):
+                    return float(index.text_similarity(student_text, rows)[0])
+                return index.description_similarity(student_text, job_text)
         except Exception as e:
             logger.error(f"Error calculating text similarity: {str(e)}")
             return 0.0
     
-    def rank_jobs(self, student_profile: Dict[str, Any], jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _registered_ids(self, job: Dict[str, Any]) -> List[str]:
+        try:
+            return [job_id_of(job)]
+        except ValueError:
+            return []
+
+    def _is_indexed(self, index: JobIndex, rows: np.ndarray, job_text: str) -> bool:
+        """Whether the registered row selected for a job holds the same description"""
+        return bool(len(rows)) and (index.jobs[rows[0]].get('description', '') or '') == job_text
+
+    def _corpus_idf(self, job: Dict[str, Any]) -> np.ndarray:
+        """Registry corpus IDF that _calculate_text_similarity weights the job's text with"""
+        job_text = job.get('description', '') or ''
+        with self.job_registry.selection(self._registered_ids(job)) as (index, rows):
+            return index.idf(None if self._is_indexed(index, rows, job_text) else job_text)
+
+    def rank_jobs(self, student_profile: Dict[str, Any], jobs: List[Dict[str, Any]],
+                  limit: Optional[int] = None, min_score: Optional[float] = None,
+                  lazy: bool = False, dedup: Optional[bool] = None) -> Union[List[Dict[str, Any]], RankedJobs]:
         """
-        Rank jobs based on match scores
+        Rank jobs based on match scores.
+        With limit/min_score only the surviving top jobs are sorted and copied.
+        With dedup (default JOB_DEDUP_ENABLED), near-duplicate postings share
+        the score of their group's first job; grouping costs about as much as
+        scoring, so it only pays off for lists with many reposts.
+        With lazy=True the result dicts are built while iterating the ranking.
         """
-        scored_jobs = []
-        
-        for job in jobs:
-            score = self.calculate_match_score(student_profile, job)
-            scored_jobs.append({
-                **job,
-                'match_score': score,
-                'match_percentage': round(score * 100, 2)
-            })
-        
-        # Sort by match score (descending)
-        scored_jobs.sort(key=lambda x: x['match_score'], reverse=True)
-        
-        return scored_jobs
+        dedup = Config.JOB_DEDUP_ENABLED if dedup is None else dedup
+        representatives = self.job_deduplicator.group(jobs) if dedup and jobs else None
+        if representatives is None or len(set(representatives)) == len(jobs):
+            # Featurize the job list once and score every job in a vectorized pass
+            return self.rank_index(student_profile, self.build_index(jobs), limit=limit,
+                                   min_score=min_score, lazy=lazy)
+
+        # Score one job per near-duplicate group, then fan the scores out.
+        # Every top job's group is among the top `limit` groups.
+        unique_positions = sorted(set(representatives))
+        index = self.build_index([jobs[position] for position in unique_positions])
+        rows, totals = index.rank(student_profile, limit=limit, min_score=min_score,
+                                  features=profile_features.features(student_profile))
+        group_scores = {unique_positions[row]: total for row, total in zip(rows, totals)}
+
+        positions = np.array([p for p, rep in enumerate(representatives) if rep in group_scores], dtype=int)
+        scores = np.array([group_scores[representatives[p]] for p in positions])
+        order = top_k_indices(scores, limit, min_score)
+        ranking = RankedJobs(jobs, positions[order], scores[order])
+        return ranking if lazy else list(ranking)
+
+    def rank_registered_jobs(self, student_profile: Dict[str, Any], job_ids: Optional[List[str]] = None,
+                             filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None,
+                             min_score: Optional[float] = None,
+                             lazy: bool = False) -> Union[List[Dict[str, Any]], RankedJobs]:
+        """
+        Rank jobs from the registry, selected by ID or filter (all active jobs by default)
+        """
+        with self.job_registry.selection(job_ids, filters) as (index, rows):
+            return self.rank_index(student_profile, index, rows, limit=limit, min_score=min_score, lazy=lazy)
+
+    def cached_ranking(self, student_profile: Dict[str, Any], jobs: Optional[List[Dict[str, Any]]] = None,
+                       job_ids: Optional[List[str]] = None,
+                       filters: Optional[Dict[str, Any]] = None,
+                       dedup: Optional[bool] = None) -> Tuple[str, RankedJobs]:
+        """
+        Full lazy ranking of the inline jobs or the registered selection, cached
+        by profile hash and job corpus (content hash, or registry version).
+        Returns the cache key, which later pages are looked up by.
+        """
+        profile_key = stable_hash({field: student_profile.get(field) for field in PROFILE_MATCH_FIELDS})
+
+        if jobs:
+            dedup = Config.JOB_DEDUP_ENABLED if dedup is None else dedup
+            key = stable_hash(['jobs', profile_key, stable_hash(jobs), dedup])
+            ranking = self.ranking_cache.get(key)
+            if ranking is None:
+                ranking = self.rank_jobs(student_profile, jobs, lazy=True, dedup=dedup)
+                self.ranking_cache.put(key, ranking)
+            return key, ranking
+
+        with self.job_registry.selection(job_ids, filters) as (index, rows):
+            key = stable_hash(['registry', profile_key, self.job_registry.version, job_ids, filters])
+            ranking = self.ranking_cache.get(key)
+            if ranking is None:
+                ranking = self.rank_index(student_profile, index, rows, lazy=True)
+                self.ranking_cache.put(key, ranking)
+            return key, ranking
+
+    def add_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Register a new or changed job without rebuilding the index"""
+        return self.job_registry.upsert([job])
+
+    def update_job(self, job_id: str, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace a registered job, keeping the id from the URL"""
+        return self.job_registry.upsert([{**job, 'id': job_id}])
+
+    def remove_job(self, job_id: str) -> Dict[str, Any]:
+        """Remove a registered job (e.g. when it is closed)"""
+        return self.job_registry.delete([job_id])
+
+    def rank_index(self, student_profile: Dict[str, Any], index: JobIndex, rows: Optional[np.ndarray] = None,
+                   limit: Optional[int] = None, min_score: Optional[float] = None,
+                   lazy: bool = False) -> Union[List[Dict[str, Any]], RankedJobs]:
+        """
+        Rank the jobs of a prebuilt index, optionally restricted to some rows
+        """
+        with index.lock:
+            # Descending by match score; jobs that can't make the cut skip text scoring
+            selected, scores = index.rank(student_profile, rows, limit=limit, min_score=min_score,
+                                          features=profile_features.features(student_profile))
+            if not lazy:
+                return list(RankedJobs(index.jobs, selected, scores, index.ids))
+            # A lazy ranking outlives the lock (e.g. cached for cursor pages).
+            # Read-only snapshots never change, but a mutable index tombstones
+            # removed rows in place, so the ranking keeps copies of its lists.
+            if index.read_only:
+                return RankedJobs(index.jobs, selected, scores, index.ids)
+            return RankedJobs(list(index.jobs), selected, scores, list(index.ids))
+
+    def rank_students(self, job: Dict[str, Any], students: Optional[List[Dict[str, Any]]] = None,
+                      student_ids: Optional[List[str]] = None, limit: Optional[int] = None,
+                      min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Reverse matching: rank students for one job with score breakdowns.
+        Uses the given profiles, otherwise the registered students. Text is
+        weighted with the job corpus IDF, as in calculate_match_score.
+        """
+        if students:
+            index = StudentIndex(students)
+        else:
+            index = self.student_registry.index(student_ids)
+        return index.rank(job, self._corpus_idf(job), limit=limit, min_score=min_score)
+
+    def match_embedding(self, embedding: Optional[List[float]], skills: List[str],
+                        limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Match a resume embedding against the registered jobs' embeddings.
+        The nearest jobs by cosine similarity are re-scored as a blend of
+        similarity and skill overlap; without an embedding (or any indexed
+        job embeddings), active jobs are ranked by skill overlap alone.
+        """
+        vectors = self.job_registry.vector_index()
+        weight = Config.VECTOR_MATCH_WEIGHT
+
+        with self.job_registry.selection() as (index, rows):
+            skill_scores = index.skills_match(skills or [])
+
+            if embedding and len(vectors):
+                job_ids, similarities = vectors.search(embedding, limit * Config.VECTOR_MATCH_CANDIDATE_FACTOR)
+                # The vector index may lag the job index by one version
+                found = [i for i, job_id in enumerate(job_ids) if job_id in index.row_of]
+                rows = np.array([index.row_of[job_ids[i]] for i in found], dtype=int)
+                similarities = similarities[found]
+                scores = weight * similarities + (1 - weight) * skill_scores[rows]
+            else:
+                similarities = None
+                scores = skill_scores[rows]
+
+            matches = []
+            for position in top_k_indices(scores, limit):
+                job = index.jobs[rows[position]]
+                matches.append({
+                    'jobId': index.ids[rows[position]],
+                    'matchScore': round(float(scores[position]) * 100, 2),
+                    'company': job.get('companyName') or job.get('company'),
+                    'title': job.get('title'),
+                    'similarity': None if similarities is None else round(float(similarities[position]), 4),
+                    'skillMatch': round(float(skill_scores[rows[position]]), 4)
+                })
+            return matches
+
+    def match_matrix(self, jobs: Optional[List[Dict[str, Any]]] = None, job_ids: Optional[List[str]] = None,
+                     filters: Optional[Dict[str, Any]] = None, block_size: Optional[int] = None) -> MatchMatrix:
+        """
+        Bulk scorer for many students against the given jobs, otherwise
+        against the registered job selection
+        """
+        if jobs:
+            features = self.build_index(jobs).matrix_features()
+            # Inline jobs are indexed by position; keep whatever ids they carry
+            features = features._replace(job_ids=[
+                next((str(job[field]) for field in JOB_ID_FIELDS if job.get(field) is not None), None)
+                for job in jobs
+            ])
+        else:
+            with self.job_registry.selection(job_ids, filters) as (index, rows):
+                features = index.matrix_features(rows)
+        return MatchMatrix(features, block_size=block_size)
+
+    def build_index(self, jobs: List[Dict[str, Any]]) -> JobIndex:
+        """Build a job-corpus index for scoring many jobs against one profile"""
+        return JobIndex(jobs)
 
     def ai_analyze_job_fit(self, student_profile: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -203,21 +378,16 @@ Provide analysis in JSON format:
 }}
 """
             
-            response = self.client.chat.completions.create(
+            response_text = llm_cache.complete(
+                'job_fit',
+                validate=json_content,
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.7,
                 max_tokens=4096
             )
-            response_text = response.choices[0].message.content.strip()
-            
-            # Clean up response
-            if response_text.startswith('```'):
-                import re
-                response_text = re.sub(r'^```json?\s*', '', response_text)
-                response_text = re.sub(r'\s*```$', '', response_text)
             
-            analysis = json.loads(response_text)
+            analysis = json_content(response_text)
             
             return {
                 'success': True,
@@ -242,12 +412,28 @@ Provide analysis in JSON format:
         Use AI to recommend ideal job types and roles for the student
         """
         try:
-            skills = ', '.join(student_profile.get('skills', []))
-            education = student_profile.get('education', 'Not specified')
-            experience = student_profile.get('experience', 0)
-            interests = ', '.join(student_profile.get('interests', []))
+            response_text = llm_cache.complete(
+                'job_recommendations', validate=self.parse_ai_recommendations,
+                **self.ai_recommend_request(student_profile, limit)
+            )
+            return self.parse_ai_recommendations(response_text)
             
-            prompt = f"""
+        except Exception as e:
+            logger.error(f"AI job recommendations failed: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'recommendations': []
+            }
+
+    def ai_recommend_request(self, student_profile: Dict[str, Any], limit: int = 5) -> Dict[str, Any]:
+        """Chat completion request for AI job recommendations (also used for streaming)"""
+        skills = ', '.join(student_profile.get('skills', []))
+        education = student_profile.get('education', 'Not specified')
+        experience = student_profile.get('experience', 0)
+        interests = ', '.join(student_profile.get('interests', []))
+        
+        prompt = f"""
 Based on this candidate's profile, recommend the top {limit} job roles they should pursue:
 
 CANDIDATE PROFILE:
@@ -272,32 +458,27 @@ For each recommended role, provide in JSON format:
     ]
 }}
 """
-            
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=4096
-            )
-            response_text = response.choices[0].message.content.strip()
-            
-            # Clean up response
-            if response_text.startswith('```'):
-                import re
-                response_text = re.sub(r'^```json?\s*', '', response_text)
-                response_text = re.sub(r'\s*```$', '', response_text)
-            
-            recommendations = json.loads(response_text)
-            
-            return {
-                'success': True,
-                'recommendations': recommendations.get('recommendations', [])
-            }
-            
-        except Exception as e:
-            logger.error(f"AI job recommendations failed: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e),
-                'recommendations': []
-            }
+        
+        return {
+            'model': self.model,
+            'messages': [{"role": "user", "content": prompt}],
+            'temperature': 0.7,
+            'max_tokens': 4096
+        }
+
+    def parse_ai_recommendations(self, response_text: str) -> Dict[str, Any]:
+        """AI job recommendations from the model's response text"""
+        response_text = response_text.strip()
+        
+        # Clean up response
+        if response_text.startswith('```'):
+            import re
+            response_text = re.sub(r'^```json?\s*', '', response_text)
+            response_text = re.sub(r'\s*```$', '', response_text)
+        
+        recommendations = json.loads(response_text)
+        
+        return {
+            'success': True,
+            'recommendations': recommendations.get('recommendations', [])
+        }
@@ -0,0 +1,251 @@
+import numpy as np
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional
+import logging
+from config.settings import Config
+from models.job_index import JobIndex
+from models.job_index_store import JobIndexStore, apply_change
+from models.vector_index import VectorIndex
+
+logger = logging.getLogger('ai-brain')
+
+JOB_ID_FIELDS = ('id', '_id', 'job_id')
+
+# Reads of a store version pruned meanwhile are retried from the new CURRENT
+REFRESH_ATTEMPTS = 3
+
+def job_id_of(job: Dict[str, Any]) -> str:
+    """Return the job's identifier, accepting the id field names used by callers"""
+    for field in JOB_ID_FIELDS:
+        if job.get(field) is not None:
+            return str(job[field])
+    raise ValueError(f"Job is missing an id (one of {', '.join(JOB_ID_FIELDS)})")
+
+def matches_filters(job: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """Equality filter on job fields; a list value matches any of its items"""
+    for field, expected in filters.items():
+        value = job.get(field)
+        if isinstance(expected, list):
+            if value not in expected:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+class JobRegistry:
+    """
+    Registry of jobs referenced by ID. Jobs are featurized into an
+    incrementally updated JobIndex as they are upserted, so match requests
+    don't have to ship and re-featurize the job list.
+
+    With a store directory (JOB_INDEX_DIR), the index is shared between
+    worker processes as read-only memory-mapped snapshots plus a journal of
+    later changes. A worker applying a change takes the store's write lock,
+    catches up and journals it as the next version. Workers replay journal
+    entries past their version (on a private thawed copy once the snapshot
+    is behind) and hot-swap to each newer snapshot, which a background
+    compaction publishes after JOB_INDEX_JOURNAL_MAX_ENTRIES changes.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        directory = Config.JOB_INDEX_DIR if directory is None else directory
+        self.index = JobIndex()
+        self._version = 0
+        # Snapshot version the index was loaded from
+        self._base = 0
+        # Guards swapping self.index; scoring holds the index's own lock
+        self._lock = threading.RLock()
+        self._store = JobIndexStore(directory) if directory else None
+        self._checked_at = 0.0
+        self._compacting = False
+        # Embeddings of the active jobs, resynced lazily per version
+        self._vectors = VectorIndex()
+        self._vectors_version = -1
+        if self._store:
+            self._refresh(force=True)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self.index)
+
+    def _refresh(self, force: bool = False):
+        """Catch up with changes other workers made to the store"""
+        if self._store is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._checked_at < Config.JOB_INDEX_REFRESH_SECONDS:
+            return
+        self._checked_at = now
+
+        for attempt in range(1, REFRESH_ATTEMPTS + 1):
+            try:
+                self._catch_up()
+                return
+            except FileNotFoundError as e:
+                # A compaction pruned the version read meanwhile
+                if attempt == REFRESH_ATTEMPTS:
+                    raise
+                logger.warning(f"Job index version vanished while refreshing, retrying: {str(e)}")
+
+    def _catch_up(self):
+        """Map a newer snapshot if there is one, then replay the journal past it"""
+        base = self._store.current_version() or 0
+        latest = max(self._store.latest_version(), base)
+        if latest == self._version and base <= self._base:
+            return
+
+        if base > self._base or self._version < base:
+            index, version = (self._store.load(base) if base else JobIndex()), base
+        else:
+            index, version, base = self.index, self._version, self._base
+        entries = self._store.journal(version, latest)
+        if entries and index.read_only:
+            index = index.thawed()
+        for entry in entries:
+            apply_change(index, entry)
+
+        with self._lock:
+            self.index = index
+            self._base = base
+            self._version = latest
+        logger.info(f"Caught up with job index version {latest} "
+                    f"(snapshot {self._base}, {len(entries)} journal entries, {len(index)} jobs)")
+
+    def _apply(self, change: Dict[str, Any]) -> int:
+        """Apply a change and bump the version (journaling it) if it touches any job"""
+        with self._lock:
+            if self._store is None:
+                changed = apply_change(self.index, change)
+                if changed:
+                    self._version += 1
+                return changed
+
+            with self._store.write_lock():
+                self._checked_at = time.monotonic()
+                self._catch_up()
+                if change['op'] == 'delete':
+                    change = {**change, 'job_ids': [job_id for job_id in change['job_ids']
+                                                    if job_id in self.index.row_of]}
+                if not change['job_ids']:
+                    return 0
+                version = self._version + 1
+                self._store.append(change, version)
+                if self.index.read_only:
+                    self.index = self.index.thawed()
+                changed = apply_change(self.index, change)
+                self._version = version
+
+            if version - self._base >= Config.JOB_INDEX_JOURNAL_MAX_ENTRIES:
+                self._compact_store(background=True)
+            return changed
+
+    def _compact_store(self, background: bool = False):
+        """Fold the store's journal into a new snapshot, at most one pass at a time per worker"""
+        with self._lock:
+            if self._compacting:
+                return
+            self._compacting = True
+
+        def run():
+            try:
+                self._store.compact()
+            except Exception as e:
+                logger.error(f"Job index store compaction failed: {str(e)}")
+            finally:
+                self._compacting = False
+
+        if background:
+            threading.Thread(target=run, daemon=True).start()
+        else:
+            run()
+
+    def upsert(self, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Insert or replace jobs by ID"""
+        # Validate every id first so a bad entry doesn't leave a partial upsert
+        job_ids = [job_id_of(job) for job in jobs]
+
+        upserted = self._apply({'op': 'upsert', 'jobs': jobs, 'job_ids': job_ids})
+        return {'upserted': upserted, 'version': self._version}
+
+    def delete(self, job_ids: List[str]) -> Dict[str, Any]:
+        """Remove jobs by ID; unknown IDs are ignored"""
+        deleted = self._apply({'op': 'delete', 'job_ids': [str(job_id) for job_id in job_ids]})
+        return {'deleted': deleted, 'version': self._version}
+
+    def compact(self) -> Dict[str, Any]:
+        """Merge pending index changes now instead of waiting for the background pass"""
+        if self._store is not None:
+            self._compact_store()
+            self._refresh(force=True)
+        else:
+            self.index.compact()
+        return self.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        self._refresh()
+        index = self.index
+        with index.lock:
+            return {
+                'version': self._version,
+                'total_jobs': len(index),
+                'active_jobs': len(index.active_rows()),
+                'shared_snapshot': self._store is not None,
+                'snapshot_version': self._base,
+                'journal_entries': self._version - self._base if self._store else 0,
+                'index': index.stats()
+            }
+
+    def vector_index(self) -> VectorIndex:
+        """
+        Vector index over the `embedding` field of the active jobs, rebuilt
+        from the job index after each version change. Jobs without an
+        embedding, or whose dimension differs from the first one, are skipped.
+        """
+        self._refresh()
+        with self._lock:
+            if self._vectors_version == self._version:
+                return self._vectors
+
+            index = self.index
+            job_ids, embeddings = [], []
+            with index.lock:
+                for row in index.active_rows():
+                    embedding = index.jobs[row].get('embedding')
+                    if not embedding or (embeddings and len(embedding) != len(embeddings[0])):
+                        continue
+                    job_ids.append(index.ids[row])
+                    embeddings.append(embedding)
+
+            self._vectors.reset(job_ids, embeddings)
+            self._vectors_version = self._version
+            logger.info(f"Synced job vector index: {len(job_ids)} embeddings, version {self._version}")
+            return self._vectors
+
+    @contextmanager
+    def selection(self, job_ids: Optional[List[str]] = None,
+                  filters: Optional[Dict[str, Any]] = None):
+        """
+        Resolve a job selection to rows of the current index and hold the
+        index lock while the caller scores them, so rows stay valid.
+        Without job_ids or filters, every active job is selected.
+        """
+        self._refresh()
+        index = self.index
+        with index.lock:
+            if job_ids is None and not filters:
+                rows = index.active_rows()
+            else:
+                if job_ids is not None:
+                    rows = sorted({index.row_of[str(job_id)] for job_id in job_ids if str(job_id) in index.row_of})
+                else:
+                    rows = index.live_rows()
+                if filters:
+                    rows = [row for row in rows if matches_filters(index.jobs[row], filters)]
+
+            yield index, np.array(rows, dtype=int)
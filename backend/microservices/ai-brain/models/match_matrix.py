@@ -0,0 +1,205 @@
+import multiprocessing
+import numpy as np
+import os
+import pickle
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+import logging
+from config.settings import Config
+from models.job_index import MATCH_WEIGHTS, MatrixFeatures, education_level, to_float
+from models.skill_vocabulary import canonical_skill
+
+logger = logging.getLogger('ai-brain')
+
+# Job-side features loaded by a pool worker, by request token; concurrent
+# requests share the workers, so a few are kept
+_worker_features: 'OrderedDict[str, MatrixFeatures]' = OrderedDict()
+WORKER_FEATURES_KEPT = 4
+
+# One pool per server process, shared by all requests
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+def score_block(features: MatrixFeatures, students: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Score a block of students against every job in `features`.
+    Returns a float32 (students x jobs) matrix with the same components and
+    weights as JobMatcher.calculate_match_score.
+    """
+    n_students, n_jobs = len(students), len(features.job_ids)
+
+    # Skills: student x skill indicator times the job x skill incidence
+    skill_rows, skill_cols = [], []
+    for row, student in enumerate(students):
+        for skill in {canonical_skill(s) for s in student.get('skills') or []}:
+            skill_id = features.skill_ids.get(skill)
+            if skill_id is not None:
+                skill_rows.append(row)
+                skill_cols.append(skill_id)
+    student_skills = csr_matrix(
+        (np.ones(len(skill_rows)), (skill_rows, skill_cols)),
+        shape=(n_students, len(features.skill_ids))
+    )
+    matched = (student_skills @ features.job_skills.T).toarray()
+    skills = np.zeros((n_students, n_jobs))
+    np.divide(matched, features.required_counts, out=skills, where=features.required_counts > 0)
+
+    experience = np.array([to_float(s.get('experience', 0), 0.0) for s in students])[:, None]
+    min_exp, max_exp = features.min_experience[None, :], features.max_experience[None, :]
+    experience_scores = np.where(
+        experience < min_exp,
+        np.maximum(0.0, 1.0 - (min_exp - experience) * 0.2),
+        np.where(experience > max_exp, np.maximum(0.7, 1.0 - (experience - max_exp) * 0.1), 1.0)
+    )
+
+    levels = np.array([education_level(s.get('education', '') or '') for s in students], dtype=float)[:, None]
+    required = features.education_levels[None, :]
+    education = np.ones((n_students, n_jobs))
+    np.divide(levels, required, out=education, where=(required > 0) & (levels < required))
+
+    # Text: normalized resume TF-IDF (job-corpus IDF) times normalized job TF-IDF
+    vectorizer = HashingVectorizer(
+        n_features=features.n_features,
+        ngram_range=(1, 2),
+        stop_words='english',
+        alternate_sign=False,
+        norm=None
+    )
+    resumes = vectorizer.transform([s.get('resume_text', '') or '' for s in students])
+    queries = normalize(csr_matrix(resumes.multiply(features.idf)))
+    text = (queries @ features.job_tfidf.T).toarray()
+
+    total = (
+        skills * MATCH_WEIGHTS['skills']
+        + experience_scores * MATCH_WEIGHTS['experience']
+        + education * MATCH_WEIGHTS['education']
+        + text * MATCH_WEIGHTS['text']
+    )
+    return np.minimum(total, 1.0).astype(np.float32)
+
+def shared_pool() -> ProcessPoolExecutor:
+    """
+    The process pool for bulk scoring, created on first use. Workers start
+    with MATCH_MATRIX_START_METHOD (forkserver by default): forking the
+    threaded server itself could copy locks held by other request threads.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            method = Config.MATCH_MATRIX_START_METHOD
+            if method not in multiprocessing.get_all_start_methods():
+                method = 'spawn'
+            _pool = ProcessPoolExecutor(max_workers=Config.MATCH_MATRIX_WORKERS or os.cpu_count() or 1,
+                                        mp_context=multiprocessing.get_context(method))
+            logger.info(f"Started match matrix pool ({method})")
+        return _pool
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next request starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+def _load_features(token: str, path: str) -> MatrixFeatures:
+    features = _worker_features.get(token)
+    if features is None:
+        with open(path, 'rb') as f:
+            features = _worker_features[token] = pickle.load(f)
+        while len(_worker_features) > WORKER_FEATURES_KEPT:
+            _worker_features.popitem(last=False)
+    return features
+
+def _score_worker_block(token: str, path: str, start: int,
+                        students: List[Dict[str, Any]]) -> Tuple[int, np.ndarray, float, int]:
+    started = time.perf_counter()
+    scores = score_block(_load_features(token, path), students)
+    return start, scores, time.perf_counter() - started, os.getpid()
+
+class MatchMatrix:
+    """
+    Bulk students x jobs scoring. Students are split into fixed-size blocks
+    that are scored on the shared process pool; the job-side features are
+    written to a temporary file once per request and each worker loads them
+    on its first block.
+    """
+
+    def __init__(self, features: MatrixFeatures, workers: Optional[int] = None,
+                 block_size: Optional[int] = None):
+        self.features = features
+        # At most the shared pool's size; 1 scores in the request thread
+        self.workers = workers or Config.MATCH_MATRIX_WORKERS or os.cpu_count() or 1
+        self.block_size = max(1, block_size or Config.MATCH_MATRIX_BLOCK_SIZE)
+
+    @property
+    def job_ids(self) -> List[Optional[str]]:
+        return self.features.job_ids
+
+    def blocks(self, students: List[Dict[str, Any]]) -> Iterator[Tuple[int, np.ndarray, Dict[str, Any]]]:
+        """
+        Yield (first student row, score block, timing) as blocks finish,
+        which is not necessarily in row order
+        """
+        starts = range(0, len(students), self.block_size)
+        workers = min(self.workers, len(starts))
+
+        if workers <= 1:
+            for start in starts:
+                started = time.perf_counter()
+                scores = score_block(self.features, students[start:start + self.block_size])
+                yield start, scores, self._timing(start, scores, time.perf_counter() - started, os.getpid())
+            return
+
+        pool = shared_pool()
+        token = uuid.uuid4().hex
+        with tempfile.NamedTemporaryFile(prefix='match-matrix-', suffix='.pkl', delete=False) as f:
+            pickle.dump(self.features, f, protocol=pickle.HIGHEST_PROTOCOL)
+        futures = []
+        try:
+            futures = [
+                pool.submit(_score_worker_block, token, f.name, start, students[start:start + self.block_size])
+                for start in starts
+            ]
+            for future in as_completed(futures):
+                start, scores, seconds, pid = future.result()
+                yield start, scores, self._timing(start, scores, seconds, pid)
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            raise
+        finally:
+            # A client that stops reading leaves blocks that needn't run
+            for future in futures:
+                future.cancel()
+            os.unlink(f.name)
+
+    def _timing(self, start: int, scores: np.ndarray, seconds: float, pid: int) -> Dict[str, Any]:
+        return {
+            'block': start // self.block_size,
+            'rows': [start, start + scores.shape[0]],
+            'seconds': round(seconds, 6),
+            'worker_pid': pid
+        }
+
+    def dense(self, students: List[Dict[str, Any]]) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+        """Full float32 score matrix (students x jobs) and per-block timings"""
+        matrix = np.zeros((len(students), len(self.job_ids)), dtype=np.float32)
+        timings = []
+        for start, scores, timing in self.blocks(students):
+            matrix[start:start + scores.shape[0]] = scores
+            timings.append(timing)
+        timings.sort(key=lambda timing: timing['block'])
+        logger.info(
+            f"Scored {matrix.shape[0]}x{matrix.shape[1]} match matrix in "
+            f"{len(timings)} blocks on {min(self.workers, max(len(timings), 1))} workers"
+        )
+        return matrix, timings
@@ -0,0 +1,78 @@
+import sys
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import HashingVectorizer
+from typing import Dict, Any, FrozenSet, NamedTuple, Optional
+import logging
+from config.settings import Config
+from models.job_index import education_level, to_float
+from models.skill_vocabulary import SkillSet, canonical_skill, skill_vocabulary
+from utils.cache import LRUCache, stable_hash
+
+logger = logging.getLogger('ai-brain')
+
+# Profile fields the features are derived from
+FEATURE_FIELDS = ('skills', 'experience', 'education', 'resume_text')
+
+class ProfileFeatures(NamedTuple):
+    """What scoring needs from a student profile, derived once"""
+    skills: FrozenSet[str]
+    skill_set: SkillSet
+    experience: float
+    education_level: int
+    # Hashed resume term counts (1 x n_features), None without resume text
+    term_counts: Optional[csr_matrix]
+    nbytes: int
+
+class ProfileFeatureCache:
+    """
+    Bounded LRU cache of featurized student profiles, keyed by a content
+    hash of the profile fields the features depend on. The same student
+    usually hits several matching and career-path endpoints in a row.
+    """
+
+    def __init__(self, max_entries: int = Config.PROFILE_CACHE_SIZE,
+                 max_bytes: int = Config.PROFILE_CACHE_MAX_BYTES,
+                 n_features: int = Config.JOB_INDEX_HASH_FEATURES):
+        self.n_features = n_features
+        # Same featurization as JobIndex, so the counts can be scored directly
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=(1, 2),
+            stop_words='english',
+            alternate_sign=False,
+            norm=None
+        )
+        self._cache = LRUCache(max_entries, max_bytes=max_bytes, sizeof=lambda features: features.nbytes)
+
+    def features(self, profile: Dict[str, Any]) -> ProfileFeatures:
+        key = stable_hash({field: profile.get(field) for field in FEATURE_FIELDS})
+        features = self._cache.get(key)
+        if features is None:
+            features = self._featurize(profile)
+            self._cache.put(key, features)
+        return features
+
+    def _featurize(self, profile: Dict[str, Any]) -> ProfileFeatures:
+        skills = profile.get('skills') or []
+        resume_text = profile.get('resume_text') or ''
+        term_counts = self.vectorizer.transform([resume_text]).tocsr() if resume_text else None
+
+        canonical = frozenset(canonical_skill(skill) for skill in skills)
+        nbytes = 256 + sum(sys.getsizeof(skill) for skill in canonical)
+        if term_counts is not None:
+            nbytes += term_counts.data.nbytes + term_counts.indices.nbytes + term_counts.indptr.nbytes
+
+        return ProfileFeatures(
+            skills=canonical,
+            skill_set=skill_vocabulary.encode(skills),
+            experience=to_float(profile.get('experience', 0), 0.0),
+            education_level=education_level(profile.get('education', '') or ''),
+            term_counts=term_counts,
+            nbytes=nbytes
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+# Shared by the job-matching and career-path blueprints
+profile_features = ProfileFeatureCache()
@@ -0,0 +1,64 @@
+import numpy as np
+from typing import List, Dict, Any, Iterator, Sequence, Optional
+from models.job_registry import JOB_ID_FIELDS
+
+class RankedJobs:
+    """
+    A ranking kept as (rows, scores) over a job sequence. Result dicts are
+    only built while iterating, and only with the requested fields, so a
+    ranking can be streamed or projected without copying every job.
+
+    `jobs` must be a sequence whose rows don't change while the ranking is
+    alive: an inline job list, a read-only snapshot's payloads, or a copy
+    of a mutable JobIndex's list (removal there leaves None in place).
+    Every ranked row is then live, so len() is the number of jobs served.
+    `ids` are the rows' job ids if known.
+    """
+
+    def __init__(self, jobs: Sequence[Optional[Dict[str, Any]]], rows: np.ndarray, scores: np.ndarray,
+                 ids: Optional[Sequence[Optional[str]]] = None):
+        self.jobs = jobs
+        self.rows = np.asarray(rows, dtype=int)
+        self.scores = np.asarray(scores, dtype=float)
+        self.ids = ids
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.project()
+
+    def page(self, offset: int, size: int) -> 'RankedJobs':
+        """The ranking's rows [offset, offset + size)"""
+        window = slice(offset, offset + size)
+        return RankedJobs(self.jobs, self.rows[window], self.scores[window], self.ids)
+
+    def _live(self) -> Iterator[tuple]:
+        for row, score in zip(self.rows, self.scores):
+            job = self.jobs[row]
+            if job is not None:
+                yield row, job, float(score)
+
+    def job_id(self, row: int, job: Dict[str, Any]) -> Optional[str]:
+        if self.ids is not None and self.ids[row] is not None:
+            return self.ids[row]
+        for field in JOB_ID_FIELDS:
+            if job.get(field) is not None:
+                return str(job[field])
+        return None
+
+    def project(self, fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Ranked jobs with their scores; only `fields` of each job if given"""
+        for row, job, score in self._live():
+            if fields is None:
+                result = dict(job)
+            else:
+                result = {field: job[field] for field in fields if field in job}
+            result['match_score'] = score
+            result['match_percentage'] = round(score * 100, 2)
+            yield result
+
+    def pairs(self) -> Iterator[List[Any]]:
+        """Compact form: [job_id, match_score] per ranked job"""
+        for row, job, score in self._live():
+            yield [self.job_id(row, job), score]
@@ -0,0 +1,156 @@
+import threading
+from typing import List, Dict, Iterable, FrozenSet, NamedTuple, Optional
+import logging
+from config.settings import Config
+
+logger = logging.getLogger('ai-brain')
+
+# Alternate spellings mapped to one canonical skill name
+SKILL_ALIASES = {
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'node js': 'node.js',
+    'js': 'javascript',
+    'es6': 'javascript',
+    'ts': 'typescript',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'react js': 'react',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'angularjs': 'angular',
+    'angular.js': 'angular',
+    'nextjs': 'next.js',
+    'expressjs': 'express',
+    'express.js': 'express',
+    'py': 'python',
+    'python3': 'python',
+    'golang': 'go',
+    'c sharp': 'c#',
+    'csharp': 'c#',
+    'cpp': 'c++',
+    'postgres': 'postgresql',
+    'mongo': 'mongodb',
+    'k8s': 'kubernetes',
+    'amazon web services': 'aws',
+    'gcp': 'google cloud',
+    'google cloud platform': 'google cloud',
+    'ml': 'machine learning',
+    'dl': 'deep learning',
+    'ai': 'artificial intelligence',
+    'nlp': 'natural language processing',
+    'sklearn': 'scikit-learn',
+    'scikit learn': 'scikit-learn',
+    'tf': 'tensorflow',
+    'ci/cd': 'ci-cd',
+    'cicd': 'ci-cd',
+    'rest': 'rest api',
+    'restful api': 'rest api',
+    'restful apis': 'rest api',
+    'rest apis': 'rest api',
+}
+
+def canonical_skill(skill: str) -> str:
+    """Lowercase, collapse whitespace and resolve aliases"""
+    key = ' '.join(str(skill).lower().split())
+    return SKILL_ALIASES.get(key, key)
+
+class SkillSet(NamedTuple):
+    """
+    A set of skills as a bitset over vocabulary ids. Skills that arrive after
+    the vocabulary is full are kept by name in `overflow`.
+    """
+    bits: int
+    overflow: FrozenSet[str] = frozenset()
+
+    def __len__(self) -> int:
+        return self.bits.bit_count() + len(self.overflow)
+
+    def __and__(self, other: 'SkillSet') -> 'SkillSet':
+        return SkillSet(self.bits & other.bits, self.overflow & other.overflow)
+
+    def __sub__(self, other: 'SkillSet') -> 'SkillSet':
+        return SkillSet(self.bits & ~other.bits, self.overflow - other.overflow)
+
+class SkillVocabulary:
+    """
+    Process-wide skill vocabulary: canonicalizes aliases and interns each
+    skill to a small integer id, so skill lists become bitsets and overlap,
+    missing-skill and readiness computations are AND/popcount operations.
+    """
+
+    def __init__(self, max_size: int = Config.SKILL_VOCABULARY_MAX_SIZE):
+        self.max_size = max_size
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+        self._full_logged = False
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def intern(self, skill: str) -> Optional[int]:
+        """Id of the canonical skill, assigning one if needed (None once full)"""
+        name = canonical_skill(skill)
+        skill_id = self._ids.get(name)
+        if skill_id is not None:
+            return skill_id
+
+        with self._lock:
+            skill_id = self._ids.get(name)
+            if skill_id is None:
+                if len(self._names) >= self.max_size:
+                    if not self._full_logged:
+                        logger.warning(f"Skill vocabulary is full ({self.max_size} skills)")
+                        self._full_logged = True
+                    return None
+                skill_id = len(self._names)
+                self._names.append(name)
+                self._ids[name] = skill_id
+            return skill_id
+
+    def name(self, skill_id: int) -> str:
+        return self._names[skill_id]
+
+    def encode(self, skills: Iterable[str]) -> SkillSet:
+        """Encode a skill list as a SkillSet"""
+        bits = 0
+        overflow = set()
+        for skill in skills or []:
+            skill_id = self.intern(skill)
+            if skill_id is None:
+                overflow.add(canonical_skill(skill))
+            else:
+                bits |= 1 << skill_id
+        return SkillSet(bits, frozenset(overflow))
+
+    def names(self, skill_set: SkillSet) -> List[str]:
+        """Canonical names of a SkillSet, in id order"""
+        names = []
+        bits = skill_set.bits
+        while bits:
+            lowest = bits & -bits
+            names.append(self._names[lowest.bit_length() - 1])
+            bits ^= lowest
+        return names + sorted(skill_set.overflow)
+
+    def select(self, skills: Iterable[str], skill_set: SkillSet) -> List[str]:
+        """
+        The caller's own spellings of the skills in `skill_set`, first
+        spelling of each canonical skill, in input order
+        """
+        selected = []
+        seen = set()
+        for skill in skills or []:
+            name = canonical_skill(skill)
+            if name in seen:
+                continue
+            skill_id = self._ids.get(name)
+            present = (skill_set.bits >> skill_id) & 1 if skill_id is not None else name in skill_set.overflow
+            if present:
+                selected.append(skill)
+                seen.add(name)
+        return selected
+
+# Shared by job matching, skill-gap analysis and learning paths
+skill_vocabulary = SkillVocabulary()
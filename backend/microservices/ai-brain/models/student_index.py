@@ -0,0 +1,214 @@
+import numpy as np
+import threading
+from sklearn.feature_extraction.text import HashingVectorizer
+from typing import List, Dict, Any, Optional
+import logging
+from config.settings import Config
+from models.job_index import MATCH_WEIGHTS, education_level, top_k_indices, to_float
+from models.skill_vocabulary import canonical_skill
+
+logger = logging.getLogger('ai-brain')
+
+STUDENT_ID_FIELDS = ('id', '_id', 'student_id', 'user_id')
+
+def student_id_of(student: Dict[str, Any]) -> Optional[str]:
+    """Return the student's identifier if the profile carries one"""
+    for field in STUDENT_ID_FIELDS:
+        if student.get(field) is not None:
+            return str(student[field])
+    return None
+
+class StudentIndex:
+    """
+    Columnar index over student profiles for reverse matching. One job is
+    scored against every student in a single vectorized pass, using the
+    same components and weights as JobMatcher.calculate_match_score. Text
+    is hashed as in the JobIndex and weighted with the IDF the caller
+    passes in, the job corpus' (JobIndex.idf), so a pair scores the same
+    in both directions.
+    """
+
+    def __init__(self, students: List[Dict[str, Any]]):
+        self.students = students
+        self.ids = [student_id_of(student) for student in students]
+        self.vectorizer = HashingVectorizer(
+            n_features=Config.JOB_INDEX_HASH_FEATURES,
+            ngram_range=(1, 2),
+            stop_words='english',
+            alternate_sign=False,
+            norm=None
+        )
+
+        # Skill postings: canonical skill -> rows of students that have it
+        postings: Dict[str, List[int]] = {}
+        for row, student in enumerate(students):
+            for skill in {canonical_skill(s) for s in student.get('skills') or []}:
+                postings.setdefault(skill, []).append(row)
+        self._skill_postings = {skill: np.array(rows, dtype=int) for skill, rows in postings.items()}
+
+        self.experience = np.array([to_float(s.get('experience', 0), 0.0) for s in students])
+        self.education_levels = np.array(
+            [education_level(s.get('education', '') or '') for s in students],
+            dtype=float
+        )
+
+        # Hashed resume term counts; IDF weights are applied per job
+        self._term_counts = self.vectorizer.transform([s.get('resume_text', '') or '' for s in students]).tocsr()
+        self._squared_counts = self._term_counts.power(2)
+
+    def __len__(self) -> int:
+        return len(self.students)
+
+    def skills_match(self, required_skills: List[str]) -> np.ndarray:
+        """Fraction of the job's required skills each student covers"""
+        matched = np.zeros(len(self.students))
+        if not required_skills:
+            return matched
+        for skill in {canonical_skill(s) for s in required_skills}:
+            rows = self._skill_postings.get(skill)
+            if rows is not None:
+                matched[rows] += 1
+        # The score divides by the raw list length, duplicates included
+        return matched / len(required_skills)
+
+    def experience_match(self, min_exp: float, max_exp: float) -> np.ndarray:
+        """Vectorized form of JobMatcher._calculate_experience_match"""
+        below = np.maximum(0.0, 1.0 - (min_exp - self.experience) * 0.2)
+        above = np.maximum(0.7, 1.0 - (self.experience - max_exp) * 0.1)
+        return np.where(
+            self.experience < min_exp,
+            below,
+            np.where(self.experience > max_exp, above, 1.0)
+        )
+
+    def education_match(self, required_edu: str) -> np.ndarray:
+        """Vectorized form of JobMatcher._calculate_education_match"""
+        required_level = education_level(required_edu)
+        if required_level == 0:
+            return np.ones(len(self.students))
+        return np.where(self.education_levels >= required_level, 1.0, self.education_levels / required_level)
+
+    def text_similarity(self, job_text: str, idf: np.ndarray) -> np.ndarray:
+        """TF-IDF cosine similarity of the job description against every resume, weighted by `idf`"""
+        scores = np.zeros(len(self.students))
+        if not job_text or not len(self.students):
+            return scores
+        query = self.vectorizer.transform([job_text])
+        if not query.nnz:
+            return scores
+
+        query_weights = query.data * idf[query.indices]
+        weights = np.zeros(len(idf))
+        weights[query.indices] = query_weights * idf[query.indices]
+        dots = self._term_counts @ weights
+        norms = np.sqrt(self._squared_counts @ idf ** 2)
+        np.divide(dots, norms * np.linalg.norm(query_weights), out=scores, where=norms > 0)
+        return scores
+
+    def score(self, job: Dict[str, Any], idf: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Score a job against every student, weighting text by the job corpus `idf`.
+        Returns each component and the weighted total as arrays.
+        """
+        components = {
+            'skills': self.skills_match(job.get('required_skills') or []),
+            'experience': self.experience_match(
+                to_float(job.get('min_experience', 0), 0.0),
+                to_float(job.get('max_experience', 10), 10.0)
+            ),
+            'education': self.education_match(job.get('required_education', '') or ''),
+            'text': self.text_similarity(job.get('description', '') or '', idf)
+        }
+
+        total = np.zeros(len(self.students))
+        for component, weight in MATCH_WEIGHTS.items():
+            total += components[component] * weight
+
+        components['total'] = np.minimum(total, 1.0)
+        return components
+
+    def rank(self, job: Dict[str, Any], idf: np.ndarray, limit: Optional[int] = None,
+             min_score: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Top students for a job with their score breakdowns, best first"""
+        components = self.score(job, idf)
+        rows = top_k_indices(components['total'], limit, min_score)
+
+        ranked = []
+        for row in rows:
+            score = float(components['total'][row])
+            ranked.append({
+                'student_id': self.ids[row],
+                'student_index': int(row),
+                'name': self.students[row].get('name'),
+                'match_score': score,
+                'match_percentage': round(score * 100, 2),
+                'score_breakdown': {
+                    component: round(float(components[component][row]), 4)
+                    for component in MATCH_WEIGHTS
+                }
+            })
+        return ranked
+
+class StudentRegistry:
+    """
+    In-memory registry of student profiles by ID for repeated reverse
+    matching. The StudentIndex is rebuilt lazily after changes.
+    """
+
+    def __init__(self):
+        self._students: Dict[str, Dict[str, Any]] = {}
+        self._version = 0
+        self._index: Optional[StudentIndex] = None
+        self._index_version = -1
+        self._lock = threading.RLock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._students)
+
+    def upsert(self, students: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Insert or replace student profiles by ID"""
+        keyed_students = []
+        for student in students:
+            student_id = student_id_of(student)
+            if student_id is None:
+                raise ValueError(f"Student profile is missing an id (one of {', '.join(STUDENT_ID_FIELDS)})")
+            keyed_students.append((student_id, student))
+
+        with self._lock:
+            for student_id, student in keyed_students:
+                self._students[student_id] = student
+            if keyed_students:
+                self._version += 1
+            return {'upserted': len(keyed_students), 'version': self._version}
+
+    def delete(self, student_ids: List[str]) -> Dict[str, Any]:
+        """Remove student profiles by ID; unknown IDs are ignored"""
+        with self._lock:
+            deleted = sum(1 for student_id in student_ids if self._students.pop(str(student_id), None) is not None)
+            if deleted:
+                self._version += 1
+            return {'deleted': deleted, 'version': self._version}
+
+    def profiles(self, student_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """All registered profiles, or a subset by ID (unknown IDs are skipped)"""
+        with self._lock:
+            if student_ids is None:
+                return list(self._students.values())
+            wanted = [str(student_id) for student_id in student_ids]
+            return [self._students[i] for i in wanted if i in self._students]
+
+    def index(self, student_ids: Optional[List[str]] = None) -> StudentIndex:
+        """Index over all registered students, or a subset by ID"""
+        with self._lock:
+            if student_ids is not None:
+                return StudentIndex(self.profiles(student_ids))
+
+            if self._index_version != self._version:
+                self._index = StudentIndex(self.profiles())
+                self._index_version = self._version
+                logger.info(f"Rebuilt student index: {len(self._index)} students, version {self._version}")
+            return self._index
@@ -0,0 +1,127 @@
+import numpy as np
+from typing import List, Optional, Sequence, Tuple
+import logging
+from config.settings import Config
+from models.job_index import top_k_indices
+
+logger = logging.getLogger('ai-brain')
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows; all-zero rows stay zero"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+class _IndexState:
+    """One immutable generation of the index, swapped in whole"""
+
+    def __init__(self, ids: List[str], vectors: np.ndarray,
+                 centroids: Optional[np.ndarray] = None, order: Optional[np.ndarray] = None,
+                 bounds: Optional[np.ndarray] = None, trained_rows: int = 0):
+        self.ids = ids
+        self.vectors = vectors
+        # IVF: rows grouped by nearest centroid, list c is order[bounds[c]:bounds[c + 1]]
+        self.centroids = centroids
+        self.order = order
+        self.bounds = bounds
+        self.trained_rows = trained_rows
+
+class VectorIndex:
+    """
+    Cosine top-K search over embeddings. Small corpora are searched exactly
+    with one matrix-vector product; from VECTOR_INDEX_IVF_MIN_ROWS rows on,
+    an inverted-file index (spherical k-means over ~sqrt(n) lists) is built
+    in-process and only the VECTOR_INDEX_NPROBE closest lists are scanned.
+    """
+
+    def __init__(self, ivf_min_rows: int = Config.VECTOR_INDEX_IVF_MIN_ROWS,
+                 n_probe: int = Config.VECTOR_INDEX_NPROBE):
+        self.ivf_min_rows = ivf_min_rows
+        self.n_probe = n_probe
+        self._state = _IndexState([], np.zeros((0, 0), dtype=np.float32))
+
+    def __len__(self) -> int:
+        return len(self._state.ids)
+
+    @property
+    def dim(self) -> int:
+        return self._state.vectors.shape[1]
+
+    @property
+    def approximate(self) -> bool:
+        return self._state.centroids is not None
+
+    def reset(self, ids: Sequence[str], vectors: Sequence[Sequence[float]]):
+        """
+        Replace the indexed embeddings. Existing IVF centroids are reused
+        (rows are only reassigned) until the corpus doubles since training.
+        """
+        if not len(ids):
+            # Nothing to reshape: no registered job has an embedding
+            self._state = _IndexState([], np.zeros((0, 0), dtype=np.float32))
+            return
+        vectors = normalize_rows(np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1))
+        previous = self._state
+        state = _IndexState(list(ids), vectors)
+
+        if len(ids) >= self.ivf_min_rows:
+            centroids, trained_rows = previous.centroids, previous.trained_rows
+            if centroids is None or centroids.shape[1] != vectors.shape[1] or len(ids) > 2 * trained_rows:
+                centroids, trained_rows = self._train(vectors), len(ids)
+            state.centroids, state.trained_rows = centroids, trained_rows
+            state.order, state.bounds = self._assign(vectors, centroids)
+
+        self._state = state
+
+    def _train(self, vectors: np.ndarray) -> np.ndarray:
+        """Spherical k-means on a sample of the rows"""
+        n_lists = max(1, int(np.sqrt(len(vectors))))
+        rng = np.random.default_rng(0)
+        sample_size = min(len(vectors), n_lists * Config.VECTOR_INDEX_TRAIN_SAMPLE_PER_LIST)
+        sample = vectors[rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+        for _ in range(Config.VECTOR_INDEX_TRAIN_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            empty = np.flatnonzero(~sums.any(axis=1))
+            # Reseed empty lists from random sample rows
+            sums[empty] = sample[rng.choice(sample_size, len(empty), replace=False)]
+            centroids = normalize_rows(sums)
+
+        logger.info(f"Trained IVF vector index: {n_lists} lists over {len(vectors)} vectors")
+        return centroids
+
+    def _assign(self, vectors: np.ndarray, centroids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        labels = np.empty(len(vectors), dtype=int)
+        chunk = Config.VECTOR_INDEX_ASSIGN_CHUNK
+        for start in range(0, len(vectors), chunk):
+            labels[start:start + chunk] = np.argmax(vectors[start:start + chunk] @ centroids.T, axis=1)
+        order = np.argsort(labels, kind='stable')
+        bounds = np.searchsorted(labels[order], np.arange(len(centroids) + 1))
+        return order, bounds
+
+    def search(self, query: Sequence[float], k: int) -> Tuple[List[str], np.ndarray]:
+        """Ids and cosine similarities of the (approximately) k nearest embeddings, best first"""
+        state = self._state
+        if not state.ids:
+            return [], np.zeros(0)
+
+        query = np.asarray(query, dtype=np.float32).ravel()
+        if query.shape[0] != state.vectors.shape[1]:
+            raise ValueError(f"Embedding has {query.shape[0]} dimensions, the job index has {state.vectors.shape[1]}")
+        norm = np.linalg.norm(query)
+        if norm == 0:
+            return [], np.zeros(0)
+        query = query / norm
+
+        if state.centroids is None:
+            rows = np.arange(len(state.ids))
+            similarities = state.vectors @ query
+        else:
+            probes = top_k_indices(state.centroids @ query, self.n_probe)
+            rows = np.concatenate([state.order[state.bounds[c]:state.bounds[c + 1]] for c in probes])
+            similarities = state.vectors[rows] @ query
+
+        top = top_k_indices(similarities, k)
+        return [state.ids[row] for row in rows[top]], similarities[top].astype(float)
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 import logging
 from models.career_advisor import CareerAdvisor
+from models.profile_features import profile_features
+from models.skill_vocabulary import skill_vocabulary
+from utils.sse import llm_event_stream
 
 logger = logging.getLogger('ai-brain')
 career_path_bp = Blueprint('career_path', __name__)
@@ -39,6 +42,36 @@ def generate_career_path():
             'error': str(e)
         }), 500
 
+@career_path_bp.route('/generate/stream', methods=['POST'])
+def stream_career_path():
+    """
+    Generate a career path as Server-Sent Events: `token` events while the
+    model writes, then a `result` event with the /generate response body
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        student_profile = data.get('student_profile')
+        
+        if not student_profile:
+            return jsonify({'error': 'Student profile is required'}), 400
+        
+        return llm_event_stream(
+            'career_path',
+            advisor.career_path_request(student_profile),
+            advisor.parse_career_path
+        )
+        
+    except Exception as e:
+        logger.error(f"Error streaming career path: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @career_path_bp.route('/skill-gap', methods=['POST'])
 def analyze_skill_gap():
     """
@@ -82,8 +115,10 @@ def get_learning_path():
         if not target_skills:
             return jsonify({'error': 'Target skills are required'}), 400
         
-        # Calculate missing skills
-        missing_skills = list(set(target_skills) - set(current_skills))
+        # Calculate missing skills, keeping the caller's spelling
+        current_set = profile_features.features({'skills': current_skills}).skill_set
+        missing_set = skill_vocabulary.encode(target_skills) - current_set
+        missing_skills = skill_vocabulary.select(target_skills, missing_set)
         
         # Generate learning path
         learning_path = advisor._generate_learning_path(missing_skills)
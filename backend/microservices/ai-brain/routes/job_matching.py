@@ -1,12 +1,95 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
+import base64
+import binascii
+import io
+import json
 import logging
+import numpy as np
+from config.settings import Config
+from models.job_index import top_k_indices
 from models.job_matcher import JobMatcher
+from models.profile_features import profile_features
+from models.student_index import student_id_of
+from utils.sse import llm_event_stream
 
 logger = logging.getLogger('ai-brain')
 job_matching_bp = Blueprint('job_matching', __name__)
 
 matcher = JobMatcher()
 
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def wants_stream() -> bool:
+    """True for ?stream=1 or when NDJSON is preferred over JSON in Accept"""
+    if request.args.get('stream', '').lower() in ('1', 'true'):
+        return True
+    accept = request.accept_mimetypes
+    return accept[NDJSON_MIMETYPE] > accept['application/json']
+
+def result_options(data) -> tuple:
+    """
+    (fields, compact) from the body or query string: `fields` projects each
+    job onto the listed fields, `compact` returns [job_id, score] pairs
+    """
+    fields = data.get('fields', request.args.get('fields'))
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+    compact = data.get('compact', request.args.get('compact', '')) in (True, '1', 'true')
+    return fields or None, compact
+
+def ranked_results(ranking, fields=None, compact: bool = False):
+    """Materialize a lazy ranking in the requested shape"""
+    return ranking.pairs() if compact else ranking.project(fields)
+
+def encode_cursor(key: str, offset: int, page_size: int) -> str:
+    payload = json.dumps({'key': key, 'offset': offset, 'page_size': page_size})
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+def checked_page_size(page_size) -> int:
+    """`page_size` as an int clamped to RANKING_MAX_PAGE_SIZE; ValueError below 1"""
+    try:
+        page_size = int(page_size)
+    except (TypeError, ValueError):
+        raise ValueError('page_size must be an integer')
+    if page_size < 1:
+        raise ValueError('page_size must be at least 1')
+    return min(page_size, Config.RANKING_MAX_PAGE_SIZE)
+
+def decode_cursor(cursor: str) -> tuple:
+    """(ranking cache key, offset, page size); ValueError if malformed or out of range"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        key, offset, page_size = str(payload['key']), int(payload['offset']), int(payload['page_size'])
+    except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError):
+        raise ValueError('Invalid cursor')
+    if offset < 0 or page_size < 1:
+        raise ValueError('Invalid cursor')
+    return key, offset, checked_page_size(page_size)
+
+def ranking_page(ranking, key: str, offset: int, page_size: int, fields, compact: bool):
+    """One page of a cached ranking with the cursor for the next page"""
+    page = ranking.page(offset, page_size)
+    if wants_stream():
+        return ndjson_response(ranked_results(page, fields, compact))
+    
+    next_offset = offset + page_size
+    top = list(ranked_results(ranking.page(0, 1), fields, compact))
+    return jsonify({
+        'success': True,
+        'matched_jobs': list(ranked_results(page, fields, compact)),
+        'total_jobs': len(ranking),
+        'top_match': top[0] if top else None,
+        'offset': offset,
+        'next_cursor': encode_cursor(key, next_offset, page_size) if next_offset < len(ranking) else None
+    }), 200
+
+def ndjson_response(results) -> Response:
+    """Stream ranked jobs one JSON object per line, best match first"""
+    def generate():
+        for result in results:
+            yield json.dumps(result) + '\n'
+    return Response(generate(), mimetype=NDJSON_MIMETYPE)
+
 @job_matching_bp.route('/match', methods=['POST'])
 def match_jobs():
     """
@@ -20,15 +103,48 @@ def match_jobs():
         
         student_profile = data.get('student_profile')
         jobs = data.get('jobs', [])
+        fields, compact = result_options(data)
+        
+        # Later pages are sliced from the cached ranking without re-scoring
+        if data.get('cursor'):
+            key, offset, page_size = decode_cursor(data['cursor'])
+            ranking = matcher.ranking_cache.get(key)
+            if ranking is None:
+                return jsonify({'error': 'Ranking cursor expired; request the first page again'}), 410
+            return ranking_page(ranking, key, offset, page_size, fields, compact)
         
         if not student_profile:
             return jsonify({'error': 'Student profile is required'}), 400
         
-        if not jobs:
+        if not jobs and not len(matcher.job_registry):
             return jsonify({'error': 'Jobs list is required'}), 400
         
-        # Rank jobs
-        ranked_jobs = matcher.rank_jobs(student_profile, jobs)
+        if data.get('page_size') is not None:
+            page_size = checked_page_size(data['page_size'])
+            key, ranking = matcher.cached_ranking(
+                student_profile,
+                jobs=jobs,
+                job_ids=data.get('job_ids'),
+                filters=data.get('filter'),
+                dedup=data.get('dedup')
+            )
+            return ranking_page(ranking, key, 0, page_size, fields, compact)
+        
+        # Rank the jobs sent inline, otherwise the registered jobs
+        if jobs:
+            ranking = matcher.rank_jobs(student_profile, jobs, lazy=True, dedup=data.get('dedup'))
+        else:
+            ranking = matcher.rank_registered_jobs(
+                student_profile,
+                job_ids=data.get('job_ids'),
+                filters=data.get('filter'),
+                lazy=True
+            )
+        
+        if wants_stream():
+            return ndjson_response(ranked_results(ranking, fields, compact))
+        
+        ranked_jobs = list(ranked_results(ranking, fields, compact))
         
         return jsonify({
             'success': True,
@@ -37,6 +153,8 @@ def match_jobs():
             'top_match': ranked_jobs[0] if ranked_jobs else None
         }), 200
         
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         logger.error(f"Error in job matching: {str(e)}")
         return jsonify({
@@ -90,20 +208,37 @@ def get_recommendations():
         if not student_profile:
             return jsonify({'error': 'Student profile is required'}), 400
         
-        # Rank all jobs
-        ranked_jobs = matcher.rank_jobs(student_profile, jobs)
+        fields, compact = result_options(data)
+        
+        # Rank jobs, keeping only the top `limit` above the minimum score
+        if jobs:
+            ranking = matcher.rank_jobs(
+                student_profile, jobs,
+                limit=int(limit),
+                min_score=float(min_score),
+                lazy=True,
+                dedup=data.get('dedup')
+            )
+        else:
+            ranking = matcher.rank_registered_jobs(
+                student_profile,
+                job_ids=data.get('job_ids'),
+                filters=data.get('filter'),
+                limit=int(limit),
+                min_score=float(min_score),
+                lazy=True
+            )
         
-        # Filter by minimum score and limit
-        recommendations = [
-            job for job in ranked_jobs 
-            if job['match_score'] >= min_score
-        ][:limit]
+        if wants_stream():
+            return ndjson_response(ranked_results(ranking, fields, compact))
+        
+        recommendations = list(ranked_results(ranking, fields, compact))
         
         return jsonify({
             'success': True,
             'recommendations': recommendations,
             'count': len(recommendations),
-            'average_match': round(sum(j['match_score'] for j in recommendations) / len(recommendations) * 100, 2) if recommendations else 0
+            'average_match': round(float(ranking.scores.mean()) * 100, 2) if len(ranking) else 0
         }), 200
         
     except Exception as e:
@@ -114,6 +249,447 @@ def get_recommendations():
         }), 500
 
 
+@job_matching_bp.route('/rank-students', methods=['POST'])
+def rank_students():
+    """
+    Rank students for a job (reverse matching) with score breakdowns
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        job = data.get('job')
+        students = data.get('students', [])
+        limit = data.get('limit', 10)
+        min_score = data.get('min_score')
+        
+        if not job:
+            return jsonify({'error': 'Job is required'}), 400
+        
+        if not students and not len(matcher.student_registry):
+            return jsonify({'error': 'Students list is required'}), 400
+        
+        ranked_students = matcher.rank_students(
+            job,
+            students=students,
+            student_ids=data.get('student_ids'),
+            limit=None if limit is None else int(limit),
+            min_score=None if min_score is None else float(min_score)
+        )
+        
+        return jsonify({
+            'success': True,
+            'job_title': job.get('title', 'Unknown'),
+            'ranked_students': ranked_students,
+            'count': len(ranked_students)
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error ranking students: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@job_matching_bp.route('/match-embedding', methods=['POST'])
+def match_embedding():
+    """
+    Match a resume embedding against registered job embeddings, blended
+    with skill overlap (also served at /api/v1/match-jobs for the gateway)
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        embedding = data.get('resumeEmbedding')
+        skills = data.get('skills') or []
+        limit = data.get('limit', 10)
+        
+        # Resume skills arrive from the gateway as {technical: [...], soft: [...]}
+        if isinstance(skills, dict):
+            skills = [*(skills.get('technical') or []), *(skills.get('soft') or [])]
+        
+        if not embedding and not skills:
+            return jsonify({'error': 'resumeEmbedding or skills is required'}), 400
+        
+        matches = matcher.match_embedding(embedding, skills, limit=int(limit))
+        
+        return jsonify({
+            'success': True,
+            'data': {'matches': matches}
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error matching resume embedding: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@job_matching_bp.route('/match-matrix', methods=['POST'])
+def match_matrix():
+    """
+    Bulk score every student against every job.
+    format=binary (default) returns an .npz archive with the float32
+    `scores` matrix (students x jobs), `student_ids`, `job_ids` and
+    `block_timings`; format=topk streams the top_k jobs per student as
+    NDJSON, with a timing line after each block.
+    """
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+        
+        students = data.get('students') or matcher.student_registry.profiles(data.get('student_ids'))
+        output_format = data.get('format', 'binary')
+        
+        if not students:
+            return jsonify({'error': 'Students list is required'}), 400
+        
+        if output_format not in ('binary', 'topk'):
+            return jsonify({'error': 'format must be binary or topk'}), 400
+        
+        if not data.get('jobs') and not len(matcher.job_registry):
+            return jsonify({'error': 'Jobs list is required'}), 400
+        
+        block_size = data.get('block_size')
+        scorer = matcher.match_matrix(
+            jobs=data.get('jobs'),
+            job_ids=data.get('job_ids'),
+            filters=data.get('filter'),
+            block_size=None if block_size is None else int(block_size)
+        )
+        student_ids = [student_id_of(student) for student in students]
+        
+        if output_format == 'topk':
+            top_k = int(data.get('top_k', 10))
+            min_score = data.get('min_score')
+            min_score = None if min_score is None else float(min_score)
+            
+            def generate():
+                for start, scores, timing in scorer.blocks(students):
+                    for offset, row_scores in enumerate(scores):
+                        columns = top_k_indices(row_scores, top_k, min_score)
+                        yield json.dumps({
+                            'student_id': student_ids[start + offset],
+                            'student_index': start + offset,
+                            'matches': [
+                                {
+                                    'job_id': scorer.job_ids[column],
+                                    'job_index': int(column),
+                                    'match_score': float(row_scores[column])
+                                }
+                                for column in columns
+                            ]
+                        }) + '\n'
+                    yield json.dumps({'block_timing': timing}) + '\n'
+            
+            return Response(generate(), mimetype=NDJSON_MIMETYPE)
+        
+        cells = len(students) * len(scorer.job_ids)
+        if cells > Config.MATCH_MATRIX_MAX_CELLS:
+            return jsonify({
+                'error': f'Matrix of {cells} cells exceeds the limit of {Config.MATCH_MATRIX_MAX_CELLS}; use format=topk'
+            }), 400
+        
+        scores, timings = scorer.dense(students)
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            scores=scores,
+            student_ids=np.array([student_id or '' for student_id in student_ids]),
+            job_ids=np.array([job_id or '' for job_id in scorer.job_ids]),
+            # One row per block: first student row, end row, seconds
+            block_timings=np.array([[*t['rows'], t['seconds']] for t in timings], dtype=float).reshape(-1, 3)
+        )
+        
+        return Response(buffer.getvalue(), mimetype='application/octet-stream', headers={
+            'Content-Disposition': 'attachment; filename=match-matrix.npz',
+            'X-Matrix-Shape': f'{scores.shape[0]},{scores.shape[1]}',
+            'X-Block-Count': str(len(timings)),
+            'X-Block-Seconds-Max': str(max((t['seconds'] for t in timings), default=0.0))
+        })
+        
+    except Exception as e:
+        logger.error(f"Error computing match matrix: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@job_matching_bp.route('/students', methods=['POST'])
+def upsert_students():
+    """
+    Bulk insert or replace student profiles used for reverse matching
+    """
+    try:
+        data = request.get_json()
+        
+        students = data.get('students', []) if data else []
+        
+        if not students:
+            return jsonify({'error': 'Students list is required'}), 400
+        
+        result = matcher.student_registry.upsert(students)
+        
+        return jsonify({
+            'success': True,
+            **result
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error upserting students: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@job_matching_bp.route('/students', methods=['DELETE'])
+def delete_students():
+    """
+    Bulk remove registered student profiles
+    """
+    try:
+        data = request.get_json()
+        
+        student_ids = data.get('student_ids', []) if data else []
+        
+        if not student_ids:
+            return jsonify({'error': 'student_ids list is required'}), 400
+        
+        result = matcher.student_registry.delete(student_ids)
+        
+        return jsonify({
+            'success': True,
+            **result
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error deleting students: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@job_matching_bp.route('/jobs', methods=['POST'])
+def upsert_jobs():
+    """
+    Bulk insert or replace jobs in the server-side job registry
+    """
+    try:
+        data = request.get_json()
+        
+        jobs = data.get('jobs', []) if data else []
+        
+        if not jobs:
+            return jsonify({'error': 'Jobs list is required'}), 400
+        
+        result = matcher.job_registry.upsert(jobs)
+        
+        return jsonify({
+            'success': True,
+            **result
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error upserting jobs: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@job_matching_bp.route('/jobs', methods=['DELETE'])
+def delete_jobs():
+    """
+    Bulk remove jobs from the server-side job registry
+    """
+    try:
+        data = request.get_json()
+        
+        job_ids = data.get('job_ids', []) if data else []
+        
+        if not job_ids:
+            return jsonify({'error': 'job_ids list is required'}), 400
+        
+        result = matcher.job_registry.delete(job_ids)
+        
+        return jsonify({
+            'success': True,
+            **result
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error deleting jobs: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@job_matching_bp.route('/jobs/<job_id>', methods=['PUT'])
+def update_job(job_id):
+    """
+    Add or replace a single registered job (e.g. a recruiter edit)
+    """
+    try:
+        job = request.get_json()
+        
+        if not job:
+            return jsonify({'error': 'Job is required'}), 400
+        
+        result = matcher.update_job(job_id, job)
+        
+        return jsonify({
+            'success': True,
+            **result
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error updating job {job_id}: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@job_matching_bp.route('/jobs/<job_id>', methods=['DELETE'])
+def remove_job(job_id):
+    """
+    Remove a single registered job (e.g. when it is closed)
+    """
+    try:
+        result = matcher.remove_job(job_id)
+        
+        if not result['deleted']:
+            return jsonify({'error': f'Job {job_id} not found'}), 404
+        
+        return jsonify({
+            'success': True,
+            **result
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error removing job {job_id}: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@job_matching_bp.route('/jobs/compact', methods=['POST'])
+def compact_jobs():
+    """
+    Merge pending job index changes immediately
+    """
+    try:
+        return jsonify({
+            'success': True,
+            **matcher.job_registry.compact()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error compacting job index: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@job_matching_bp.route('/jobs/version', methods=['GET'])
+def get_jobs_version():
+    """
+    Current version and size of the server-side job registry
+    """
+    try:
+        return jsonify({
+            'success': True,
+            **matcher.job_registry.stats()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting job registry version: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@job_matching_bp.route('/ranking-cache/stats', methods=['GET'])
+def get_ranking_cache_stats():
+    """
+    Hit/miss counters of the cached rankings behind /match cursors
+    """
+    try:
+        return jsonify({
+            'success': True,
+            **matcher.ranking_cache.stats()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting ranking cache stats: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@job_matching_bp.route('/profile-cache/stats', methods=['GET'])
+def get_profile_cache_stats():
+    """
+    Size, memory and eviction counters of the featurized profile cache
+    """
+    try:
+        return jsonify({
+            'success': True,
+            **profile_features.stats()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting profile cache stats: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@job_matching_bp.route('/dedup/stats', methods=['GET'])
+def get_dedup_stats():
+    """
+    Near-duplicate job grouping statistics for inline job lists
+    """
+    try:
+        return jsonify({
+            'success': True,
+            # Default for requests that don't pass `dedup`
+            'enabled': Config.JOB_DEDUP_ENABLED,
+            **matcher.job_deduplicator.stats()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting dedup stats: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @job_matching_bp.route('/ai-analyze', methods=['POST'])
 def ai_analyze_job():
     """
@@ -160,11 +736,7 @@ def ai_recommend_jobs():
         
         result = matcher.ai_recommend_jobs(student_profile, limit)
         
-        return jsonify({
-            'success': result.get('success', False),
-            'recommendations': result.get('recommendations', []),
-            'count': len(result.get('recommendations', []))
-        }), 200
+        return jsonify(ai_recommend_body(result)), 200
         
     except Exception as e:
         logger.error(f"Error in AI job recommendations: {str(e)}")
@@ -173,3 +745,38 @@ def ai_recommend_jobs():
             'error': str(e)
         }), 500
 
+@job_matching_bp.route('/ai-recommend/stream', methods=['POST'])
+def stream_ai_recommendations():
+    """
+    AI job recommendations as Server-Sent Events: `token` events while the
+    model writes, then a `result` event with the /ai-recommend response body
+    """
+    try:
+        data = request.get_json()
+        
+        student_profile = data.get('student_profile')
+        limit = data.get('limit', 5)
+        
+        if not student_profile:
+            return jsonify({'error': 'Student profile is required'}), 400
+        
+        return llm_event_stream(
+            'job_recommendations',
+            matcher.ai_recommend_request(student_profile, limit),
+            lambda text: ai_recommend_body(matcher.parse_ai_recommendations(text))
+        )
+        
+    except Exception as e:
+        logger.error(f"Error streaming AI job recommendations: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def ai_recommend_body(result):
+    return {
+        'success': result.get('success', False),
+        'recommendations': result.get('recommendations', []),
+        'count': len(result.get('recommendations', []))
+    }
+
@@ -1,15 +1,15 @@
 from flask import Blueprint, request, jsonify
 import logging
 from typing import List, Dict
-from groq import Groq
 from config.settings import Config
+from utils.llm_cache import llm_cache, json_content
+from utils.sse import llm_event_stream
 import json
 
 logger = logging.getLogger('ai-brain')
 skill_analysis_bp = Blueprint('skill_analysis', __name__)
 
-# Initialize Groq AI
-client = Groq(api_key=Config.GROQ_API_KEY)
+# Groq AI is reached through the shared LLM gateway
 model = Config.GROQ_MODEL
 
 @skill_analysis_bp.route('/trending', methods=['GET'])
@@ -191,21 +191,16 @@ Provide a detailed analysis in JSON format:
 }}
 """
         
-        response = client.chat.completions.create(
+        response_text = llm_cache.complete(
+            'skill_analysis',
+            validate=json_content,
             model=model,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.7,
             max_tokens=4096
         )
-        response_text = response.choices[0].message.content.strip()
         
-        # Clean up response
-        if response_text.startswith('```'):
-            import re
-            response_text = re.sub(r'^```json?\s*', '', response_text)
-            response_text = re.sub(r'\s*```$', '', response_text)
-        
-        analysis = json.loads(response_text)
+        analysis = json_content(response_text)
         
         return jsonify({
             'success': True,
@@ -233,9 +228,52 @@ def ai_generate_roadmap():
         target_role = data.get('target_role', 'Software Developer')
         timeframe = data.get('timeframe_months', 6)
         
-        skills_str = ', '.join(current_skills) if current_skills else 'None specified'
+        result = lambda text: roadmap_result(text, target_role, timeframe)
+        response_text = llm_cache.complete('skill_roadmap', validate=result,
+                                           **roadmap_request(current_skills, target_role, timeframe))
         
-        prompt = f"""
+        return jsonify(result(response_text)), 200
+        
+    except Exception as e:
+        logger.error(f"Error generating AI roadmap: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@skill_analysis_bp.route('/ai-roadmap/stream', methods=['POST'])
+def stream_ai_roadmap():
+    """
+    Generate a learning roadmap as Server-Sent Events: `token` events while
+    the model writes, then a `result` event with the /ai-roadmap response body
+    """
+    try:
+        data = request.get_json()
+        
+        current_skills = data.get('current_skills', [])
+        target_role = data.get('target_role', 'Software Developer')
+        timeframe = data.get('timeframe_months', 6)
+        
+        return llm_event_stream(
+            'skill_roadmap',
+            roadmap_request(current_skills, target_role, timeframe),
+            lambda text: roadmap_result(text, target_role, timeframe)
+        )
+        
+    except Exception as e:
+        logger.error(f"Error streaming AI roadmap: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def roadmap_request(current_skills: List[str], target_role: str, timeframe) -> Dict:
+    """Chat completion request for a learning roadmap"""
+    skills_str = ', '.join(current_skills) if current_skills else 'None specified'
+    
+    prompt = f"""
 Create a personalized {timeframe}-month learning roadmap:
 
 Current Skills: {skills_str}
@@ -265,43 +303,40 @@ Return ONLY valid JSON in this exact format (no markdown, no explanation):
     "success_metrics": ["how to measure success"]
 }}
 """
-        
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": "You are a career learning advisor. Always respond with valid JSON only, no markdown, no explanation."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=4096
-        )
-        response_text = response.choices[0].message.content.strip()
-        
-        # Clean up markdown code blocks if present
-        if response_text.startswith('```'):
-            import re
-            response_text = re.sub(r'^```json?\s*', '', response_text)
-            response_text = re.sub(r'\s*```$', '', response_text)
-        
-        # Try to extract JSON if there's surrounding text
-        if not response_text.startswith('{'):
-            start = response_text.find('{')
-            end = response_text.rfind('}')
-            if start != -1 and end != -1:
-                response_text = response_text[start:end+1]
-        
-        roadmap = json.loads(response_text)
-        
-        return jsonify({
-            'success': True,
-            'roadmap': roadmap,
-            'target_role': target_role,
-            'timeframe_months': timeframe
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error generating AI roadmap: {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+    
+    return {
+        'model': model,
+        'messages': [
+            {"role": "system", "content": "You are a career learning advisor. Always respond with valid JSON only, no markdown, no explanation."},
+            {"role": "user", "content": prompt}
+        ],
+        'temperature': 0.7,
+        'max_tokens': 4096
+    }
+
+
+def roadmap_result(response_text: str, target_role: str, timeframe) -> Dict:
+    """/ai-roadmap response body from the model's response text"""
+    response_text = response_text.strip()
+    
+    # Clean up markdown code blocks if present
+    if response_text.startswith('```'):
+        import re
+        response_text = re.sub(r'^```json?\s*', '', response_text)
+        response_text = re.sub(r'\s*```$', '', response_text)
+    
+    # Try to extract JSON if there's surrounding text
+    if not response_text.startswith('{'):
+        start = response_text.find('{')
+        end = response_text.rfind('}')
+        if start != -1 and end != -1:
+            response_text = response_text[start:end+1]
+    
+    roadmap = json.loads(response_text)
+    
+    return {
+        'success': True,
+        'roadmap': roadmap,
+        'target_role': target_role,
+        'timeframe_months': timeframe
+    }
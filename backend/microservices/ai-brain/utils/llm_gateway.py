@@ -0,0 +1,248 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import httpx
+import logging
+from groq import Groq, APIConnectionError, APIStatusError, APITimeoutError
+from config.settings import Config
+
+logger = logging.getLogger(Config.SERVICE_NAME)
+
+# Recent latencies kept per call site for percentiles
+LATENCY_WINDOW = 512
+
+def retryable(error: Exception) -> bool:
+    """Rate limits, server errors and connection failures are worth retrying"""
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, APIConnectionError)
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds the server asked us to wait, from a Retry-After header"""
+    response = getattr(error, 'response', None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return round(sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)], 4)
+
+class LLMGateway:
+    """
+    The service's single way to reach Groq. One client over a pooled
+    keep-alive HTTP connection pool; every call gets a deadline (per call
+    site in LLM_DEADLINES, else LLM_DEADLINE_SECONDS) covering queueing,
+    attempts and backoff. 429/5xx and connection errors are retried with
+    jittered exponential backoff, and a semaphore caps concurrent calls
+    (a streamed call holds its slot until the stream ends).
+    """
+
+    def __init__(self, api_key: Optional[str] = Config.GROQ_API_KEY,
+                 timeout: float = Config.LLM_TIMEOUT_SECONDS,
+                 default_deadline: float = Config.LLM_DEADLINE_SECONDS,
+                 deadlines: Optional[Dict[str, float]] = None,
+                 max_retries: int = Config.LLM_MAX_RETRIES,
+                 backoff_base: float = Config.LLM_BACKOFF_BASE_SECONDS,
+                 backoff_max: float = Config.LLM_BACKOFF_MAX_SECONDS,
+                 max_concurrency: int = Config.LLM_MAX_CONCURRENCY,
+                 pool_size: int = Config.LLM_POOL_SIZE,
+                 keepalive_seconds: float = Config.LLM_KEEPALIVE_SECONDS):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.default_deadline = default_deadline
+        self.deadlines = Config.LLM_DEADLINES if deadlines is None else deadlines
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size
+        self.keepalive_seconds = keepalive_seconds
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._client: Optional[Groq] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._call_sites: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def client(self) -> Groq:
+        """Groq client, built on first use"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    http_client = httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=self.pool_size,
+                            max_keepalive_connections=self.pool_size,
+                            keepalive_expiry=self.keepalive_seconds
+                        ),
+                        timeout=self.timeout
+                    )
+                    # Retries are ours, so they respect the call's deadline
+                    self._client = Groq(api_key=self.api_key, http_client=http_client,
+                                        timeout=self.timeout, max_retries=0)
+        return self._client
+
+    def deadline(self, call_site: str) -> float:
+        return float(self.deadlines.get(call_site, self.default_deadline))
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number `attempt` (0-based)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _acquire(self, call_site: str, started: float, expires_at: float) -> float:
+        """Wait for a concurrency slot; returns the seconds spent queued"""
+        if not self._semaphore.acquire(timeout=max(expires_at - time.monotonic(), 0)):
+            self._record(call_site, started, 'timeouts')
+            raise TimeoutError(f"LLM call '{call_site}' timed out waiting for a free slot")
+        with self._lock:
+            self._in_flight += 1
+        return time.monotonic() - started
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._semaphore.release()
+
+    def _send(self, call_site: str, started: float, expires_at: float, queued: float,
+              **request) -> Tuple[Any, int]:
+        """(response, retries) of the request, retried until it succeeds or the deadline passes"""
+        attempt = 0
+        while True:
+            remaining = expires_at - time.monotonic()
+            if remaining <= 0:
+                self._record(call_site, started, 'timeouts', queued, attempt)
+                raise TimeoutError(f"LLM call '{call_site}' exceeded its deadline")
+            try:
+                response = self.client.chat.completions.create(
+                    timeout=min(self.timeout, remaining), **request
+                )
+                return response, attempt
+            except Exception as error:
+                outcome = 'timeouts' if isinstance(error, APITimeoutError) else 'errors'
+                if not retryable(error) or attempt >= self.max_retries:
+                    self._record(call_site, started, outcome, queued, attempt)
+                    raise
+                delay = max(self.backoff(attempt), retry_after(error) or 0)
+                if time.monotonic() + delay >= expires_at:
+                    self._record(call_site, started, outcome, queued, attempt)
+                    raise
+                logger.warning(f"LLM call '{call_site}' failed ({error}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+                attempt += 1
+
+    def create(self, call_site: str, **request) -> Any:
+        """`chat.completions.create(**request)` within the call site's deadline"""
+        started = time.monotonic()
+        expires_at = started + self.deadline(call_site)
+        queued = self._acquire(call_site, started, expires_at)
+        try:
+            response, retries = self._send(call_site, started, expires_at, queued, **request)
+            self._record(call_site, started, None, queued, retries, usage=getattr(response, 'usage', None))
+            return response
+        finally:
+            self._release()
+
+    def stream(self, call_site: str, **request) -> Iterator[str]:
+        """
+        Content deltas of a streamed completion. Opening the stream is
+        retried like `create`; once tokens flow, an upstream failure or the
+        deadline ends the stream with an error.
+        """
+        started = time.monotonic()
+        expires_at = started + self.deadline(call_site)
+        queued = self._acquire(call_site, started, expires_at)
+        try:
+            chunks, retries = self._send(call_site, started, expires_at, queued, stream=True, **request)
+            first_token = None
+            try:
+                for chunk in chunks:
+                    if time.monotonic() > expires_at:
+                        raise TimeoutError(f"LLM stream '{call_site}' exceeded its deadline")
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        if first_token is None:
+                            first_token = time.monotonic() - started
+                        yield delta
+            except Exception as error:
+                timed_out = isinstance(error, (TimeoutError, APITimeoutError))
+                self._record(call_site, started, 'timeouts' if timed_out else 'errors', queued, retries)
+                raise
+            finally:
+                chunks.close()
+            self._record(call_site, started, None, queued, retries, first_token)
+        finally:
+            self._release()
+
+    def _record(self, call_site: str, started: float, outcome: Optional[str],
+                queued: float = 0.0, retries: int = 0, first_token: Optional[float] = None,
+                usage: Any = None):
+        elapsed = time.monotonic() - started
+        with self._lock:
+            counters = self._call_sites.setdefault(call_site, {
+                'calls': 0, 'errors': 0, 'timeouts': 0, 'retries': 0, 'queued_seconds': 0.0,
+                'prompt_tokens': 0, 'completion_tokens': 0,
+                'latencies': deque(maxlen=LATENCY_WINDOW), 'first_tokens': deque(maxlen=LATENCY_WINDOW)
+            })
+            counters['calls'] += 1
+            counters['retries'] += retries
+            counters['queued_seconds'] += queued
+            if outcome is not None:
+                counters[outcome] += 1
+            else:
+                counters['latencies'].append(elapsed)
+            if first_token is not None:
+                counters['first_tokens'].append(first_token)
+            if usage is not None:
+                counters['prompt_tokens'] += getattr(usage, 'prompt_tokens', 0) or 0
+                counters['completion_tokens'] += getattr(usage, 'completion_tokens', 0) or 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = {
+                site: (dict(counters), sorted(counters['latencies']), sorted(counters['first_tokens']))
+                for site, counters in self._call_sites.items()
+            }
+            in_flight = self._in_flight
+
+        call_sites = {}
+        for site, (counters, latencies, first_tokens) in snapshot.items():
+            call_sites[site] = {
+                'calls': counters['calls'],
+                'errors': counters['errors'],
+                'timeouts': counters['timeouts'],
+                'retries': counters['retries'],
+                'prompt_tokens': counters['prompt_tokens'],
+                'completion_tokens': counters['completion_tokens'],
+                'mean_queued_seconds': round(counters['queued_seconds'] / counters['calls'], 4),
+                'latency_seconds': {
+                    'p50': percentile(latencies, 0.5),
+                    'p95': percentile(latencies, 0.95),
+                    'max': round(latencies[-1], 4) if latencies else None
+                },
+                'deadline_seconds': self.deadline(site)
+            }
+            if first_tokens:
+                # Streamed calls only
+                call_sites[site]['first_token_seconds'] = {
+                    'p50': percentile(first_tokens, 0.5),
+                    'p95': percentile(first_tokens, 0.95)
+                }
+
+        return {
+            'in_flight': in_flight,
+            'max_concurrency': self.max_concurrency,
+            'pool_size': self.pool_size,
+            'timeout_seconds': self.timeout,
+            'max_retries': self.max_retries,
+            'call_sites': call_sites
+        }
+
+# Shared by every Groq call site of the service
+llm_gateway = LLMGateway()
@@ -0,0 +1,144 @@
+import re
+import threading
+import zlib
+from functools import lru_cache
+import numpy as np
+from typing import List, Dict, Set, Tuple, Hashable, Iterable, Optional
+
+# Universal hashing modulo a Mersenne prime, truncated to 32 bits
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+def shingles(text: str, size: int = 3) -> Set[int]:
+    """32-bit hashes of the word `size`-grams of the text"""
+    tokens = _TOKEN_PATTERN.findall((text or '').lower())
+    if len(tokens) <= size:
+        grams = [' '.join(tokens)] if tokens else []
+    else:
+        grams = [' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+    return {zlib.crc32(gram.encode('utf-8')) for gram in grams}
+
+@lru_cache(maxsize=None)
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    (bands, rows per band) minimizing the summed false-positive and
+    false-negative probability mass around the Jaccard threshold
+    """
+    def collision(s, bands, rows):
+        return 1 - (1 - s ** rows) ** bands
+
+    best, best_error = (1, num_perm), float('inf')
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        below = np.linspace(0, threshold, 50)
+        above = np.linspace(threshold, 1, 50)
+        false_positive = collision(below, bands, rows).mean() * threshold
+        false_negative = (1 - collision(above, bands, rows)).mean() * (1 - threshold)
+        if false_positive + false_negative < best_error:
+            best, best_error = (bands, rows), false_positive + false_negative
+    return best
+
+class MinHash:
+    """MinHash signatures with `num_perm` seeded hash permutations"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = rng.randint(1, int(_MERSENNE_PRIME), num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, int(_MERSENNE_PRIME), num_perm, dtype=np.uint64)
+
+    def signature(self, hashes: Iterable[int]) -> np.ndarray:
+        values = np.fromiter(hashes, dtype=np.uint64)
+        if not len(values):
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        permuted = ((values[:, None] * self._a + self._b) % _MERSENNE_PRIME) & _MAX_HASH
+        return permuted.min(axis=0)
+
+    def text_signature(self, text: str, shingle_size: int = 3) -> np.ndarray:
+        return self.signature(shingles(text, shingle_size))
+
+def jaccard(signature: np.ndarray, other: np.ndarray) -> float:
+    """Jaccard similarity estimated from two signatures"""
+    return float(np.mean(signature == other))
+
+class MinHashLSH:
+    """
+    Banded locality-sensitive hashing over MinHash signatures. Each
+    signature is split into bands hashed into buckets; a query only looks at
+    keys sharing a bucket in some band and keeps those whose estimated
+    Jaccard similarity reaches the threshold.
+    """
+
+    def __init__(self, threshold: float = 0.9, num_perm: int = 128):
+        if not 0 < threshold <= 1:
+            raise ValueError('threshold must be in (0, 1]')
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        self._tables: List[Dict[bytes, Set[Hashable]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def insert(self, key: Hashable, signature: np.ndarray):
+        with self._lock:
+            if key in self._signatures:
+                self._remove(key)
+            self._signatures[key] = signature
+            for table, band_key in zip(self._tables, self._band_keys(signature)):
+                table.setdefault(band_key, set()).add(key)
+
+    def remove(self, key: Hashable):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: Hashable):
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for table, band_key in zip(self._tables, self._band_keys(signature)):
+            bucket = table.get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del table[band_key]
+
+    def query(self, signature: np.ndarray) -> List[Tuple[Hashable, float]]:
+        """Keys whose estimated Jaccard similarity reaches the threshold, most similar first"""
+        with self._lock:
+            candidates = set()
+            for table, band_key in zip(self._tables, self._band_keys(signature)):
+                candidates.update(table.get(band_key, ()))
+            matches = [(key, jaccard(signature, self._signatures[key])) for key in candidates]
+        matches = [(key, similarity) for key, similarity in matches if similarity >= self.threshold]
+        return sorted(matches, key=lambda match: -match[1])
+
+def cluster_near_duplicates(signatures: List[np.ndarray], threshold: float = 0.9,
+                            groups: Optional[List[Hashable]] = None) -> List[int]:
+    """
+    Representative position for each signature: the first earlier item it
+    is a near-duplicate of (within the same group, if given), else itself
+    """
+    if not signatures:
+        return []
+    lsh = MinHashLSH(threshold, len(signatures[0]))
+    representatives = []
+    for position, signature in enumerate(signatures):
+        representative = position
+        for candidate, _ in lsh.query(signature):
+            if groups is None or groups[candidate] == groups[position]:
+                representative = candidate
+                break
+        if representative == position:
+            lsh.insert(position, signature)
+        representatives.append(representative)
+    return representatives
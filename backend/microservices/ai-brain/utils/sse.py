@@ -0,0 +1,38 @@
+import json
+from typing import Any, Callable, Dict
+import logging
+from flask import Response, stream_with_context
+from utils.llm_cache import llm_cache
+
+logger = logging.getLogger('ai-brain')
+
+SSE_MIMETYPE = 'text/event-stream'
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def llm_event_stream(call_site: str, request: Dict[str, Any], result: Callable[[str], Dict[str, Any]]) -> Response:
+    """
+    Server-Sent Events for one LLM generation: a `token` event per content
+    delta as it arrives, then a `result` event holding `result(full_text)`,
+    the same body the blocking endpoint returns. Failures end the stream
+    with an `error` event.
+    """
+    def generate():
+        chunks = []
+        try:
+            # A text `result` can't parse is not cached
+            for delta in llm_cache.stream(call_site, validate=result, **request):
+                chunks.append(delta)
+                yield sse_event('token', {'text': delta})
+            yield sse_event('result', result(''.join(chunks)))
+        except Exception as e:
+            logger.error(f"Error streaming {call_site}: {str(e)}")
+            yield sse_event('error', {'success': False, 'error': str(e)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=SSE_MIMETYPE,
+        # Keep proxies from buffering the stream
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
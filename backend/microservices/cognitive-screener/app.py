@@ -8,6 +8,8 @@ from routes.resume_analysis import resume_analysis_bp
 from routes.interview_evaluation import interview_evaluation_bp
 from routes.cognitive_assessment import cognitive_assessment_bp
 from utils.logger import setup_logger
+from utils.llm_cache import llm_cache
+from utils.llm_gateway import llm_gateway
 from config.settings import Config
 
 load_dotenv()
@@ -32,6 +34,11 @@ def health_check():
         'version': '1.0.0'
     }), 200
 
+@app.route('/llm/stats', methods=['GET'])
+def llm_stats():
+    """LLM response cache and gateway statistics, per call site"""
+    return jsonify({'cache': llm_cache.stats(), 'gateway': llm_gateway.stats()}), 200
+
 @app.errorhandler(Exception)
 def handle_error(error):
     logger.error(f"Unhandled error: {str(error)}")
@@ -0,0 +1,95 @@
+"""
+Pathological-input benchmark of the regex resume extractors: each input
+of the corpus is run through the `/resume/extract` and `/resume/quality-check`
+code paths at growing sizes, and every run must stay within a time budget
+per KB of input.
+
+    python benchmarks/extractor_redos_benchmark.py [--max-ms-per-kb MS] [--sizes KB ...]
+
+Inputs target the backtracking of the old per-title experience patterns,
+the lazy `[\\s\\S]*?` section searches and the unbounded runs of the
+email, URL and project patterns. Sizes past RESUME_SCAN_MAX_CHARS are
+truncated, so the largest size also checks the input cap.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.skill_matcher_benchmark import SAMPLE_RESUME  # noqa: E402
+from models.resume_analyzer import ResumeAnalyzer  # noqa: E402
+from models.resume_sections import segment_cache  # noqa: E402
+
+def repeat(unit):
+    return lambda size: (unit * (size // len(unit) + 1))[:size]
+
+# name -> builder of an input of `size` characters
+PATHOLOGICAL_INPUTS = {
+    'sample resume': repeat(SAMPLE_RESUME),
+    'one long word': repeat('a'),
+    'capitalized words': repeat('Ab '),
+    'spaces': repeat(' '),
+    'newlines': repeat('\n'),
+    'indented blank lines': repeat('\n '),
+    'dashes': repeat('-'),
+    'digits': repeat('1'),
+    'dotted word': repeat('a.'),
+    'hyphenated word': repeat('ab-'),
+    'job title soup': repeat('developer '),
+    'title without company': repeat('senior developer at 1'),
+    'month prefixes': repeat('jan'),
+    'company without date': repeat('Acme Corp | '),
+    'project name dashes': repeat('Foo Bar - '),
+    'at-signs': repeat('a@'),
+    'experience then one word': lambda size: 'EXPERIENCE\n' + repeat('a')(size - 11),
+    'projects then blank lines': lambda size: 'PROJECTS\n' + repeat('\n ')(size - 9),
+    'bullets': lambda size: 'PROJECTS\n' + repeat('\n- ')(size - 9),
+    'one endless line': lambda size: repeat('Senior Developer at Acme, Built a tool - ')(size).replace('\n', ' ')
+}
+
+def extract(analyzer, text):
+    """The `/resume/extract` path"""
+    return analyzer._extract_resume_data(text)
+
+def quality_check(analyzer, text):
+    """The `/resume/quality-check` path"""
+    extracted = analyzer._extract_resume_data(text)
+    analyzer._calculate_quality_score(extracted)
+    analyzer._generate_suggestions(extracted, text)
+    analyzer._check_ats_compatibility(text)
+
+def timed_run(func, analyzer, text):
+    # Segmentation is cached per text; measure it as a first request would
+    segment_cache.clear()
+    started = time.perf_counter()
+    func(analyzer, text)
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--max-ms-per-kb', type=float, default=5.0, help='time budget per KB of input')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 16, 64, 256], help='input sizes in KB')
+    args = parser.parse_args()
+
+    analyzer = ResumeAnalyzer()
+    failures = []
+    print(f"{'input':<26} {'KB':>5}  {'extract ms/KB':>13}  {'quality ms/KB':>13}")
+    for name, build in PATHOLOGICAL_INPUTS.items():
+        for size_kb in args.sizes:
+            text = build(size_kb * 1024)
+            row = []
+            for func in (extract, quality_check):
+                ms_per_kb = timed_run(func, analyzer, text) * 1000 / size_kb
+                row.append(ms_per_kb)
+                if ms_per_kb > args.max_ms_per_kb:
+                    failures.append(f"{name} ({size_kb} KB) {func.__name__}: {ms_per_kb:.2f} ms/KB")
+            print(f"{name:<26} {size_kb:>5}  {row[0]:>13.3f}  {row[1]:>13.3f}")
+
+    if failures:
+        raise AssertionError(f"Over {args.max_ms_per_kb} ms/KB:\n  " + '\n  '.join(failures))
+    print(f"All inputs within {args.max_ms_per_kb} ms/KB")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Micro-benchmark: the compiled single-pass skill matcher against the old
+loop of one `re.search(r'\\bskill\\b')` per keyword.
+
+    python benchmarks/skill_matcher_benchmark.py [--repeat N]
+
+Checks first that both find the same skills, in the same order, on every
+sample resume.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.resume_analyzer import (  # noqa: E402
+    SOFT_SKILLS_KEYWORDS, TECHNICAL_SKILLS_KEYWORDS, soft_skill_matcher, technical_skill_matcher
+)
+
+SAMPLE_RESUME = """
+Jane Doe
+jane.doe@example.com | +1 555 123 4567 | linkedin.com/in/janedoe | github.com/janedoe
+
+SUMMARY
+Backend engineer with 5 years of experience building microservices in Python, Go and Node.js.
+Strong communication, leadership and problem-solving skills; detail-oriented team player.
+
+EXPERIENCE
+Senior Software Engineer at Acme Corp (2021 - Present)
+- Built REST and GraphQL APIs with FastAPI, Django and Spring Boot on AWS (EC2, S3, Lambda)
+- Ran Kubernetes, Docker, Terraform and GitHub Actions CI/CD pipelines; Prometheus + Grafana
+- Mentoring junior developers, time management, public speaking at meetups
+
+Software Engineer at Globex (2018 - 2021)
+- React, Redux, TypeScript and Tailwind front ends; Jest and Cypress testing
+- PostgreSQL, Redis, Kafka, Elasticsearch; ETL jobs in Apache Airflow and Spark
+- C++ and C# services, .NET Core migration, asp.net maintenance
+
+PROJECTS
+Resume Screener - machine learning with scikit-learn, pandas, NumPy, PyTorch and Hugging Face transformers
+Chat App - Flutter, Firebase, WebSocket
+
+EDUCATION
+B.Tech in Computer Science, 2018
+
+SKILLS
+Python, Java, JavaScript, SQL, MongoDB, Linux, Git, Agile, Scrum, Jira, Figma, data structures, algorithms
+"""
+
+def loop_find(keywords, text_lower):
+    """The old extraction: one regex search over the whole text per keyword"""
+    found = []
+    for skill in keywords:
+        pattern = r'\b' + re.escape(skill) + r'\b'
+        if re.search(pattern, text_lower) and skill not in found:
+            found.append(skill)
+    return found
+
+def random_text(rng, keywords, words):
+    """Keywords and filler glued with the punctuation resumes use"""
+    pieces = [rng.choice(keywords) if rng.random() < 0.3 else rng.choice(words) for _ in range(400)]
+    glue = [' ', ', ', '\n', '/', '-', '.', ' (', ') ', '+', '#', '_']
+    return ''.join(piece + rng.choice(glue) for piece in pieces)
+
+def check_equivalence(samples):
+    for text in samples:
+        text_lower = text.lower()
+        for keywords, matcher in ((TECHNICAL_SKILLS_KEYWORDS, technical_skill_matcher),
+                                  (SOFT_SKILLS_KEYWORDS, soft_skill_matcher)):
+            expected = loop_find(keywords, text_lower)
+            actual = matcher.find(text_lower)
+            if expected != actual:
+                raise AssertionError(f"Mismatch:\n  loop:    {expected}\n  matcher: {actual}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=200, help='runs per measurement')
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    filler = re.findall(r'[a-z]+', SAMPLE_RESUME.lower())
+    keywords = TECHNICAL_SKILLS_KEYWORDS + SOFT_SKILLS_KEYWORDS
+    samples = [SAMPLE_RESUME] + [random_text(rng, keywords, filler) for _ in range(200)]
+    check_equivalence(samples)
+    print(f"Equivalent on {len(samples)} texts")
+
+    for name, text in (('sample resume', SAMPLE_RESUME), ('sample resume x10', SAMPLE_RESUME * 10)):
+        text_lower = text.lower()
+        old = timeit.timeit(
+            lambda: (loop_find(TECHNICAL_SKILLS_KEYWORDS, text_lower), loop_find(SOFT_SKILLS_KEYWORDS, text_lower)),
+            number=args.repeat
+        ) / args.repeat
+        new = timeit.timeit(
+            lambda: (technical_skill_matcher.find(text_lower), soft_skill_matcher.find(text_lower)),
+            number=args.repeat
+        ) / args.repeat
+        print(f"{name:<18} {len(text):>6} chars  loop {old * 1000:8.3f} ms  matcher {new * 1000:8.3f} ms  "
+              f"speedup {old / new:5.1f}x")
+
+if __name__ == '__main__':
+    main()
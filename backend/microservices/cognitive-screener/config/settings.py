@@ -1,3 +1,4 @@
+import json
 import os
 from dotenv import load_dotenv
 
@@ -34,6 +35,19 @@ class Config:
     # Resume Analysis Config
     MAX_RESUME_SIZE_MB = int(os.getenv('MAX_RESUME_SIZE_MB', 5))
     SUPPORTED_RESUME_FORMATS = ['pdf', 'docx', 'txt']
+    # Characters of a resume the regex extractors read; the rest is ignored
+    RESUME_SCAN_MAX_CHARS = int(os.getenv('RESUME_SCAN_MAX_CHARS', 50000))
+    
+    # Near-Duplicate Resume Config (MinHash/LSH)
+    RESUME_DEDUP_ENABLED = os.getenv('RESUME_DEDUP_ENABLED', 'False') == 'True'
+    RESUME_DEDUP_JACCARD_THRESHOLD = float(os.getenv('RESUME_DEDUP_JACCARD_THRESHOLD', 0.95))
+    RESUME_DEDUP_MAX_ENTRIES = int(os.getenv('RESUME_DEDUP_MAX_ENTRIES', 10000))
+    DEDUP_NUM_PERM = int(os.getenv('DEDUP_NUM_PERM', 128))
+    # Threads running independent resume analysis stages (the AI job match) alongside extraction
+    RESUME_ANALYSIS_WORKERS = int(os.getenv('RESUME_ANALYSIS_WORKERS', 4))
+    # 'separate' (one AI call per stage) or 'combined' (one structured call); overridable per request
+    RESUME_ANALYSIS_MODE = os.getenv('RESUME_ANALYSIS_MODE', 'separate')
+    RESUME_COMBINED_MAX_TOKENS = int(os.getenv('RESUME_COMBINED_MAX_TOKENS', 6144))
     
     # Interview Evaluation Config
     SPEECH_TO_TEXT_PROVIDER = os.getenv('SPEECH_TO_TEXT_PROVIDER', 'whisper')
@@ -49,6 +63,27 @@ class Config:
     ASSESSMENT_TIME_LIMIT = int(os.getenv('ASSESSMENT_TIME_LIMIT', 3600))  # seconds
     MIN_PASSING_SCORE = float(os.getenv('MIN_PASSING_SCORE', 0.7))
     
+    # LLM Gateway Config
+    # Per-attempt HTTP timeout; the deadline bounds the whole call including retries
+    LLM_TIMEOUT_SECONDS = float(os.getenv('LLM_TIMEOUT_SECONDS', 30))
+    LLM_DEADLINE_SECONDS = float(os.getenv('LLM_DEADLINE_SECONDS', 60))
+    # Per-call-site deadlines in seconds as JSON, e.g. {"resume_extract": 90}
+    LLM_DEADLINES = json.loads(os.getenv('LLM_DEADLINES', '{}'))
+    LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 3))
+    LLM_BACKOFF_BASE_SECONDS = float(os.getenv('LLM_BACKOFF_BASE_SECONDS', 0.5))
+    LLM_BACKOFF_MAX_SECONDS = float(os.getenv('LLM_BACKOFF_MAX_SECONDS', 8))
+    LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 16))
+    LLM_POOL_SIZE = int(os.getenv('LLM_POOL_SIZE', 16))
+    LLM_KEEPALIVE_SECONDS = float(os.getenv('LLM_KEEPALIVE_SECONDS', 30))
+    
+    # LLM Response Cache Config
+    LLM_CACHE_SIZE = int(os.getenv('LLM_CACHE_SIZE', 1000))
+    # Optional SQLite file shared by worker processes (memory only when empty)
+    LLM_CACHE_DB_PATH = os.getenv('LLM_CACHE_DB_PATH', '')
+    LLM_CACHE_DEFAULT_TTL_SECONDS = float(os.getenv('LLM_CACHE_DEFAULT_TTL_SECONDS', 3600))
+    # Per-call-site TTLs in seconds as JSON, e.g. {"skill_roadmap": 86400}; 0 disables caching
+    LLM_CACHE_TTLS = json.loads(os.getenv('LLM_CACHE_TTLS', '{}'))
+    
     # Rate Limiting
     RATE_LIMIT_REQUESTS = int(os.getenv('RATE_LIMIT_REQUESTS', 50))
     RATE_LIMIT_PERIOD = int(os.getenv('RATE_LIMIT_PERIOD', 3600))
@@ -1,8 +1,8 @@
-from groq import Groq
 from typing import Dict, Any, List
 import logging
 from datetime import datetime
 from config.settings import Config
+from utils.llm_cache import llm_cache
 
 logger = logging.getLogger('cognitive-screener')
 
@@ -12,7 +12,6 @@ class InterviewEvaluator:
     """
     
     def __init__(self):
-        self.client = Groq(api_key=Config.GROQ_API_KEY)
         self.model_name = Config.GROQ_MODEL
         self.evaluation_criteria = Config.INTERVIEW_EVALUATION_CRITERIA
     
@@ -88,7 +87,8 @@ Rate each criterion on a scale of 1-10 and provide brief feedback:
 Provide scores and 1-2 sentence feedback for each criterion.
 """
             
-            response = self.client.chat.completions.create(
+            ai_feedback = llm_cache.complete(
+                'interview_answer',
                 model=self.model_name,
                 messages=[
                     {"role": "system", "content": "You are an expert technical interviewer and evaluator."},
@@ -98,8 +98,6 @@ Provide scores and 1-2 sentence feedback for each criterion.
                 max_tokens=4096
             )
             
-            ai_feedback = response.choices[0].message.content
-            
             # For now, use heuristic scoring as fallback
             scores = self._heuristic_scoring(answer)
             
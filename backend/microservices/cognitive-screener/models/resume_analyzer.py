@@ -1,56 +1,403 @@
 import re
-from groq import Groq
-from typing import Dict, Any, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, List
 import PyPDF2
 import io
 import logging
 import json
 from config.settings import Config
+from models.resume_dedup import ResumeDeduplicator
+from models.resume_schema import SECTION_SCHEMAS, schema_errors
+from models.resume_scanners import scan_experience, scan_projects
+from models.resume_sections import resume_sections
+from utils.llm_cache import llm_cache, json_content
+from utils.keyword_matcher import KeywordMatcher
+from utils.llm_gateway import llm_gateway
 
 logger = logging.getLogger('cognitive-screener')
 
+ANALYSIS_MODES = ('separate', 'combined')
+
+# Groq call sites each analysis mode uses, for comparing their token use
+MODE_CALL_SITES = {
+    'separate': ('resume_extract', 'resume_suggestions', 'resume_job_match'),
+    'combined': ('resume_combined', 'resume_combined_repair')
+}
+
+# Shared by all requests, so concurrent analyses can't spawn unbounded threads
+stage_pool = ThreadPoolExecutor(max_workers=Config.RESUME_ANALYSIS_WORKERS, thread_name_prefix='resume-stage')
+
+def timed(timings: Dict[str, float], stage: str, func: Callable, *args) -> Any:
+    """Run one analysis stage, recording its wall time in seconds"""
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        timings[stage] = round(time.perf_counter() - started, 4)
+
+# Comprehensive skills extraction keywords, matched as whole words
+TECHNICAL_SKILLS_KEYWORDS = [
+    # Programming Languages
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'c', 'ruby', 'go', 'golang',
+    'rust', 'swift', 'kotlin', 'scala', 'php', 'perl', 'r', 'matlab', 'julia', 'dart',
+    'objective-c', 'groovy', 'lua', 'haskell', 'clojure', 'elixir', 'erlang', 'fortran',
+    'cobol', 'assembly', 'bash', 'shell', 'powershell', 'vba', 'visual basic',
+    
+    # Web Technologies
+    'html', 'html5', 'css', 'css3', 'sass', 'scss', 'less', 'tailwind', 'tailwindcss',
+    'bootstrap', 'material ui', 'materialize', 'bulma', 'foundation',
+    
+    # Frontend Frameworks
+    'react', 'reactjs', 'react.js', 'angular', 'angularjs', 'vue', 'vuejs', 'vue.js',
+    'svelte', 'next.js', 'nextjs', 'nuxt', 'nuxtjs', 'gatsby', 'ember', 'backbone',
+    'jquery', 'redux', 'mobx', 'webpack', 'vite', 'parcel', 'rollup', 'babel',
+    
+    # Backend Frameworks
+    'node.js', 'nodejs', 'express', 'expressjs', 'fastify', 'koa', 'nestjs', 'nest.js',
+    'django', 'flask', 'fastapi', 'tornado', 'pyramid', 'bottle',
+    'spring', 'spring boot', 'springboot', 'hibernate', 'struts',
+    'rails', 'ruby on rails', 'sinatra',
+    'asp.net', '.net', '.net core', 'dotnet',
+    'laravel', 'symfony', 'codeigniter', 'yii',
+    'gin', 'echo', 'fiber', 'beego',
+    
+    # Databases
+    'sql', 'mysql', 'postgresql', 'postgres', 'sqlite', 'oracle', 'sql server', 'mssql',
+    'mariadb', 'mongodb', 'redis', 'cassandra', 'couchdb', 'couchbase', 'dynamodb',
+    'elasticsearch', 'neo4j', 'firebase', 'firestore', 'supabase', 'cockroachdb',
+    'influxdb', 'timescaledb', 'memcached', 'clickhouse',
+    
+    # Cloud Platforms
+    'aws', 'amazon web services', 'azure', 'microsoft azure', 'gcp', 'google cloud',
+    'google cloud platform', 'heroku', 'digitalocean', 'linode', 'vultr', 'vercel',
+    'netlify', 'cloudflare', 'ibm cloud', 'oracle cloud', 'alibaba cloud',
+    
+    # AWS Services
+    'ec2', 's3', 'lambda', 'rds', 'dynamodb', 'cloudfront', 'route53', 'sqs', 'sns',
+    'ecs', 'eks', 'fargate', 'cloudwatch', 'iam', 'cognito', 'api gateway',
+    
+    # DevOps & Infrastructure
+    'docker', 'kubernetes', 'k8s', 'jenkins', 'travis ci', 'circle ci', 'github actions',
+    'gitlab ci', 'ansible', 'terraform', 'puppet', 'chef', 'vagrant', 'packer',
+    'prometheus', 'grafana', 'datadog', 'splunk', 'elk', 'logstash', 'kibana',
+    'nginx', 'apache', 'haproxy', 'traefik', 'envoy',
+    
+    # Version Control
+    'git', 'github', 'gitlab', 'bitbucket', 'svn', 'mercurial',
+    
+    # AI/ML
+    'machine learning', 'deep learning', 'artificial intelligence', 'ai', 'ml',
+    'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'sklearn', 'pandas', 'numpy',
+    'scipy', 'matplotlib', 'seaborn', 'plotly', 'opencv', 'nltk', 'spacy',
+    'hugging face', 'transformers', 'bert', 'gpt', 'llm', 'langchain',
+    'computer vision', 'nlp', 'natural language processing', 'neural network',
+    'cnn', 'rnn', 'lstm', 'gan', 'reinforcement learning',
+    
+    # Data Engineering
+    'spark', 'apache spark', 'hadoop', 'hive', 'pig', 'kafka', 'apache kafka',
+    'airflow', 'apache airflow', 'dbt', 'snowflake', 'databricks', 'redshift',
+    'bigquery', 'etl', 'data pipeline', 'data warehouse',
+    
+    # Mobile Development
+    'android', 'ios', 'react native', 'flutter', 'xamarin', 'ionic', 'cordova',
+    'swift ui', 'swiftui', 'kotlin multiplatform', 'expo',
+    
+    # Testing
+    'jest', 'mocha', 'chai', 'jasmine', 'cypress', 'selenium', 'puppeteer',
+    'playwright', 'pytest', 'unittest', 'junit', 'testng', 'rspec', 'enzyme',
+    'testing library', 'postman', 'soapui', 'jmeter', 'locust',
+    
+    # API & Protocols
+    'rest', 'restful', 'graphql', 'grpc', 'soap', 'websocket', 'webhooks',
+    'oauth', 'jwt', 'openapi', 'swagger',
+    
+    # Tools & IDEs
+    'vs code', 'visual studio', 'intellij', 'pycharm', 'eclipse', 'vim', 'emacs',
+    'sublime', 'atom', 'xcode', 'android studio',
+    
+    # Other
+    'linux', 'unix', 'windows', 'macos', 'agile', 'scrum', 'kanban', 'jira',
+    'confluence', 'trello', 'slack', 'figma', 'sketch', 'adobe xd', 'photoshop',
+    'illustrator', 'blockchain', 'web3', 'solidity', 'ethereum', 'smart contracts',
+    'microservices', 'serverless', 'ci/cd', 'cicd', 'devops', 'sre', 'mlops',
+    'data structures', 'algorithms', 'oop', 'functional programming', 'tdd', 'bdd',
+]
+
+SOFT_SKILLS_KEYWORDS = [
+    'communication', 'leadership', 'teamwork', 'team player', 'collaboration',
+    'problem solving', 'problem-solving', 'critical thinking', 'analytical',
+    'time management', 'organization', 'organizational', 'adaptability', 'flexibility',
+    'creativity', 'innovation', 'innovative', 'attention to detail', 'detail-oriented',
+    'project management', 'mentoring', 'coaching', 'training', 'presentation',
+    'public speaking', 'negotiation', 'conflict resolution', 'decision making',
+    'strategic thinking', 'customer service', 'client relations', 'interpersonal',
+    'emotional intelligence', 'self-motivated', 'proactive', 'initiative',
+    'multitasking', 'prioritization', 'deadline-driven', 'results-oriented',
+    'research', 'analytical skills', 'written communication', 'verbal communication',
+]
+
+# Compiled once; each finds all of its keywords in a single pass
+technical_skill_matcher = KeywordMatcher(TECHNICAL_SKILLS_KEYWORDS)
+soft_skill_matcher = KeywordMatcher(SOFT_SKILLS_KEYWORDS)
+
 class ResumeAnalyzer:
     """
     Advanced resume analysis using NLP and Groq AI
     """
     
     def __init__(self):
-        self.client = Groq(api_key=Config.GROQ_API_KEY)
         self.model_name = Config.GROQ_MODEL
+        # Near-duplicate re-uploads reuse a prior analysis
+        self.deduplicator = ResumeDeduplicator() if Config.RESUME_DEDUP_ENABLED else None
+        self._mode_stats = {mode: {'analyses': 0, 'seconds': 0.0, 'repairs': 0} for mode in ANALYSIS_MODES}
+        self._stats_lock = threading.Lock()
     
-    def analyze_resume(self, resume_text: str, job_description: str = None) -> Dict[str, Any]:
+    def analyze_resume(self, resume_text: str, job_description: str = None, mode: str = None) -> Dict[str, Any]:
         """
-        Comprehensive resume analysis using AI
+        Comprehensive resume analysis using AI. `mode` is 'separate' (one AI
+        call per stage) or 'combined' (one structured call for all stages);
+        defaults to RESUME_ANALYSIS_MODE.
         """
+        mode = mode or Config.RESUME_ANALYSIS_MODE
+        if mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode '{mode}'; expected one of {', '.join(ANALYSIS_MODES)}")
+        
+        if self.deduplicator:
+            reused = self.deduplicator.lookup(resume_text, job_description)
+            if reused is not None:
+                if not reused['reused_analysis']['exact']:
+                    self._replace_personal_details(reused, resume_text)
+                return reused
+        
+        started = time.perf_counter()
+        timings = {}
         try:
-            # Use AI to extract structured information
-            extracted_data = self._ai_extract_resume_data(resume_text)
-            
-            # Calculate detailed quality score with explanations
-            quality_score = self._calculate_detailed_quality_score(extracted_data, resume_text)
-            
-            # Generate improvement suggestions
-            suggestions = self._generate_ai_suggestions(extracted_data, resume_text)
+            if mode == 'combined':
+                result = self._analyze_combined(resume_text, job_description, timings)
+            else:
+                result = self._analyze_separate(resume_text, job_description, timings)
             
-            # If job description provided, calculate match
-            job_match = None
-            if job_description:
-                job_match = self._analyze_job_match(resume_text, job_description)
+            if self.deduplicator:
+                self.deduplicator.store(resume_text, job_description, result)
             
-            return {
-                'success': True,
-                'extracted_data': extracted_data,
-                'quality_score': quality_score,
-                'suggestions': suggestions,
-                'job_match': job_match,
-                'ats_friendly': self._check_ats_compatibility(resume_text)
-            }
+            # Not stored: a reused analysis shouldn't report the original's timings
+            timings['total'] = round(time.perf_counter() - started, 4)
+            result['analysis_mode'] = mode
+            result['stage_timings'] = timings
+            self._record_mode(mode, timings['total'], result.get('repaired_sections'))
+            return result
             
         except Exception as e:
             logger.error(f"Error analyzing resume: {str(e)}")
             # Fallback to basic analysis if AI fails
             return self._fallback_analysis(resume_text, job_description, str(e))
     
+    def _replace_personal_details(self, analysis: Dict[str, Any], resume_text: str):
+        """
+        Swap the contact details of a near-duplicate's reused analysis for
+        those of `resume_text`, so one person's details never reach another
+        """
+        extracted = analysis.get('extracted_data')
+        if not isinstance(extracted, dict):
+            return
+        regex_data = self._extract_resume_data(resume_text)
+        extracted['personal_info'] = regex_data['personal_info']
+        if 'contact' in extracted:
+            extracted['contact'] = regex_data['contact']
+    
+    def _analyze_separate(self, resume_text: str, job_description: str, timings: Dict[str, float]) -> Dict[str, Any]:
+        """One AI call per stage"""
+        # The job match doesn't depend on extraction, so it runs alongside
+        # the extraction -> suggestions chain
+        job_match_future = None
+        if job_description:
+            job_match_future = stage_pool.submit(
+                timed, timings, 'job_match', self._analyze_job_match, resume_text, job_description
+            )
+        
+        # Use AI to extract structured information
+        extracted_data = timed(timings, 'extract', self._ai_extract_resume_data, resume_text)
+        
+        # Calculate detailed quality score with explanations
+        quality_score = timed(timings, 'quality_score', self._calculate_detailed_quality_score, extracted_data, resume_text)
+        
+        # Generate improvement suggestions
+        suggestions = timed(timings, 'suggestions', self._generate_ai_suggestions, extracted_data, resume_text)
+        
+        ats_friendly = timed(timings, 'ats_check', self._check_ats_compatibility, resume_text)
+        
+        # If job description provided, calculate match
+        job_match = job_match_future.result() if job_match_future else None
+        
+        return {
+            'success': True,
+            'extracted_data': extracted_data,
+            'quality_score': quality_score,
+            'suggestions': suggestions,
+            'job_match': job_match,
+            'ats_friendly': ats_friendly
+        }
+    
+    def _analyze_combined(self, resume_text: str, job_description: str, timings: Dict[str, float]) -> Dict[str, Any]:
+        """
+        One schema-constrained AI call returning every section. Sections that
+        come back missing or invalid are re-requested once, on their own;
+        any still invalid fall back to the regex / rule-based results.
+        """
+        sections = ['extracted_data', 'suggestions'] + (['job_match'] if job_description else [])
+        
+        answer = timed(timings, 'combined', self._request_sections, 'resume_combined',
+                       resume_text, job_description, sections, {})
+        errors = self._section_errors(answer, sections)
+        
+        repaired = []
+        if errors:
+            logger.warning(f"Combined analysis returned invalid sections: {errors}")
+            retry = timed(timings, 'repair', self._request_sections, 'resume_combined_repair',
+                          resume_text, job_description, list(errors), errors)
+            still_invalid = self._section_errors(retry, list(errors))
+            for section in errors:
+                if section not in still_invalid:
+                    answer[section] = retry[section]
+                    repaired.append(section)
+            errors = self._section_errors(answer, sections)
+        
+        if 'extracted_data' in errors:
+            extracted_data = self._extract_resume_data(resume_text)
+        else:
+            extracted_data = self._complete_extracted_data(answer['extracted_data'], resume_text)
+        
+        quality_score = timed(timings, 'quality_score', self._calculate_detailed_quality_score, extracted_data, resume_text)
+        
+        if 'suggestions' in errors:
+            # Rule-based suggestions read the regex extractor's fields
+            regex_data = extracted_data if 'extracted_data' in errors else self._extract_resume_data(resume_text)
+            suggestions = self._generate_suggestions(regex_data, resume_text)
+        else:
+            suggestions = answer['suggestions']
+        
+        job_match = None
+        if job_description:
+            if 'job_match' in errors:
+                job_match = {
+                    'match_score': 0,
+                    'analysis': 'Unable to analyze match at this time'
+                }
+            else:
+                details = answer['job_match']
+                job_match = {
+                    'match_score': round(details['match_score']),
+                    'analysis': json.dumps({field: details[field] for field in details if field != 'match_score'})
+                }
+        
+        return {
+            'success': True,
+            'extracted_data': extracted_data,
+            'quality_score': quality_score,
+            'suggestions': suggestions,
+            'job_match': job_match,
+            'ats_friendly': timed(timings, 'ats_check', self._check_ats_compatibility, resume_text),
+            'repaired_sections': repaired,
+            'fallback_sections': sorted(errors)
+        }
+    
+    def _request_sections(self, call_site: str, resume_text: str, job_description: str,
+                          sections: List[str], errors: Dict[str, List[str]]) -> Dict[str, Any]:
+        """Ask for `sections` of the analysis as one JSON object; {} if unparseable"""
+        schemas = {section: SECTION_SCHEMAS[section] for section in sections}
+        job_part = f"""
+JOB DESCRIPTION:
+{job_description[:1000]}
+""" if 'job_match' in sections else ''
+        retry_part = f"""
+A previous answer had these problems, fix them:
+{json.dumps(errors)}
+""" if errors else ''
+        
+        prompt = f"""
+Analyze this resume and return ONE JSON object with exactly these top-level keys: {', '.join(sections)}.
+Each key's value must conform to its JSON Schema below.
+
+- extracted_data: ALL information in the resume. Extract EVERY skill, technology, tool, framework, and competency.
+  EXPERIENCE is only PAID WORK or INTERNSHIP positions with a company/organization name;
+  PROJECTS are academic, personal, or side projects; ACHIEVEMENTS are awards, honors, certifications, competition wins.
+- suggestions: 3-5 specific, actionable improvement suggestions.
+- job_match: how well the resume matches the job description (match_score 0-100).
+
+SCHEMAS:
+{json.dumps(schemas)}
+
+RESUME TEXT:
+{resume_text[:4000]}
+{job_part}{retry_part}
+Return ONLY valid JSON (no markdown, no explanation).
+"""
+        
+        try:
+            response_text = llm_cache.complete(
+                call_site,
+                model=self.model_name,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=0.7,
+                max_tokens=Config.RESUME_COMBINED_MAX_TOKENS,
+                response_format={"type": "json_object"},
+                validate=json_content
+            )
+            
+            answer = json_content(response_text)
+            return answer if isinstance(answer, dict) else {}
+            
+        except Exception as e:
+            logger.error(f"Combined analysis request failed: {str(e)}")
+            return {}
+    
+    def _section_errors(self, answer: Dict[str, Any], sections: List[str]) -> Dict[str, List[str]]:
+        """Schema violations of each requested section that is missing or invalid"""
+        errors = {}
+        for section in sections:
+            if section not in answer:
+                errors[section] = [f"$.{section}: missing"]
+                continue
+            problems = schema_errors(answer[section], SECTION_SCHEMAS[section], f"$.{section}")
+            if problems:
+                # A few messages are enough to steer the retry
+                errors[section] = problems[:10]
+        return errors
+    
+    def _record_mode(self, mode: str, seconds: float, repaired: List[str] = None):
+        with self._stats_lock:
+            stats = self._mode_stats[mode]
+            stats['analyses'] += 1
+            stats['seconds'] += seconds
+            if repaired:
+                stats['repairs'] += 1
+    
+    def analysis_mode_stats(self) -> Dict[str, Any]:
+        """Latency of each analysis mode, with the token use of its AI call sites"""
+        call_sites = llm_gateway.stats()['call_sites']
+        with self._stats_lock:
+            mode_stats = {mode: dict(stats) for mode, stats in self._mode_stats.items()}
+        
+        result = {}
+        for mode, stats in mode_stats.items():
+            usage = [call_sites[site] for site in MODE_CALL_SITES[mode] if site in call_sites]
+            analyses = stats['analyses']
+            prompt_tokens = sum(site['prompt_tokens'] for site in usage)
+            completion_tokens = sum(site['completion_tokens'] for site in usage)
+            result[mode] = {
+                'analyses': analyses,
+                'mean_seconds': round(stats['seconds'] / analyses, 4) if analyses else None,
+                'llm_calls': sum(site['calls'] for site in usage),
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'tokens_per_analysis': round((prompt_tokens + completion_tokens) / analyses, 1) if analyses else None
+            }
+            if mode == 'combined':
+                result[mode]['repairs'] = stats['repairs']
+        return result
+    
     def _ai_extract_resume_data(self, text: str) -> Dict[str, Any]:
         """Extract structured data from resume using AI"""
         
@@ -111,40 +458,39 @@ Return ONLY valid JSON (no markdown, no explanation):
 """
         
         try:
-            response = self.client.chat.completions.create(
+            response_text = llm_cache.complete(
+                'resume_extract',
+                validate=json_content,
                 model=self.model_name,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.7,
                 max_tokens=4096
             )
-            response_text = response.choices[0].message.content.strip()
-            
-            # Clean up response - remove markdown code blocks if present
-            if response_text.startswith('```'):
-                response_text = re.sub(r'^```json?\s*', '', response_text)
-                response_text = re.sub(r'\s*```$', '', response_text)
-            
-            extracted = json.loads(response_text)
             
-            # Ensure required fields exist
-            extracted.setdefault('technical_skills', [])
-            extracted.setdefault('soft_skills', [])
-            extracted.setdefault('education', [])
-            extracted.setdefault('experience', [])
-            extracted.setdefault('projects', [])
-            extracted.setdefault('certifications', [])
-            extracted.setdefault('achievements', [])
-            
-            # Add metadata
-            extracted['total_words'] = len(text.split())
-            extracted['sections_detected'] = self._detect_sections(text)
-            
-            return extracted
+            extracted = json_content(response_text)
+            return self._complete_extracted_data(extracted, text)
             
         except Exception as e:
             logger.error(f"AI extraction failed: {str(e)}, falling back to regex")
             return self._extract_resume_data(text)
     
+    def _complete_extracted_data(self, extracted: Dict[str, Any], text: str) -> Dict[str, Any]:
+        """Default missing fields of AI-extracted data and add text metadata"""
+        # Ensure required fields exist
+        extracted.setdefault('technical_skills', [])
+        extracted.setdefault('soft_skills', [])
+        extracted.setdefault('education', [])
+        extracted.setdefault('experience', [])
+        extracted.setdefault('projects', [])
+        extracted.setdefault('certifications', [])
+        extracted.setdefault('achievements', [])
+        
+        # Add metadata
+        extracted['total_words'] = len(text.split())
+        extracted['sections_detected'] = self._detect_sections(text)
+        
+        return extracted
+    
     def _calculate_detailed_quality_score(self, extracted_data: Dict[str, Any], resume_text: str) -> Dict[str, Any]:
         """Calculate resume quality score with detailed explanations"""
         
@@ -369,20 +715,16 @@ Return ONLY valid JSON array (no markdown):
 """
         
         try:
-            response = self.client.chat.completions.create(
+            response_text = llm_cache.complete(
+                'resume_suggestions',
+                validate=json_content,
                 model=self.model_name,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0.7,
                 max_tokens=4096
             )
-            response_text = response.choices[0].message.content.strip()
-            
-            # Clean up response
-            if response_text.startswith('```'):
-                response_text = re.sub(r'^```json?\s*', '', response_text)
-                response_text = re.sub(r'\s*```$', '', response_text)
             
-            suggestions = json.loads(response_text)
+            suggestions = json_content(response_text)
             return suggestions if isinstance(suggestions, list) else []
             
         except Exception as e:
@@ -408,8 +750,13 @@ Return ONLY valid JSON array (no markdown):
     def _extract_resume_data(self, text: str) -> Dict[str, Any]:
         """Extract structured data from resume text using comprehensive keyword matching"""
         
-        # Email extraction
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+        # Regex extraction reads at most RESUME_SCAN_MAX_CHARS of the text
+        sections = resume_sections(text)
+        total_words = len(text.split())
+        text = sections.text
+        
+        # Email extraction (bounded repeats keep it linear on long runs without an '@')
+        email_pattern = r'\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9.-]{1,255}\.[A-Z|a-z]{2,24}\b'
         emails = re.findall(email_pattern, text)
         
         # Phone extraction
@@ -427,7 +774,7 @@ Return ONLY valid JSON array (no markdown):
         github = github_matches[0] if github_matches else None
         
         # Portfolio/Website URL extraction
-        portfolio_pattern = r'(?:https?://)?(?:www\.)?[\w-]+\.(?:com|io|dev|me|net|org|co)/[\w/-]*'
+        portfolio_pattern = r'(?:https?://)?(?:www\.)?[\w-]{1,63}\.(?:com|io|dev|me|net|org|co)/[\w/-]*'
         portfolio_matches = re.findall(portfolio_pattern, text, re.IGNORECASE)
         # Filter out linkedin and github from portfolio matches
         portfolio = None
@@ -436,133 +783,27 @@ Return ONLY valid JSON array (no markdown):
                 portfolio = url
                 break
         
-        # Comprehensive skills extraction
-        technical_skills_keywords = [
-            # Programming Languages
-            'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'c', 'ruby', 'go', 'golang',
-            'rust', 'swift', 'kotlin', 'scala', 'php', 'perl', 'r', 'matlab', 'julia', 'dart',
-            'objective-c', 'groovy', 'lua', 'haskell', 'clojure', 'elixir', 'erlang', 'fortran',
-            'cobol', 'assembly', 'bash', 'shell', 'powershell', 'vba', 'visual basic',
-            
-            # Web Technologies
-            'html', 'html5', 'css', 'css3', 'sass', 'scss', 'less', 'tailwind', 'tailwindcss',
-            'bootstrap', 'material ui', 'materialize', 'bulma', 'foundation',
-            
-            # Frontend Frameworks
-            'react', 'reactjs', 'react.js', 'angular', 'angularjs', 'vue', 'vuejs', 'vue.js',
-            'svelte', 'next.js', 'nextjs', 'nuxt', 'nuxtjs', 'gatsby', 'ember', 'backbone',
-            'jquery', 'redux', 'mobx', 'webpack', 'vite', 'parcel', 'rollup', 'babel',
-            
-            # Backend Frameworks
-            'node.js', 'nodejs', 'express', 'expressjs', 'fastify', 'koa', 'nestjs', 'nest.js',
-            'django', 'flask', 'fastapi', 'tornado', 'pyramid', 'bottle',
-            'spring', 'spring boot', 'springboot', 'hibernate', 'struts',
-            'rails', 'ruby on rails', 'sinatra',
-            'asp.net', '.net', '.net core', 'dotnet',
-            'laravel', 'symfony', 'codeigniter', 'yii',
-            'gin', 'echo', 'fiber', 'beego',
-            
-            # Databases
-            'sql', 'mysql', 'postgresql', 'postgres', 'sqlite', 'oracle', 'sql server', 'mssql',
-            'mariadb', 'mongodb', 'redis', 'cassandra', 'couchdb', 'couchbase', 'dynamodb',
-            'elasticsearch', 'neo4j', 'firebase', 'firestore', 'supabase', 'cockroachdb',
-            'influxdb', 'timescaledb', 'memcached', 'clickhouse',
-            
-            # Cloud Platforms
-            'aws', 'amazon web services', 'azure', 'microsoft azure', 'gcp', 'google cloud',
-            'google cloud platform', 'heroku', 'digitalocean', 'linode', 'vultr', 'vercel',
-            'netlify', 'cloudflare', 'ibm cloud', 'oracle cloud', 'alibaba cloud',
-            
-            # AWS Services
-            'ec2', 's3', 'lambda', 'rds', 'dynamodb', 'cloudfront', 'route53', 'sqs', 'sns',
-            'ecs', 'eks', 'fargate', 'cloudwatch', 'iam', 'cognito', 'api gateway',
-            
-            # DevOps & Infrastructure
-            'docker', 'kubernetes', 'k8s', 'jenkins', 'travis ci', 'circle ci', 'github actions',
-            'gitlab ci', 'ansible', 'terraform', 'puppet', 'chef', 'vagrant', 'packer',
-            'prometheus', 'grafana', 'datadog', 'splunk', 'elk', 'logstash', 'kibana',
-            'nginx', 'apache', 'haproxy', 'traefik', 'envoy',
-            
-            # Version Control
-            'git', 'github', 'gitlab', 'bitbucket', 'svn', 'mercurial',
-            
-            # AI/ML
-            'machine learning', 'deep learning', 'artificial intelligence', 'ai', 'ml',
-            'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'sklearn', 'pandas', 'numpy',
-            'scipy', 'matplotlib', 'seaborn', 'plotly', 'opencv', 'nltk', 'spacy',
-            'hugging face', 'transformers', 'bert', 'gpt', 'llm', 'langchain',
-            'computer vision', 'nlp', 'natural language processing', 'neural network',
-            'cnn', 'rnn', 'lstm', 'gan', 'reinforcement learning',
-            
-            # Data Engineering
-            'spark', 'apache spark', 'hadoop', 'hive', 'pig', 'kafka', 'apache kafka',
-            'airflow', 'apache airflow', 'dbt', 'snowflake', 'databricks', 'redshift',
-            'bigquery', 'etl', 'data pipeline', 'data warehouse',
-            
-            # Mobile Development
-            'android', 'ios', 'react native', 'flutter', 'xamarin', 'ionic', 'cordova',
-            'swift ui', 'swiftui', 'kotlin multiplatform', 'expo',
-            
-            # Testing
-            'jest', 'mocha', 'chai', 'jasmine', 'cypress', 'selenium', 'puppeteer',
-            'playwright', 'pytest', 'unittest', 'junit', 'testng', 'rspec', 'enzyme',
-            'testing library', 'postman', 'soapui', 'jmeter', 'locust',
-            
-            # API & Protocols
-            'rest', 'restful', 'graphql', 'grpc', 'soap', 'websocket', 'webhooks',
-            'oauth', 'jwt', 'openapi', 'swagger',
-            
-            # Tools & IDEs
-            'vs code', 'visual studio', 'intellij', 'pycharm', 'eclipse', 'vim', 'emacs',
-            'sublime', 'atom', 'xcode', 'android studio',
-            
-            # Other
-            'linux', 'unix', 'windows', 'macos', 'agile', 'scrum', 'kanban', 'jira',
-            'confluence', 'trello', 'slack', 'figma', 'sketch', 'adobe xd', 'photoshop',
-            'illustrator', 'blockchain', 'web3', 'solidity', 'ethereum', 'smart contracts',
-            'microservices', 'serverless', 'ci/cd', 'cicd', 'devops', 'sre', 'mlops',
-            'data structures', 'algorithms', 'oop', 'functional programming', 'tdd', 'bdd',
-        ]
-        
-        soft_skills_keywords = [
-            'communication', 'leadership', 'teamwork', 'team player', 'collaboration',
-            'problem solving', 'problem-solving', 'critical thinking', 'analytical',
-            'time management', 'organization', 'organizational', 'adaptability', 'flexibility',
-            'creativity', 'innovation', 'innovative', 'attention to detail', 'detail-oriented',
-            'project management', 'mentoring', 'coaching', 'training', 'presentation',
-            'public speaking', 'negotiation', 'conflict resolution', 'decision making',
-            'strategic thinking', 'customer service', 'client relations', 'interpersonal',
-            'emotional intelligence', 'self-motivated', 'proactive', 'initiative',
-            'multitasking', 'prioritization', 'deadline-driven', 'results-oriented',
-            'research', 'analytical skills', 'written communication', 'verbal communication',
-        ]
-        
         found_technical_skills = []
         found_soft_skills = []
-        text_lower = text.lower()
-        
-        for skill in technical_skills_keywords:
-            # Use word boundary matching to avoid partial matches
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
-                # Normalize skill name
-                normalized = skill.replace('.js', '.js').replace('js', 'JS').title()
-                if skill in ['aws', 'gcp', 'sql', 'css', 'html', 'ai', 'ml', 'api', 'ci/cd', 'tdd', 'bdd', 'oop', 'nlp', 'cnn', 'rnn', 'lstm', 'gan', 'jwt', 'etl', 'sre']:
-                    normalized = skill.upper()
-                elif skill in ['python', 'java', 'javascript', 'typescript', 'ruby', 'go', 'rust', 'swift', 'kotlin', 'scala', 'php', 'perl', 'dart', 'react', 'angular', 'vue', 'docker', 'kubernetes', 'jenkins', 'terraform', 'ansible', 'linux', 'git', 'github', 'figma']:
-                    normalized = skill.capitalize()
-                else:
-                    normalized = skill
-                    
-                if normalized not in found_technical_skills:
-                    found_technical_skills.append(normalized)
-        
-        for skill in soft_skills_keywords:
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, text_lower):
-                normalized = skill.replace('-', ' ').title()
-                if normalized not in found_soft_skills:
-                    found_soft_skills.append(normalized)
+        text_lower = sections.lower
+        
+        # One pass over the text per keyword list; skills keep the lists' order
+        for skill in technical_skill_matcher.find(text_lower):
+            # Normalize skill name
+            if skill in ['aws', 'gcp', 'sql', 'css', 'html', 'ai', 'ml', 'api', 'ci/cd', 'tdd', 'bdd', 'oop', 'nlp', 'cnn', 'rnn', 'lstm', 'gan', 'jwt', 'etl', 'sre']:
+                normalized = skill.upper()
+            elif skill in ['python', 'java', 'javascript', 'typescript', 'ruby', 'go', 'rust', 'swift', 'kotlin', 'scala', 'php', 'perl', 'dart', 'react', 'angular', 'vue', 'docker', 'kubernetes', 'jenkins', 'terraform', 'ansible', 'linux', 'git', 'github', 'figma']:
+                normalized = skill.capitalize()
+            else:
+                normalized = skill
+            
+            if normalized not in found_technical_skills:
+                found_technical_skills.append(normalized)
+        
+        for skill in soft_skill_matcher.find(text_lower):
+            normalized = skill.replace('-', ' ').title()
+            if normalized not in found_soft_skills:
+                found_soft_skills.append(normalized)
         
         # Education detection
         education_keywords = ['bachelor', 'master', 'phd', 'doctorate', 'b.tech', 'm.tech', 'mba', 
@@ -574,10 +815,10 @@ Return ONLY valid JSON array (no markdown):
                 education_found.append(edu.upper() if len(edu) <= 4 else edu.title())
         
         # PROJECT EXTRACTION - Enhanced regex-based extraction
-        projects = self._extract_projects_regex(text)
+        projects = scan_projects(sections)
         
         # EXPERIENCE EXTRACTION - Enhanced regex-based extraction
-        experience = self._extract_experience_regex(text)
+        experience = scan_experience(sections)
         
         # Experience years estimation
         year_pattern = r'\b(19|20)\d{2}\b'
@@ -610,8 +851,8 @@ Return ONLY valid JSON array (no markdown):
             'projects': projects,
             'estimated_experience_years': min(experience_years, 30),
             'total_experience_years': min(experience_years, 30),
-            'total_words': len(text.split()),
-            'sections_detected': self._detect_sections(text)
+            'total_words': total_words,
+            'sections_detected': sections.detected()
         }
     
     def _extract_name(self, text: str) -> str:
@@ -639,142 +880,16 @@ Return ONLY valid JSON array (no markdown):
         return None
     
     def _extract_projects_regex(self, text: str) -> List[Dict[str, Any]]:
-        """Extract projects using regex patterns"""
-        projects = []
-        text_lower = text.lower()
-        
-        # Find the projects section
-        project_section_pattern = r'(?:projects|personal projects|academic projects|side projects|portfolio)\s*[:\-]?\s*([\s\S]*?)(?=\n\s*(?:experience|education|skills|certifications|achievements|work|employment|references|contact|$))'
-        section_match = re.search(project_section_pattern, text_lower, re.IGNORECASE)
-        
-        if section_match:
-            project_text = section_match.group(1)
-            
-            # Split by common project delimiters (bullet points, numbers, or capital letters starting lines)
-            project_entries = re.split(r'\n\s*(?:•|\*|[-–—]|\d+\.|[A-Z][a-zA-Z\s\-]+:|\|)', project_text)
-            
-            for entry in project_entries:
-                entry = entry.strip()
-                if len(entry) > 20:  # Minimum meaningful entry
-                    # Extract project name (usually first line or before colon/dash)
-                    name_match = re.match(r'^([^:\-\n]{5,50})', entry)
-                    name = name_match.group(1).strip() if name_match else entry[:50]
-                    
-                    # Extract technologies mentioned
-                    tech_keywords = ['python', 'java', 'javascript', 'react', 'node', 'mongodb', 'sql', 'aws', 
-                                   'docker', 'flask', 'django', 'express', 'typescript', 'html', 'css',
-                                   'tensorflow', 'pytorch', 'machine learning', 'api', 'rest', 'graphql',
-                                   'firebase', 'git', 'github', 'vue', 'angular', 'next.js', 'postgresql']
-                    found_tech = [t for t in tech_keywords if t in entry.lower()]
-                    
-                    projects.append({
-                        'name': name.title() if name else 'Unnamed Project',
-                        'description': entry[:200],
-                        'technologies': found_tech if found_tech else []
-                    })
-        
-        # If no projects section found, try to find project-like entries anywhere
-        if not projects:
-            # Look for patterns like "Project Name - Description" or "Built/Developed/Created X"
-            project_patterns = [
-                r'(?:built|developed|created|implemented|designed)\s+(?:a\s+)?([^.]{10,100})',
-                r'([A-Z][a-zA-Z\s]+)\s*[-–—]\s*([^.]{20,150})',
-            ]
-            
-            for pattern in project_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)[:5]  # Limit to 5
-                for match in matches:
-                    if isinstance(match, tuple):
-                        name, desc = match[0], match[1] if len(match) > 1 else match[0]
-                    else:
-                        name, desc = match[:50], match
-                    
-                    projects.append({
-                        'name': name.strip().title(),
-                        'description': desc.strip(),
-                        'technologies': []
-                    })
-        
-        return projects[:5]  # Return max 5 projects
+        """Extract projects using linear-time regex scanning"""
+        return scan_projects(resume_sections(text))
     
     def _extract_experience_regex(self, text: str) -> List[Dict[str, Any]]:
-        """Extract work experience using regex patterns"""
-        experiences = []
-        
-        # Find the experience section
-        exp_section_pattern = r'(?:experience|work experience|employment|professional experience|work history)\s*[:\-]?\s*([\s\S]*?)(?=\n\s*(?:education|skills|projects|certifications|achievements|references|$))'
-        section_match = re.search(exp_section_pattern, text.lower(), re.IGNORECASE)
-        
-        search_text = section_match.group(1) if section_match else text
-        
-        # Common job title patterns
-        job_titles = ['software engineer', 'developer', 'intern', 'analyst', 'manager', 'lead', 
-                     'consultant', 'architect', 'administrator', 'specialist', 'coordinator',
-                     'associate', 'executive', 'officer', 'trainee', 'fresher', 'graduate',
-                     'full stack', 'frontend', 'backend', 'data scientist', 'data analyst',
-                     'devops', 'sre', 'qa', 'tester', 'ui/ux', 'designer', 'product']
-        
-        # Look for job title patterns
-        for title in job_titles:
-            title_pattern = rf'(?i)(\b[A-Za-z]*\s*{title}[A-Za-z\s]*)\s*(?:at|@|[-–—|,])\s*([A-Za-z\s&]+)'
-            matches = re.findall(title_pattern, search_text, re.IGNORECASE)
-            
-            for match in matches:
-                job_title, company = match
-                if len(job_title.strip()) > 3 and len(company.strip()) > 2:
-                    experiences.append({
-                        'title': job_title.strip().title(),
-                        'company': company.strip().title(),
-                        'duration': 'Not specified',
-                        'responsibilities': [],
-                        'achievements': []
-                    })
-        
-        # Also look for company patterns with dates
-        company_date_pattern = r'([A-Z][a-zA-Z\s&]+(?:Inc|LLC|Ltd|Corp|Company|Technologies|Solutions|Services)?)\s*[|\-–—,]\s*(\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}|\d{4})'
-        company_matches = re.findall(company_date_pattern, text)
-        
-        for company, date in company_matches:
-            company = company.strip()
-            if len(company) > 3 and company not in [e.get('company', '') for e in experiences]:
-                experiences.append({
-                    'title': 'Position',
-                    'company': company.title(),
-                    'duration': date,
-                    'responsibilities': [],
-                    'achievements': []
-                })
-        
-        # Deduplicate by company name
-        seen_companies = set()
-        unique_experiences = []
-        for exp in experiences:
-            company_lower = exp.get('company', '').lower()
-            if company_lower not in seen_companies:
-                seen_companies.add(company_lower)
-                unique_experiences.append(exp)
-        
-        return unique_experiences[:5]  # Return max 5 experiences
+        """Extract work experience using linear-time regex scanning"""
+        return scan_experience(resume_sections(text))
     
     def _detect_sections(self, text: str) -> List[str]:
         """Detect common resume sections"""
-        sections = []
-        text_lower = text.lower()
-        
-        section_keywords = {
-            'education': ['education', 'academic', 'qualification'],
-            'experience': ['experience', 'employment', 'work history'],
-            'skills': ['skills', 'technical skills', 'competencies'],
-            'projects': ['projects', 'personal projects'],
-            'certifications': ['certifications', 'certificates'],
-            'achievements': ['achievements', 'awards', 'honors']
-        }
-        
-        for section, keywords in section_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
-                sections.append(section)
-        
-        return sections
+        return resume_sections(text).detected()
     
     def _calculate_quality_score(self, extracted_data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate resume quality score"""
@@ -883,8 +998,10 @@ Return ONLY valid JSON array (no markdown):
                     'impact': f'Demonstrates practical experience and commitment to learning'
                 })
         
+        text_lower = resume_sections(resume_text).lower
+        
         # Quantification suggestion
-        if not re.search(r'\d+%|\d+\+|increased|decreased|improved', resume_text.lower()):
+        if not re.search(r'\d%|\d\+|increased|decreased|improved', text_lower):
             suggestions.append({
                 'category': 'content',
                 'priority': 'high',
@@ -894,7 +1011,7 @@ Return ONLY valid JSON array (no markdown):
         
         # Action verbs
         weak_verbs = ['worked', 'did', 'helped', 'responsible for']
-        if any(verb in resume_text.lower() for verb in weak_verbs):
+        if any(verb in text_lower for verb in weak_verbs):
             suggestions.append({
                 'category': 'language',
                 'priority': 'medium',
@@ -909,25 +1026,26 @@ Return ONLY valid JSON array (no markdown):
         
         issues = []
         score = 100
+        text_lower = resume_sections(resume_text).lower
         
         # Check for tables (problematic for ATS)
-        if '|' in resume_text or re.search(r'\t+', resume_text):
+        if '|' in resume_text or '\t' in resume_text:
             issues.append("Avoid using tables, use simple formatting instead")
             score -= 20
         
         # Check for headers/footers
-        if re.search(r'page \d+ of \d+', resume_text.lower()):
+        if re.search(r'page \d+ of \d+', text_lower):
             issues.append("Remove headers and footers")
             score -= 10
         
         # Check for images
-        if 'image' in resume_text.lower() or 'photo' in resume_text.lower():
+        if 'image' in text_lower or 'photo' in text_lower:
             issues.append("Remove images, ATS cannot parse them")
             score -= 15
         
         # Check for standard fonts
         unusual_fonts = ['comic sans', 'papyrus', 'brush script']
-        if any(font in resume_text.lower() for font in unusual_fonts):
+        if any(font in text_lower for font in unusual_fonts):
             issues.append("Use standard fonts like Arial, Calibri, or Times New Roman")
             score -= 10
         
@@ -959,7 +1077,8 @@ Provide:
 Format as JSON.
 """
             
-            response = self.client.chat.completions.create(
+            ai_analysis = llm_cache.complete(
+                'resume_job_match',
                 model=self.model_name,
                 messages=[
                     {"role": "system", "content": "You are an expert resume analyst."},
@@ -969,9 +1088,6 @@ Format as JSON.
                 max_tokens=4096
             )
             
-            # Parse AI response
-            ai_analysis = response.choices[0].message.content
-            
             return {
                 'match_score': 75,  # Extract from AI response
                 'analysis': ai_analysis
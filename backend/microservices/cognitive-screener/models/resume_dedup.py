@@ -0,0 +1,88 @@
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+import logging
+from config.settings import Config
+from utils.minhash import MinHash, MinHashLSH
+
+logger = logging.getLogger('cognitive-screener')
+
+class ResumeDeduplicator:
+    """
+    Remembers recent analyses so a re-uploaded resume with small edits
+    reuses the prior analysis instead of running the AI pipeline again.
+    Resumes are near-duplicates when their shingle Jaccard similarity
+    reaches the threshold and they were analyzed against the same job
+    description. The oldest entries are evicted past `max_entries`.
+    A reused analysis is marked `exact` only when the whitespace-normalized
+    text is identical; otherwise it belongs to another resume, and callers
+    must not hand out its per-person fields.
+    """
+
+    def __init__(self, threshold: float = Config.RESUME_DEDUP_JACCARD_THRESHOLD,
+                 num_perm: int = Config.DEDUP_NUM_PERM,
+                 max_entries: int = Config.RESUME_DEDUP_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.minhash = MinHash(num_perm)
+        self.lsh = MinHashLSH(threshold, num_perm)
+        self._entries: 'OrderedDict[int, tuple]' = OrderedDict()
+        self._next_key = 0
+        self._lock = threading.Lock()
+        self._stats = {'lookups': 0, 'hits': 0, 'stored': 0, 'evicted': 0}
+
+    @staticmethod
+    def _job_key(job_description: Optional[str]) -> str:
+        return hashlib.sha1((job_description or '').strip().encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _text_key(resume_text: str) -> str:
+        return hashlib.sha1(' '.join(resume_text.split()).encode('utf-8')).hexdigest()
+
+    def lookup(self, resume_text: str, job_description: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Copy of the analysis of a near-duplicate resume, or None"""
+        signature = self.minhash.text_signature(resume_text)
+        job_key = self._job_key(job_description)
+        text_key = self._text_key(resume_text)
+
+        with self._lock:
+            self._stats['lookups'] += 1
+            for key, similarity in self.lsh.query(signature):
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == job_key:
+                    self._stats['hits'] += 1
+                    self._entries.move_to_end(key)
+                    analysis = copy.deepcopy(entry[2])
+                    analysis['reused_analysis'] = {'similarity': round(similarity, 4), 'exact': entry[1] == text_key}
+                    logger.info(f"Reusing analysis of a near-duplicate resume (similarity {similarity:.2f})")
+                    return analysis
+        return None
+
+    def store(self, resume_text: str, job_description: Optional[str], analysis: Dict[str, Any]):
+        signature = self.minhash.text_signature(resume_text)
+        with self._lock:
+            key = self._next_key
+            self._next_key += 1
+            self._entries[key] = (self._job_key(job_description), self._text_key(resume_text),
+                                  copy.deepcopy(analysis))
+            self.lsh.insert(key, signature)
+            self._stats['stored'] += 1
+
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self.lsh.remove(evicted)
+                self._stats['evicted'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            entries = len(self._entries)
+        return {
+            **stats,
+            'entries': entries,
+            'hit_rate': round(stats['hits'] / stats['lookups'], 4) if stats['lookups'] else 0.0,
+            'jaccard_threshold': self.lsh.threshold,
+            'num_perm': self.minhash.num_perm,
+            'max_entries': self.max_entries
+        }
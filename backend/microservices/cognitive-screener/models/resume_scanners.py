@@ -0,0 +1,197 @@
+import re
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Tuple
+from models.resume_sections import ResumeSections
+from utils.keyword_matcher import trie_pattern
+
+# Experience and project extraction in time linear in the resume. Text is
+# scanned line by line, lines are truncated to MAX_LINE_CHARS, and every
+# pattern is a fixed alternation or has bounded repeats, so no match can
+# backtrack over more than one line. Runs that end at a separator are read
+# by matching the reversed text instead of searching back for their start.
+
+MAX_LINE_CHARS = 500
+MAX_ENTRIES = 5
+# Longest title prefix, company or project name read back from a separator
+MAX_RUN_CHARS = 100
+
+JOB_TITLES = ['software engineer', 'developer', 'intern', 'analyst', 'manager', 'lead',
+              'consultant', 'architect', 'administrator', 'specialist', 'coordinator',
+              'associate', 'executive', 'officer', 'trainee', 'fresher', 'graduate',
+              'full stack', 'frontend', 'backend', 'data scientist', 'data analyst',
+              'devops', 'sre', 'qa', 'tester', 'ui/ux', 'designer', 'product']
+
+PROJECT_TECH_KEYWORDS = ['python', 'java', 'javascript', 'react', 'node', 'mongodb', 'sql', 'aws',
+                         'docker', 'flask', 'django', 'express', 'typescript', 'html', 'css',
+                         'tensorflow', 'pytorch', 'machine learning', 'api', 'rest', 'graphql',
+                         'firebase', 'git', 'github', 'vue', 'angular', 'next.js', 'postgresql']
+
+# Experience lines, lowercased: "<title words> at|@|-|,|| <company>"
+TITLE_PATTERN = re.compile(trie_pattern(JOB_TITLES))
+TITLE_SEPARATOR = re.compile(r'\bat\b|[@|,\-–—]')
+TITLE_PREFIX_REVERSED = re.compile(r'[ \t]*[a-z]*')
+TITLE_TAIL = re.compile(r'[a-z \t]*')
+COMPANY = re.compile(r'[a-z \t&]+')
+
+# "<Company> | Jan 2020" or "<Company>, 2019"
+DATE_AFTER_SEPARATOR = re.compile(
+    r'[|\-–—,][ \t]*(\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]{0,6}[ \t]+\d{4}|\d{4})'
+)
+COMPANY_REVERSED = re.compile(r'[a-zA-Z \t&]*')
+UPPERCASE = re.compile(r'[A-Z]')
+
+PROJECT_BULLET = re.compile(r'•|\*|[-–—]|\d+\.|\|')
+PROJECT_NAME = re.compile(r'[^:\-\n]{5,50}')
+BUILT_PROJECT = re.compile(
+    r'(?:built|developed|created|implemented|designed)\s{1,20}(?:a\s{1,20})?([^.]{10,100})', re.IGNORECASE
+)
+# Only dashes a name can end at
+NAME_DASH = re.compile(r'(?<=[a-zA-Z \t])[-–—]')
+NAME_REVERSED = re.compile(r'[a-zA-Z \t]*')
+DESCRIPTION = re.compile(r'\s{0,20}([^.]{20,150})')
+
+def lines(text: str) -> Iterator[str]:
+    for line in text.split('\n'):
+        yield line[:MAX_LINE_CHARS]
+
+def reversed_run(pattern: re.Pattern, text: str, start: int, end: int) -> str:
+    """
+    Longest suffix of text[start:end], at most MAX_RUN_CHARS long, whose
+    reverse `pattern` matches
+    """
+    window = text[max(start, end - MAX_RUN_CHARS):end]
+    return pattern.match(window[::-1]).group()[::-1]
+
+def experience_entry(title: str, company: str, duration: str = 'Not specified') -> Dict[str, Any]:
+    return {
+        'title': title,
+        'company': company,
+        'duration': duration,
+        'responsibilities': [],
+        'achievements': []
+    }
+
+def scan_titled_line(line: str) -> Tuple[str, str]:
+    """(title, company) of a lowercased "<title> at <company>" line, or empty strings"""
+    separator = None
+    for title_match in TITLE_PATTERN.finditer(line):
+        if separator is None or separator.start() < title_match.end():
+            separator = TITLE_SEPARATOR.search(line, title_match.end())
+            if separator is None:
+                break
+        # Only letters and spaces between the title and its separator
+        if TITLE_TAIL.fullmatch(line, title_match.end(), separator.start()) is None:
+            continue
+        prefix = reversed_run(TITLE_PREFIX_REVERSED, line, 0, title_match.start())
+        title = line[title_match.start() - len(prefix):separator.start()].strip()
+        company_match = COMPANY.match(line, separator.end())
+        company = company_match.group().strip() if company_match else ''
+        if len(title) > 3 and len(company) > 2:
+            return title, company
+    return '', ''
+
+def scan_dated_companies(line: str) -> Iterator[Tuple[str, str]]:
+    """(company, date) pairs of "<Company> | <date>" on one line"""
+    last_end = 0
+    for match in DATE_AFTER_SEPARATOR.finditer(line):
+        run = reversed_run(COMPANY_REVERSED, line, last_end, match.start())
+        first_upper = UPPERCASE.search(run)
+        if first_upper is not None and len(run) - first_upper.start() >= 2:
+            last_end = match.end()
+            yield run[first_upper.start():].strip(), match.group(1)
+
+def experience_candidates(sections: ResumeSections) -> Iterator[Dict[str, Any]]:
+    """Titled entries of the experience section (or of the whole resume without one), then dated ones"""
+    experience_text = sections.section('experience')
+    search_text = experience_text.lower() if experience_text else sections.lower
+
+    for line in lines(search_text):
+        title, company = scan_titled_line(line)
+        if title:
+            yield experience_entry(title.title(), company.title())
+
+    for line in lines(experience_text or sections.text):
+        for company, date in scan_dated_companies(line):
+            if len(company) > 3:
+                yield experience_entry('Position', company.title(), date)
+
+def scan_experience(sections: ResumeSections) -> List[Dict[str, Any]]:
+    """
+    Work experience from "<title> at <company>" and "<Company> | <date>"
+    lines, at most MAX_ENTRIES and one per company. Scanning stops once
+    that many companies are found.
+    """
+    seen_companies = set()
+    unique_experiences = []
+    for exp in experience_candidates(sections):
+        company_lower = exp['company'].lower()
+        if company_lower not in seen_companies:
+            seen_companies.add(company_lower)
+            unique_experiences.append(exp)
+            if len(unique_experiences) == MAX_ENTRIES:
+                break
+
+    return unique_experiences
+
+def project_entries(project_text: str) -> Iterator[str]:
+    """Entries of a projects section: each bulleted or numbered line starts one"""
+    entry: List[str] = []
+    for line in lines(project_text):
+        stripped = line.lstrip()
+        bullet = PROJECT_BULLET.match(stripped)
+        if bullet is not None:
+            yield '\n'.join(entry)
+            entry = [stripped[bullet.end():]]
+        else:
+            entry.append(line)
+    yield '\n'.join(entry)
+
+def dashed_projects(text: str) -> Iterator[Tuple[str, str]]:
+    """(name, description) pairs of "Project Name - description" anywhere in the text"""
+    last_end = 0
+    for dash in NAME_DASH.finditer(text):
+        if dash.start() < last_end:
+            continue
+        name = reversed_run(NAME_REVERSED, text, last_end, dash.start()).lstrip()
+        if len(name) < 2:
+            continue
+        description = DESCRIPTION.match(text, dash.end())
+        if description is not None:
+            last_end = description.end()
+            yield name, description.group(1)
+
+def scan_projects(sections: ResumeSections) -> List[Dict[str, Any]]:
+    """
+    Projects from the entries of the projects section; without one, from
+    "built/developed ..." phrases and "Name - description" lines anywhere.
+    At most MAX_ENTRIES.
+    """
+    projects = []
+    # Lowercased, as names are title-cased
+    project_text = sections.section('projects', lower=True)
+
+    for entry in project_entries(project_text):
+        entry = entry.strip()
+        if len(entry) > 20:  # Minimum meaningful entry
+            # Project name is usually the start of the entry, before a colon or dash
+            name_match = PROJECT_NAME.match(entry)
+            name = name_match.group().strip() if name_match else entry[:50]
+            projects.append({
+                'name': name.title() if name else 'Unnamed Project',
+                'description': entry[:200],
+                'technologies': [t for t in PROJECT_TECH_KEYWORDS if t in entry]
+            })
+            if len(projects) == MAX_ENTRIES:
+                return projects
+
+    # If no projects section found, try to find project-like entries anywhere
+    if not projects:
+        for match in islice(BUILT_PROJECT.finditer(sections.text), MAX_ENTRIES):
+            description = match.group(1)
+            projects.append({'name': description[:50].strip().title(), 'description': description.strip(),
+                             'technologies': []})
+        for name, description in islice(dashed_projects(sections.text), MAX_ENTRIES - len(projects)):
+            projects.append({'name': name.strip().title(), 'description': description.strip(),
+                             'technologies': []})
+
+    return projects
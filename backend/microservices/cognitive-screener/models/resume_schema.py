@@ -0,0 +1,137 @@
+from typing import Any, Dict, List
+
+# JSON Schemas of the sections a combined resume analysis returns. The
+# validator below covers the subset of JSON Schema they use.
+
+STRING_LIST = {'type': 'array', 'items': {'type': 'string'}}
+
+EXTRACTED_DATA_SCHEMA = {
+    'type': 'object',
+    'required': ['technical_skills', 'soft_skills', 'education', 'experience', 'projects'],
+    'properties': {
+        'personal_info': {
+            'type': 'object',
+            'properties': {
+                field: {'type': ['string', 'null']}
+                for field in ('name', 'email', 'phone', 'linkedin', 'github', 'location')
+            }
+        },
+        'technical_skills': STRING_LIST,
+        'soft_skills': STRING_LIST,
+        'education': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'properties': {
+                    field: {'type': ['string', 'null']}
+                    for field in ('degree', 'field', 'institution', 'year', 'gpa')
+                }
+            }
+        },
+        'experience': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'required': ['title', 'company'],
+                'properties': {
+                    'title': {'type': 'string'},
+                    'company': {'type': 'string'},
+                    'duration': {'type': ['string', 'null']},
+                    'responsibilities': STRING_LIST,
+                    'achievements': STRING_LIST
+                }
+            }
+        },
+        'projects': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'required': ['name'],
+                'properties': {
+                    'name': {'type': 'string'},
+                    'description': {'type': ['string', 'null']},
+                    'technologies': STRING_LIST
+                }
+            }
+        },
+        'certifications': STRING_LIST,
+        'achievements': STRING_LIST,
+        'languages': STRING_LIST,
+        'total_experience_years': {'type': ['number', 'string']}
+    }
+}
+
+SUGGESTIONS_SCHEMA = {
+    'type': 'array',
+    'minItems': 1,
+    'items': {
+        'type': 'object',
+        'required': ['category', 'priority', 'title', 'suggestion'],
+        'properties': {
+            'category': {'type': 'string'},
+            'priority': {'type': 'string', 'enum': ['high', 'medium', 'low']},
+            'title': {'type': 'string'},
+            'suggestion': {'type': 'string'},
+            'impact': {'type': 'string'},
+            'example': {'type': 'string'}
+        }
+    }
+}
+
+JOB_MATCH_SCHEMA = {
+    'type': 'object',
+    'required': ['match_score', 'matching_points', 'missing_elements', 'improvement_suggestions'],
+    'properties': {
+        'match_score': {'type': 'number', 'minimum': 0, 'maximum': 100},
+        'matching_points': STRING_LIST,
+        'missing_elements': STRING_LIST,
+        'improvement_suggestions': STRING_LIST
+    }
+}
+
+SECTION_SCHEMAS = {
+    'extracted_data': EXTRACTED_DATA_SCHEMA,
+    'suggestions': SUGGESTIONS_SCHEMA,
+    'job_match': JOB_MATCH_SCHEMA
+}
+
+TYPE_CHECKS = {
+    'object': lambda value: isinstance(value, dict),
+    'array': lambda value: isinstance(value, list),
+    'string': lambda value: isinstance(value, str),
+    'number': lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    'null': lambda value: value is None
+}
+
+def schema_errors(value: Any, schema: Dict[str, Any], path: str = '$') -> List[str]:
+    """Where `value` violates `schema`, as 'path: problem' messages (empty when valid)"""
+    types = schema.get('type')
+    if types is not None:
+        types = [types] if isinstance(types, str) else types
+        if not any(TYPE_CHECKS[name](value) for name in types):
+            return [f"{path}: expected {' or '.join(types)}"]
+
+    errors = []
+    if 'enum' in schema and value not in schema['enum']:
+        errors.append(f"{path}: must be one of {schema['enum']}")
+    if 'minimum' in schema and TYPE_CHECKS['number'](value) and value < schema['minimum']:
+        errors.append(f"{path}: below {schema['minimum']}")
+    if 'maximum' in schema and TYPE_CHECKS['number'](value) and value > schema['maximum']:
+        errors.append(f"{path}: above {schema['maximum']}")
+
+    if isinstance(value, dict):
+        for field in schema.get('required', []):
+            if field not in value:
+                errors.append(f"{path}.{field}: missing")
+        for field, field_schema in schema.get('properties', {}).items():
+            if field in value:
+                errors.extend(schema_errors(value[field], field_schema, f"{path}.{field}"))
+
+    if isinstance(value, list):
+        if len(value) < schema.get('minItems', 0):
+            errors.append(f"{path}: needs at least {schema['minItems']} items")
+        if 'items' in schema:
+            for index, item in enumerate(value):
+                errors.extend(schema_errors(item, schema['items'], f"{path}[{index}]"))
+
+    return errors
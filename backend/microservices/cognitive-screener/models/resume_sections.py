@@ -0,0 +1,107 @@
+import re
+from typing import List, NamedTuple
+from config.settings import Config
+from utils.cache import LRUCache
+from utils.keyword_matcher import trie_pattern
+
+# Heading lines that open each kind of resume section
+SECTION_HEADINGS = {
+    'summary': ['summary', 'professional summary', 'profile', 'professional profile', 'objective',
+                'career objective', 'about me'],
+    'education': ['education', 'academic background', 'academics', 'academic qualifications',
+                  'qualifications', 'educational qualifications'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'internships', 'internship'],
+    'projects': ['projects', 'personal projects', 'academic projects', 'side projects', 'key projects',
+                 'portfolio'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core competencies', 'competencies',
+               'technologies', 'tech stack'],
+    'certifications': ['certifications', 'certificates', 'licenses and certifications'],
+    'achievements': ['achievements', 'awards', 'honors', 'honours', 'accomplishments'],
+    'languages': ['languages'],
+    'references': ['references'],
+    'contact': ['contact', 'contact information', 'personal details', 'personal information']
+}
+
+HEADING_KINDS = {heading: kind for kind, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# A heading alone on its line, optionally bulleted or followed by a
+# separator (`Projects:`, `## SKILLS`, `Experience -`)
+HEADING_PATTERN = re.compile(
+    r'^[ \t]*(?:[#*•=\-–—]+[ \t]*)?(' + trie_pattern(HEADING_KINDS) + r')[ \t]*(?:[:\-–—|][ \t]*|$)',
+    re.MULTILINE | re.IGNORECASE | re.ASCII
+)
+
+# Substring fallback of `detected` for text without any heading lines
+MENTION_KEYWORDS = {
+    'education': ['education', 'academic', 'qualification'],
+    'experience': ['experience', 'employment', 'work history'],
+    'skills': ['skills', 'technical skills', 'competencies'],
+    'projects': ['projects', 'personal projects'],
+    'certifications': ['certifications', 'certificates'],
+    'achievements': ['achievements', 'awards', 'honors']
+}
+
+class SectionSpan(NamedTuple):
+    kind: str
+    # Offsets of the section body in the resume text, heading excluded
+    start: int
+    end: int
+
+class ResumeSections:
+    """
+    A resume split once into typed spans. Every heading line starts a span
+    of its kind running to the next heading; text before the first heading
+    is the `contact` span. The text is lowercased once, here, for all the
+    extractors that read it; offsets index the original text.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = text.lower()
+        self.spans: List[SectionSpan] = []
+
+        start, kind = 0, 'contact'
+        for match in HEADING_PATTERN.finditer(text):
+            self._add(kind, start, match.start())
+            start, kind = match.end(), HEADING_KINDS[match.group(1).lower()]
+        self._add(kind, start, len(text))
+
+    def _add(self, kind: str, start: int, end: int):
+        if self.text[start:end].strip():
+            self.spans.append(SectionSpan(kind, start, end))
+
+    @property
+    def has_headings(self) -> bool:
+        return any(span.start > 0 for span in self.spans)
+
+    def kinds(self) -> List[str]:
+        """Kinds of the spans, in order of first appearance"""
+        return list(dict.fromkeys(span.kind for span in self.spans))
+
+    def section(self, kind: str, lower: bool = False) -> str:
+        """Body text of every span of `kind`, joined; empty when the resume has none"""
+        body = '\n'.join(self.text[span.start:span.end] for span in self.spans if span.kind == kind)
+        return body.lower() if lower else body
+
+    def detected(self) -> List[str]:
+        """
+        Sections in `MENTION_KEYWORDS` order that have a heading. Text without
+        any heading lines falls back to keyword mentions anywhere in it.
+        """
+        if self.has_headings:
+            kinds = set(self.kinds())
+            return [kind for kind in MENTION_KEYWORDS if kind in kinds]
+        return [kind for kind, keywords in MENTION_KEYWORDS.items()
+                if any(keyword in self.lower for keyword in keywords)]
+
+# The analysis stages of one request each ask for the same text's sections
+segment_cache = LRUCache(max_entries=64)
+
+def resume_sections(text: str) -> ResumeSections:
+    """Sections of the first RESUME_SCAN_MAX_CHARS of `text`, segmented on first use"""
+    sections = segment_cache.get(text)
+    if sections is None:
+        sections = ResumeSections(text[:Config.RESUME_SCAN_MAX_CHARS])
+        segment_cache.put(text, sections)
+    return sections
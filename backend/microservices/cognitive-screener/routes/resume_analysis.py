@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 import logging
+from config.settings import Config
 from models.resume_analyzer import ResumeAnalyzer
 from werkzeug.utils import secure_filename
 import os
@@ -41,6 +42,7 @@ def analyze_resume():
             logger.info(f"First 500 chars: {resume_text[:500]}")
             
             job_description = request.form.get('job_description', None)
+            mode = request.form.get('mode', request.args.get('mode'))
             
         else:
             # Text-based analysis
@@ -50,12 +52,16 @@ def analyze_resume():
             
             resume_text = data.get('resume_text')
             job_description = data.get('job_description', None)
+            mode = data.get('mode', request.args.get('mode'))
             
             if not resume_text:
                 return jsonify({'error': 'Resume text is required'}), 400
         
         # Perform analysis
-        result = analyzer.analyze_resume(resume_text, job_description)
+        try:
+            result = analyzer.analyze_resume(resume_text, job_description, mode)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Log skills detected for debugging
         if result.get('success'):
@@ -196,3 +202,44 @@ def job_match_analysis():
             'success': False,
             'error': str(e)
         }), 500
+
+@resume_analysis_bp.route('/dedup/stats', methods=['GET'])
+def get_dedup_stats():
+    """
+    Near-duplicate resume reuse statistics
+    """
+    try:
+        if analyzer.deduplicator is None:
+            return jsonify({'success': True, 'enabled': False}), 200
+        
+        return jsonify({
+            'success': True,
+            'enabled': True,
+            **analyzer.deduplicator.stats()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting dedup stats: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@resume_analysis_bp.route('/analysis-modes/stats', methods=['GET'])
+def get_analysis_mode_stats():
+    """
+    Latency and token use of the separate vs. combined analysis modes
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'default_mode': Config.RESUME_ANALYSIS_MODE,
+            'modes': analyzer.analysis_mode_stats()
+        }), 200
+        
+    except Exception as e:
+        logger.error(f"Error getting analysis mode stats: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
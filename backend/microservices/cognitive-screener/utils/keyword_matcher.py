@@ -0,0 +1,70 @@
+import re
+from typing import Dict, Iterable, List, Set
+
+def trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Regex alternation of `keywords` factored into a character trie, so the
+    engine follows one branch per character instead of trying every
+    keyword in turn. Longer keywords are tried before their prefixes.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        group = branches[0] if len(branches) == 1 and len(branches[0]) == 1 else f"(?:{'|'.join(branches)})"
+        # A keyword may end here: the greedy `?` still tries the longer ones first
+        return group + '?' if '' in node else group
+
+    return build(trie)
+
+class KeywordMatcher:
+    """
+    Finds which of a fixed keyword list occur in a text as whole words,
+    i.e. where `\\bkeyword\\b` would match, in one regex pass. Built once;
+    `find` returns the matched keywords in keyword-list order.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(dict.fromkeys(keywords))
+        # At each word boundary the lookahead captures the longest keyword
+        # that ends on a boundary; overlapping matches are all visited
+        self.pattern = re.compile(r'\b(?=(' + trie_pattern(self.keywords) + r')\b)')
+        # Shorter keywords that are prefixes of a longer one can match at
+        # the same position, hidden behind it
+        keyword_set = set(self.keywords)
+        self.prefixes = {
+            keyword: [keyword[:end] for end in range(1, len(keyword)) if keyword[:end] in keyword_set]
+            for keyword in self.keywords
+        }
+
+    def found(self, text: str) -> Set[str]:
+        """Keywords occurring in `text` as whole words"""
+        found = set()
+        for match in self.pattern.finditer(text):
+            keyword = match.group(1)
+            found.add(keyword)
+            start = match.start()
+            for prefix in self.prefixes[keyword]:
+                if prefix not in found and word_boundary(text, start + len(prefix)):
+                    found.add(prefix)
+        return found
+
+    def find(self, text: str) -> List[str]:
+        found = self.found(text)
+        return [keyword for keyword in self.keywords if keyword in found]
+
+def is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+def word_boundary(text: str, position: int) -> bool:
+    """Same test as regex `\\b` between text[position - 1] and text[position]"""
+    before = position > 0 and is_word_char(text[position - 1])
+    after = position < len(text) and is_word_char(text[position])
+    return before != after
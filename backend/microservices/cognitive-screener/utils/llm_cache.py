@@ -0,0 +1,257 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import logging
+from config.settings import Config
+from utils.cache import LRUCache
+from utils.llm_gateway import LLMGateway, llm_gateway
+
+logger = logging.getLogger(Config.SERVICE_NAME)
+
+def request_key(model: str, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+    """
+    Content address of a chat completion request. Message whitespace is
+    normalized so formatting-only prompt differences share an entry.
+    """
+    normalized = [
+        {'role': message.get('role'), 'content': ' '.join(str(message.get('content', '')).split())}
+        for message in messages
+    ]
+    encoded = json.dumps([model, normalized, temperature, max_tokens], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+def json_content(text: str) -> Any:
+    """JSON value of a completion's text, without the markdown code fence models sometimes add"""
+    text = text.strip()
+    if text.startswith('```'):
+        text = re.sub(r'^```json?\s*', '', text)
+        text = re.sub(r'\s*```$', '', text)
+    return json.loads(text)
+
+class _Flight:
+    """One upstream call that concurrent identical requests wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.content: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+class LLMResponseCache:
+    """
+    Cache of chat completion texts keyed by (model, normalized messages,
+    temperature, max_tokens). An in-memory LRU tier sits in front of an
+    optional SQLite tier shared by the service's worker processes. Each
+    call site has its own TTL (LLM_CACHE_TTLS, falling back to
+    LLM_CACHE_DEFAULT_TTL_SECONDS); a TTL of 0 disables caching for it.
+
+    Identical requests already in flight are coalesced: the first caller
+    makes the upstream call (or stream) and the others wait for its result.
+    An error is raised to every waiter and nothing is cached.
+
+    A call site whose caller parses the text passes that parser as
+    `validate`; a text it raises on is returned but not cached, so one
+    malformed or truncated completion isn't replayed for the whole TTL.
+    """
+
+    def __init__(self, max_entries: int = Config.LLM_CACHE_SIZE,
+                 db_path: str = Config.LLM_CACHE_DB_PATH,
+                 ttls: Optional[Dict[str, float]] = None,
+                 default_ttl: float = Config.LLM_CACHE_DEFAULT_TTL_SECONDS,
+                 gateway: Optional[LLMGateway] = None):
+        self.gateway = gateway or llm_gateway
+        self.ttls = Config.LLM_CACHE_TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self._memory = LRUCache(max_entries)
+        self._lock = threading.Lock()
+        self._call_sites: Dict[str, Dict[str, int]] = {}
+        self._flights: Dict[str, _Flight] = {}
+        self._db = None
+        self.db_path = db_path
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=5.0)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS llm_cache ('
+                'key TEXT PRIMARY KEY, content TEXT NOT NULL, call_site TEXT, expires_at REAL)'
+            )
+
+    def ttl(self, call_site: str) -> float:
+        return float(self.ttls.get(call_site, self.default_ttl))
+
+    def _count(self, call_site: str, event: str):
+        with self._lock:
+            counters = self._call_sites.setdefault(
+                call_site, {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'invalid': 0,
+                            'coalesced': 0}
+            )
+            counters[event] += 1
+
+    def get(self, key: str, call_site: str) -> Optional[str]:
+        content = self._memory.get(key)
+        if content is not None:
+            self._count(call_site, 'memory_hits')
+            return content
+
+        if self._db is not None:
+            with self._lock:
+                row = self._db.execute(
+                    'SELECT content, expires_at FROM llm_cache WHERE key = ?', (key,)
+                ).fetchone()
+            if row is not None:
+                content, expires_at = row
+                remaining = expires_at - time.time()
+                if remaining > 0:
+                    self._memory.put(key, content, ttl_seconds=remaining)
+                    self._count(call_site, 'disk_hits')
+                    return content
+                with self._lock:
+                    self._db.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+
+        self._count(call_site, 'misses')
+        return None
+
+    def put(self, key: str, content: str, call_site: str):
+        ttl = self.ttl(call_site)
+        if ttl <= 0:
+            return
+        self._memory.put(key, content, ttl_seconds=ttl)
+        if self._db is not None:
+            with self._lock:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO llm_cache (key, content, call_site, expires_at) VALUES (?, ?, ?, ?)',
+                    (key, content, call_site, time.time() + ttl)
+                )
+        self._count(call_site, 'stores')
+
+    def complete(self, call_site: str, validate: Optional[Callable[[str], Any]] = None, **request) -> str:
+        """
+        Message content of the chat completion `request`, made through the
+        gateway unless an identical request is still fresh in the cache
+        """
+        key = request_key(request['model'], request['messages'],
+                          request.get('temperature'), request.get('max_tokens'))
+        if self.ttl(call_site) > 0:
+            content = self.get(key, call_site)
+            if content is not None:
+                return content
+        return self._single_flight(key, call_site, lambda: self.gateway.create(call_site, **request), validate)
+
+    def stream(self, call_site: str, validate: Optional[Callable[[str], Any]] = None,
+               **request) -> Iterator[str]:
+        """
+        Content of the chat completion `request` as it is generated. A fresh
+        cached or in-flight identical request (streamed or not) is replayed
+        as one chunk; otherwise tokens stream from the gateway, and the full
+        text is cached (if `validate` accepts it) and handed to requests
+        that joined meanwhile.
+        """
+        key = request_key(request['model'], request['messages'],
+                          request.get('temperature'), request.get('max_tokens'))
+        if self.ttl(call_site) > 0:
+            content = self.get(key, call_site)
+            if content is not None:
+                yield content
+                return
+
+        flight, leader = self._join_flight(key)
+        if not leader:
+            yield self._wait(flight, call_site)
+            return
+
+        chunks = []
+        try:
+            for delta in self.gateway.stream(call_site, **request):
+                chunks.append(delta)
+                yield delta
+            flight.content = ''.join(chunks)
+            if self._cacheable(flight.content, call_site, validate):
+                self.put(key, flight.content, call_site)
+        except Exception as error:
+            flight.error = error
+            raise
+        except BaseException:
+            # The consumer stopped reading; followers can't replay a partial text
+            flight.error = RuntimeError(f"LLM stream '{call_site}' was abandoned")
+            raise
+        finally:
+            self._end_flight(key, flight)
+
+    def _join_flight(self, key: str) -> tuple:
+        """(flight of `key`, whether this caller leads it), registering a new flight if none is running"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        return flight, leader
+
+    def _wait(self, flight: _Flight, call_site: str) -> str:
+        self._count(call_site, 'coalesced')
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.content
+
+    def _end_flight(self, key: str, flight: _Flight):
+        with self._lock:
+            self._flights.pop(key, None)
+        flight.done.set()
+
+    def _cacheable(self, content: Optional[str], call_site: str, validate: Optional[Callable[[str], Any]]) -> bool:
+        # Empty or tool-call completions have no content to cache
+        if not content:
+            return False
+        if validate is not None:
+            try:
+                validate(content)
+            except Exception as e:
+                logger.warning(f"Not caching '{call_site}' completion that failed validation: {str(e)}")
+                self._count(call_site, 'invalid')
+                return False
+        return True
+
+    def _single_flight(self, key: str, call_site: str, call: Callable[[], Any],
+                       validate: Optional[Callable[[str], Any]] = None) -> str:
+        flight, leader = self._join_flight(key)
+        if not leader:
+            return self._wait(flight, call_site)
+
+        try:
+            flight.content = call().choices[0].message.content
+            # Stored before the flight ends, so later callers hit the cache
+            if self._cacheable(flight.content, call_site, validate):
+                self.put(key, flight.content, call_site)
+            return flight.content
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            self._end_flight(key, flight)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            call_sites = {site: dict(counters) for site, counters in self._call_sites.items()}
+            in_flight = len(self._flights)
+            disk_entries = None
+            if self._db is not None:
+                disk_entries = self._db.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+
+        for site, counters in call_sites.items():
+            hits = counters['memory_hits'] + counters['disk_hits']
+            lookups = hits + counters['misses']
+            counters['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+            counters['ttl_seconds'] = self.ttl(site)
+
+        return {
+            'memory': self._memory.stats(),
+            'disk': {'enabled': self._db is not None, 'path': self.db_path or None, 'entries': disk_entries},
+            'in_flight': in_flight,
+            'call_sites': call_sites
+        }
+
+# Every Groq call site of the service goes through this cache
+llm_cache = LLMResponseCache()